@@ -2,7 +2,16 @@
 # c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\__init__.py
 """
 Inicializa o pacote de bibliotecas da Parte 1.
+Coloca a raiz do repositório no sys.path para o pacote comum/ (código
+compartilhado com a Parte 2).
 """
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
+
 from .config import Config
 from .logger import log
 from .exceptions import SapElementNotFound, SapTimeoutError
\ No newline at end of file
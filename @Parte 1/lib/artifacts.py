@@ -0,0 +1,31 @@
+# artifacts.py
+# c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\artifacts.py
+"""
+Evidências de erro da Parte 1; implementação em comum/artifacts.py.
+Pasta: Config.error_screenshot_dir; cota: Config.artifact_max_mb.
+"""
+import atexit
+from typing import Optional
+from comum.artifacts import ArtifactService
+from .config import Config
+from .logger import recent_lines
+
+_SERVICE: Optional[ArtifactService] = None
+
+
+def get_artifacts(cfg: Optional[Config] = None) -> ArtifactService:
+    global _SERVICE
+    if _SERVICE is None:
+        cfg = cfg or Config()
+        _SERVICE = ArtifactService(
+            cfg.error_screenshot_dir,
+            cfg.artifact_max_mb,
+            image_format=cfg.artifact_format,
+            jpeg_quality=cfg.artifact_jpeg_quality,
+            full_page=cfg.artifact_full_page,
+            dom_snapshot=cfg.artifact_dom_snapshot,
+            log_lines=cfg.artifact_log_lines,
+            recent_lines=recent_lines,
+        )
+        atexit.register(_SERVICE.close)
+    return _SERVICE
@@ -1,6 +1,31 @@
 # config.py
 # c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\config.py
-from dataclasses import dataclass
+import json
+import os
+from dataclasses import dataclass, fields
+
+CONFIG_JSON_FILENAME = "config.json"
+
+# Campo -> variável de ambiente lida no padrão, quando o nome não é o do campo em maiúsculas
+_ENV_NAMES = {"artifact_dom_snapshot": "ARTIFACT_DOM", "browser_cdp": "SAP_BROWSER_CDP"}
+
+
+def _env_is_set(field_name: str) -> bool:
+    return os.getenv(_ENV_NAMES.get(field_name, field_name.upper())) is not None
+
+
+def _load_json_config() -> dict:
+    """config.json opcional na pasta de execução (chaves = nomes dos campos do Config)."""
+    path = os.path.join(os.getcwd(), CONFIG_JSON_FILENAME)
+    if not os.path.isfile(path):
+        return {}
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
 
 @dataclass
 class Config:
@@ -11,7 +36,6 @@ class Config:
     wait_short: float = 1.0
     wait_long: float = 10.0
     wait_after_f8_seconds: int = 60
-    screenshot_after_f8: str = "screenshot_storage.png"
     headless: bool = False
     action_delay: float = 2.0
 
@@ -32,6 +56,37 @@ class Config:
     storages_csv_path: str = "storages.csv"
     error_screenshot_dir: str = "error_screenshots"
 
+    # Evidências de erro (gravadas em thread própria, com cota em disco)
+    artifact_format: str = os.getenv("ARTIFACT_FORMAT", "jpeg").lower()   # 'jpeg' ou 'png'
+    artifact_jpeg_quality: int = int(os.getenv("ARTIFACT_JPEG_QUALITY", "70"))
+    artifact_full_page: bool = os.getenv("ARTIFACT_FULL_PAGE", "0").lower() in ("1", "true", "yes")
+    artifact_dom_snapshot: bool = os.getenv("ARTIFACT_DOM", "1").lower() in ("1", "true", "yes")
+    artifact_log_lines: int = int(os.getenv("ARTIFACT_LOG_LINES", "200"))
+    artifact_max_mb: float = float(os.getenv("ARTIFACT_MAX_MB", "200"))
+
+    # Navegação por OK-code (/nLX15, /nSM35, /n) com conferência de chegada; 0 = Exit/digitação antigos
+    nav_okcode: bool = os.getenv("NAV_OKCODE", "1").lower() in ("1", "true", "yes")
+    start_transaction: str = os.getenv("START_TRANSACTION", "")  # ex.: LX15 = sessão abre direto nela (deep link)
+
+    # Cache em disco dos recursos estáticos do WebGUI (static_cache.py), opt-in
+    static_cache: bool = os.getenv("STATIC_CACHE", "0").lower() in ("1", "true", "yes")
+    static_cache_dir: str = os.getenv("STATIC_CACHE_DIR", os.path.join("cache", "static"))
+    static_cache_max_mb: float = float(os.getenv("STATIC_CACHE_MAX_MB", "300"))
+    static_cache_ttl_s: float = float(os.getenv("STATIC_CACHE_TTL_S", "86400"))  # sem max-age/Expires
+    static_cache_version: str = os.getenv("STATIC_CACHE_VERSION", "")           # trocar descarta o cache
+
+    # Navegador enxuto (lean_browser.py), opt-in: sem animações, imagens/fontes/mídia bloqueadas, viewport pequeno
+    lean_browser: bool = os.getenv("LEAN_BROWSER", "0").lower() in ("1", "true", "yes")
+    lean_block_types: str = os.getenv("LEAN_BLOCK_TYPES", "image,font,media")  # resource_type do Playwright
+    lean_allow: str = os.getenv("LEAN_ALLOW", "SAP-icons")      # regex de URL liberadas (vírgula)
+    lean_viewport: str = os.getenv("LEAN_VIEWPORT", "1024x640")  # '' = padrão; SM35/LX15 mostram menos linhas
+    lean_chromium_args: str = os.getenv("LEAN_CHROMIUM_ARGS", "")  # flags extras (vírgula)
+
+    # Fim de ação pelo round trip do WebGUI (request_tracker.py); 0 = seletores de busy e pausas fixas
+    request_tracker: bool = os.getenv("REQUEST_TRACKER", "1").lower() in ("1", "true", "yes")
+    settle_start_ms: int = int(os.getenv("SETTLE_START_MS", "300"))   # sem requisição nesse prazo = ação local
+    settle_quiet_ms: int = int(os.getenv("SETTLE_QUIET_MS", "80"))
+
     # Robustez LX15 / F8
     f8_retry_attempts: int = 5
     f8_retry_interval: float = 4.0
@@ -40,4 +95,40 @@ class Config:
     quick_detection_poll: float = 0.5         # Intervalo de polling na detecção rápida
     wait_post_f8_small: float = 1.2           # Pausa curta logo após F8 antes da checagem rápida
     final_full_detection: bool = True         # Última tentativa usa detecção completa (timeout longo)
-    f8_focus_retry: bool = True               # Reforça F8 via teclado global se necessário
\ No newline at end of file
+    f8_focus_retry: bool = True               # Reforça F8 via teclado global se necessário
+
+    # Navegador compartilhado (browser_service.py na raiz): '' = navegador próprio; 'auto' ou URL CDP
+    browser_cdp: str = os.getenv("SAP_BROWSER_CDP", "")
+
+    # Profiler (variáveis de ambiente): off | run (execução inteira) | record (1 a cada N storages)
+    profile_mode: str = os.getenv("PROFILE_MODE", "off").lower()
+    profile_every_n: int = int(os.getenv("PROFILE_EVERY_N", "1"))
+    profile_top_n: int = int(os.getenv("PROFILE_TOP_N", "25"))
+    profile_dir: str = os.getenv("PROFILE_DIR", "logs")
+
+    # Memória em execuções longas (memory_monitor.py), opt-in: amostras em logs/memory_*.jsonl e reciclagem do navegador
+    memory_monitor: bool = os.getenv("MEMORY_MONITOR", "0").lower() in ("1", "true", "yes")
+    memory_sample_every_n: int = int(os.getenv("MEMORY_SAMPLE_EVERY_N", "1"))      # a cada N storages
+    memory_tracemalloc: bool = os.getenv("MEMORY_TRACEMALLOC", "0").lower() in ("1", "true", "yes")  # tem custo
+    memory_dir: str = os.getenv("MEMORY_DIR", "logs")
+    recycle_every_n: int = int(os.getenv("RECYCLE_EVERY_N", "0"))                   # 0 = só pelos limites
+    recycle_browser_rss_mb: float = float(os.getenv("RECYCLE_BROWSER_RSS_MB", "0"))  # 0 = sem limite (psutil)
+    recycle_js_heap_mb: float = float(os.getenv("RECYCLE_JS_HEAP_MB", "0"))          # 0 = sem limite
+
+    def __post_init__(self):
+        # Perfil gravado pelo auto_tuner.py (ou editado à mão) sobrepõe os padrões acima;
+        # variável de ambiente definida continua valendo sobre o config.json
+        data = _load_json_config()
+        for f in fields(self):
+            if f.name not in data or _env_is_set(f.name):
+                continue
+            current = getattr(self, f.name)
+            value = data[f.name]
+            try:
+                if isinstance(current, bool):
+                    value = value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+                else:
+                    value = type(current)(value)
+            except (TypeError, ValueError):
+                continue
+            setattr(self, f.name, value)
\ No newline at end of file
@@ -0,0 +1,33 @@
+# lean_browser.py
+# c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\lean_browser.py
+"""
+Perfil enxuto do navegador na Parte 1; implementação em comum/lean_browser.py.
+Opt-in (Config.lean_browser / LEAN_BROWSER=1): tipos bloqueados lean_block_types,
+URLs liberadas lean_allow, viewport lean_viewport, flags extras lean_chromium_args.
+"""
+from typing import Optional
+from comum import lean_browser
+from comum.lean_browser import ResourceBlocker
+from .config import Config
+
+
+def launch_options(cfg: Config) -> dict:
+    """Argumentos extras do chromium.launch (vazio sem lean_browser)."""
+    if not cfg.lean_browser:
+        return {}
+    return lean_browser.launch_options(cfg.lean_chromium_args)
+
+
+def context_options(cfg: Config) -> dict:
+    """Argumentos extras do browser.new_context (vazio sem lean_browser)."""
+    if not cfg.lean_browser:
+        return {}
+    return lean_browser.context_options(cfg.lean_viewport)
+
+
+def install_lean_page(page, cfg: Config) -> Optional[ResourceBlocker]:
+    """CSS sem animação + bloqueio de recursos na página (lean_browser)."""
+    if not cfg.lean_browser:
+        return None
+    return lean_browser.install_lean_page(page, lean_browser.split_list(cfg.lean_block_types),
+                                          lean_browser.split_list(cfg.lean_allow))
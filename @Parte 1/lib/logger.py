@@ -1,13 +1,37 @@
 # logger.py
 # c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\logger.py
 import datetime
+import logging
 import sys
+from collections import deque
 from typing import Any
 
+_RECENT: deque = deque(maxlen=1000)  # últimas linhas (anexadas às evidências de erro)
+
 def _ts() -> str:
     return datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
 def log(*msg: Any, level: str = "INFO") -> None:
     text = " ".join(str(m) for m in msg)
-    sys.stdout.write(f"[{_ts()}][{level}] {text}\n")
-    sys.stdout.flush()
\ No newline at end of file
+    line = f"[{_ts()}][{level}] {text}"
+    _RECENT.append(line)
+    sys.stdout.write(line + "\n")
+    sys.stdout.flush()
+
+def recent_lines(n: int = 200) -> list:
+    return list(_RECENT)[-n:]
+
+class _SharedLogHandler(logging.Handler):
+    """Repassa o log dos módulos compartilhados (comum/) para log()."""
+    _LEVELS = {"WARNING": "WARN", "CRITICAL": "ERROR"}
+
+    def emit(self, record):
+        try:
+            log(record.getMessage(), level=self._LEVELS.get(record.levelname, record.levelname))
+        except Exception:
+            pass
+
+_shared = logging.getLogger("comum")
+_shared.setLevel(logging.INFO)
+_shared.propagate = False
+_shared.addHandler(_SharedLogHandler())
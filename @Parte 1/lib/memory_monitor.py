@@ -0,0 +1,23 @@
+# memory_monitor.py
+# c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\memory_monitor.py
+"""
+Memória em execuções longas na Parte 1 (amostras entre storages e reciclagem do
+navegador); implementação em comum/memory_monitor.py. Opt-in (Config.memory_monitor
+/ MEMORY_MONITOR=1): a cada memory_sample_every_n storages em memory_dir, reciclagem
+por recycle_every_n / recycle_browser_rss_mb / recycle_js_heap_mb.
+"""
+from typing import Callable, Optional
+from playwright.sync_api import Page
+from comum import memory_monitor
+from comum.memory_monitor import MemoryGuard
+from .config import Config
+
+
+def open_memory_guard(cfg: Config, restart: Optional[Callable[[], Page]] = None,
+                      label: str = "parte1") -> Optional[MemoryGuard]:
+    """memory_monitor=False (padrão) desliga amostragem e reciclagem."""
+    if not cfg.memory_monitor:
+        return None
+    return memory_monitor.open_memory_guard(restart, label, cfg.memory_sample_every_n, cfg.memory_dir,
+                                            cfg.memory_tracemalloc, cfg.recycle_every_n,
+                                            cfg.recycle_browser_rss_mb, cfg.recycle_js_heap_mb)
@@ -0,0 +1,22 @@
+# navigation.py
+# c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\navigation.py
+"""
+Navegação por OK-code da Parte 1 ('/nLX15', '/nSM35', '/n'); implementação em
+comum/navigation.py. Aqui ficam só as telas de destino de cada transação.
+"""
+from typing import Callable, Dict
+from playwright.sync_api import Page
+from comum.navigation import Navigator, deep_link_url, mark_landed, title_matches, visible
+
+# Tela de destino de cada transação (conferência de chegada)
+ARRIVALS: Dict[str, Callable[[Page], bool]] = {
+    "LX15": lambda page: visible(page.get_by_role("textbox", name="Storage Type")),
+    "SM35": lambda page: title_matches(page, r"Batch Input") or visible(page.locator(".urST5SCMetricInner")),
+}
+
+_NAV = Navigator(ARRIVALS, timeout_ms=20000, poll_ms=100)
+
+wait_arrival = _NAV.wait_arrival
+ok_code = _NAV.ok_code
+goto_transaction = _NAV.goto_transaction
+go_home = _NAV.go_home
@@ -0,0 +1,23 @@
+# profiling.py
+# c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\profiling.py
+"""
+Profiler opcional (cProfile) da Parte 1; implementação em comum/profiling.py.
+PROFILE_MODE (Config.profile_mode):
+  off    - desligado (padrão)
+  run    - perfila a execução inteira de main()
+  record - perfila só 1 a cada PROFILE_EVERY_N storages (process_storage)
+Arquivos em PROFILE_DIR (padrão: logs).
+"""
+from typing import Optional
+from comum.profiling import MODES, RunProfiler, summarize
+from .config import Config
+
+_PROFILER: Optional[RunProfiler] = None
+
+
+def get_profiler(cfg: Optional[Config] = None) -> RunProfiler:
+    global _PROFILER
+    if _PROFILER is None:
+        cfg = cfg or Config()
+        _PROFILER = RunProfiler(cfg.profile_mode, cfg.profile_every_n, cfg.profile_top_n, cfg.profile_dir)
+    return _PROFILER
@@ -0,0 +1,18 @@
+# request_tracker.py
+# c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\request_tracker.py
+"""
+Rastreador de round trips do WebGUI (ITS) da Parte 1; implementação em
+comum/request_tracker.py. Substitui os seletores de "busy" e as pausas fixas
+pós-Enter/F8 quando REQUEST_TRACKER=1 (Config.request_tracker).
+"""
+from typing import Optional
+from playwright.sync_api import Page
+from comum.request_tracker import RequestTracker, attach_tracker, begin_action, end_action, get_request_tracker
+from .config import Config
+
+
+def attach_request_tracker(page: Page, cfg: Config) -> Optional[RequestTracker]:
+    if not cfg.request_tracker:
+        return None
+    return attach_tracker(page, cfg.base_url, cfg.settle_start_ms, cfg.settle_quiet_ms,
+                          int(cfg.interface_stable_timeout * 1000))
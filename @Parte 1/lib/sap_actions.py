@@ -3,12 +3,13 @@
 # filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\sap_actions.py
 import re
 import time
-import os
-from datetime import datetime
 from playwright.sync_api import Page
 from .logger import log
-from .waits import safe_click, safe_fill, wait_until_any, wait_seconds, wait_for_interface_stable
+from .waits import safe_click, safe_fill, wait_until_any, wait_seconds, wait_for_interface_stable, settle_or_wait
+from .request_tracker import begin_action, end_action
+from .navigation import goto_transaction, go_home
 from .config import Config
+from .artifacts import get_artifacts
 
 def narrar(msg: str):
     # Padroniza a “narração” das etapas
@@ -166,13 +167,20 @@ class SapSession:
     def open_transaction(self, code: str):
         narrar(f"Iniciando abertura da transação '{code}'")
         self.dismiss_system_messages_popup()  # NOVO: garante fechamento do popup diário
+        if self.cfg.nav_okcode:
+            narrar(f"Saltando para '{code}' por OK-code (/n{code})")
+            if goto_transaction(self.page, code):
+                return
+            narrar("OK-code sem confirmação - seguindo pelo caminho padrão")
         self.wait_transaction_field_ready()
         narrar(f"Digitando transação '{code}'")
         safe_fill(self.tx_field(), code, description="Campo transação")
         self.delay("Antes Enter transação")
         narrar("Pressionando Enter para abrir transação")
+        mark = begin_action(self.page)
         self.tx_field().press("Enter")
-        self.delay("Após Enter transação")
+        if not end_action(self.page, mark, f"Abrir {code}"):
+            self.delay("Após Enter transação")
         if code.upper() == "LX15":
             narrar("Aguardando campo Storage Type da LX15")
             try:
@@ -189,6 +197,7 @@ class SapSession:
 
         for i in range(1, attempts + 1):
             narrar(f"Enviando F8 (tentativa {i}/{attempts})")
+            mark = begin_action(self.page)
             try:
                 self.page.keyboard.press("F8")
             except Exception:
@@ -196,8 +205,9 @@ class SapSession:
                     self.tx_field().press("F8")
                 except Exception:
                     pass
-            self.delay(f"Após F8 ({i})")
-            time.sleep(0.4)
+            if not end_action(self.page, mark, f"F8 ({i})"):
+                self.delay(f"Após F8 ({i})")
+                time.sleep(0.4)
             if self._f8_effect_detected():
                 narrar("Efeito de F8 detectado (parando tentativas iniciais)")
                 return
@@ -232,10 +242,10 @@ class SapSession:
         safe_fill(field, storage_code, description="Storage Type")
         self.delay("Antes Enter Storage Type")
         narrar("Confirmando Storage Type com Enter")
+        mark = begin_action(self.page)
         field.press("Enter")
-        self.delay("Após Enter Storage Type")
         narrar("Aguardando processamento do Storage Type")
-        wait_seconds(1.5, "Processando Storage Type")
+        settle_or_wait(self.page, mark, self.cfg.action_delay + 1.5, "Processando Storage Type")
 
     def detect_transfer_or_activate_full(self):
         narrar("Detecção FULL pós F8 (Transfer active / Activate)")
@@ -295,6 +305,10 @@ class SapSession:
         self.exit_to_home()
 
     def exit_to_home(self):
+        if self.cfg.nav_okcode:
+            narrar("Voltando ao início por OK-code (/n)")
+            if go_home(self.page):
+                return
         narrar("Iniciando sequência de Exit para voltar ao início")
         time.sleep(2)
         exit_btn = self.page.locator("div").filter(has_text=re.compile(r"^Exit$"))
@@ -337,14 +351,8 @@ class SapSession:
         narrar("Processo SM35 finalizado")
 
     def _save_transfer_active_screenshot(self, storage_code: str):
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"transfer_active_{storage_code}_{ts}.png"
-        path = os.path.join(self.cfg.error_screenshot_dir, filename)
-        try:
-            self.page.screenshot(path=path)
-            log(f"Screenshot de 'Transfer active' salvo: {path}", level="WARN")
-        except Exception as e:
-            log(f"Falha ao salvar screenshot de erro ({e})", level="WARN")
+        name = get_artifacts(self.cfg).capture(self.page, f"transfer_active_{storage_code}")
+        log(f"Evidências de 'Transfer active' enfileiradas: {name}", level="WARN")
 
     def _still_on_lx15_selection(self) -> bool:
         try:
@@ -400,12 +408,6 @@ class SapSession:
             narrar("Pressionando F8 para prosseguir")
             self.press_f8()
 
-            narrar("Registrando screenshot pós F8")
-            try:
-                self.page.screenshot(path=self.cfg.screenshot_after_f8)
-            except Exception:
-                pass
-
             narrar("Iniciando verificação de resultados pós F8")
             resultado = self._retry_f8_until_results(storage_code)
 
@@ -427,13 +429,8 @@ class SapSession:
             return "OK"
         except Exception as e:
             log(f"Erro inesperado no storage {storage_code}: {e}", level="WARN")
-            narrar("Erro inesperado - capturando screenshot e retornando ERROR")
-            try:
-                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                fname = f"exception_{storage_code}_{ts}.png"
-                self.page.screenshot(path=os.path.join(self.cfg.error_screenshot_dir, fname))
-            except Exception:
-                pass
+            narrar("Erro inesperado - capturando evidências e retornando ERROR")
+            get_artifacts(self.cfg).capture(self.page, f"exception_{storage_code}")
             self.exit_to_home()
             return "ERROR"
         finally:
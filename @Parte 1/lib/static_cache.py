@@ -0,0 +1,19 @@
+# static_cache.py
+# c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\lib\static_cache.py
+"""
+Cache em disco dos recursos estáticos do WebGUI na Parte 1; implementação em
+comum/static_cache.py. Opt-in (Config.static_cache): pasta static_cache_dir,
+cota static_cache_max_mb, validade padrão static_cache_ttl_s, static_cache_version.
+"""
+from typing import Optional
+from comum import static_cache
+from comum.static_cache import StaticCache
+from .config import Config
+
+
+def install_static_cache(page, cfg: Config) -> Optional[StaticCache]:
+    """Roteia os recursos estáticos da página pelo cache em disco (STATIC_CACHE=1)."""
+    if not cfg.static_cache:
+        return None
+    return static_cache.install_static_cache(page, cfg.static_cache_dir, cfg.static_cache_max_mb,
+                                             cfg.static_cache_ttl_s, cfg.static_cache_version, cfg.base_url)
@@ -7,21 +7,61 @@ from .logger import log
 from .sap_actions import SapSession
 from .waits import set_global_action_delay, wait_seconds, wait_for_interface_stable
 from .storages import load_storages
+from .profiling import get_profiler
+from .artifacts import get_artifacts
+from comum.browser_client import BorrowedSession, is_ready, resolve_endpoint
+from .request_tracker import attach_request_tracker
+from .static_cache import install_static_cache
+from .lean_browser import context_options, install_lean_page, launch_options
+from .navigation import deep_link_url, mark_landed, wait_arrival
+from .memory_monitor import open_memory_guard
 
 def start_session(config: Config):
+    """
+    Com SAP_BROWSER_CDP, pega uma aba emprestada do serviço de navegador:
+    retorna (pw, BorrowedSession, None, page) - close() da sessão devolve a aba.
+    """
     pw = sync_playwright().start()
-    browser = pw.chromium.launch(headless=config.headless, slow_mo=0)
-    context = browser.new_context()
+    endpoint = resolve_endpoint(config.browser_cdp) if config.browser_cdp else None
+    if config.browser_cdp and not endpoint:
+        log("Serviço de navegador não encontrado (SAP_BROWSER_CDP). Iniciando navegador próprio.", level="WARN")
+    if endpoint:
+        borrowed = BorrowedSession(pw, endpoint, config.base_url)
+        try:
+            page = borrowed.acquire()
+            page.set_default_navigation_timeout(config.nav_timeout_seconds * 1000)
+            return pw, borrowed, None, page
+        except Exception as e:
+            log(f"Falha ao conectar no serviço de navegador ({e}). Iniciando navegador próprio.", level="WARN")
+            borrowed.close()
+    browser, context, page = _open_browser(pw, config)
+    return pw, browser, context, page
+
+def _open_browser(pw, config: Config):
+    browser = pw.chromium.launch(headless=config.headless, slow_mo=0, **launch_options(config))
+    context = browser.new_context(**context_options(config))
     page = context.new_page()
     page.set_default_navigation_timeout(config.nav_timeout_seconds * 1000)
-    return pw, browser, context, page
+    return browser, context, page
 
-def shutdown(pw, browser, context):
+def _prepare_page(page, cfg: Config):
+    """Cache estático, navegador enxuto (depois do cache: bloqueia antes de consultar o disco) e rastreador."""
+    static_cache = install_static_cache(page, cfg)
+    lean = install_lean_page(page, cfg)
+    attach_request_tracker(page, cfg)
+    return static_cache, lean
+
+def _close_browser(context, browser):
     for closeable in (context, browser):
+        if closeable is None:
+            continue
         try:
             closeable.close()
         except Exception:
             pass
+
+def shutdown(pw, browser, context):
+    _close_browser(context, browser)
     try:
         pw.stop()
     except Exception:
@@ -30,12 +70,13 @@ def shutdown(pw, browser, context):
 def _esperar_sap_carregar(page, cfg: Config):
     tx_locator = lambda: page.get_by_role("textbox", name="Enter transaction code")
     tentativa = 0
+    url = deep_link_url(cfg.base_url, cfg.start_transaction) if cfg.start_transaction else cfg.base_url
     log("Iniciando carregamento do SAP (aguarda até campo pronto).")
     while True:
         tentativa += 1
-        log(f"Tentativa {tentativa}: acessando {cfg.base_url}")
+        log(f"Tentativa {tentativa}: acessando {url}")
         try:
-            page.goto(cfg.base_url, wait_until="domcontentloaded", timeout=cfg.nav_timeout_seconds * 1000)
+            page.goto(url, wait_until="domcontentloaded", timeout=cfg.nav_timeout_seconds * 1000)
         except TimeoutError:
             log(f"Timeout de navegação (>{cfg.nav_timeout_seconds}s). Vai repetir.", level="WARN")
 
@@ -49,6 +90,12 @@ def _esperar_sap_carregar(page, cfg: Config):
                 min_stable=cfg.interface_stable_min_time
             )
             wait_seconds(cfg.wait_after_field_ready, "Pausa final antes da primeira transação")
+            if cfg.start_transaction:
+                if wait_arrival(page, cfg.start_transaction, timeout_ms=5000):
+                    mark_landed(page, cfg.start_transaction)
+                    log(f"Sessão aberta direto em {cfg.start_transaction.upper()} (deep link).")
+                else:
+                    log(f"Deep link não abriu {cfg.start_transaction}; seguirá pela navegação normal.", level="WARN")
             log("Interface pronta para uso.")
             return
         except Exception:
@@ -60,30 +107,73 @@ def _esperar_sap_carregar(page, cfg: Config):
 
         wait_seconds(cfg.retry_delay_seconds, "Aguardando antes da nova tentativa")
 
-def run_main():
+def run_main(storages_override: list[str] | None = None) -> dict:
+    """Processa os storages (storages.csv ou storages_override). Retorna {storage: resultado}."""
     cfg = Config()
     set_global_action_delay(cfg.action_delay)
 
     # Garantir pasta de screenshots de erro
     os.makedirs(cfg.error_screenshot_dir, exist_ok=True)
 
-    storages = load_storages(cfg.storages_csv_path)
+    if storages_override:
+        storages = [s.strip().upper() for s in storages_override if s.strip()]
+        log(f"Storages da linha de comando: {storages}")
+    else:
+        storages = load_storages(cfg.storages_csv_path)
     if not storages:
         log("Nenhum storage encontrado. Encerrando.", level="WARN")
-        return
+        return {}
 
     pw, browser, context, page = start_session(cfg)
+    static_cache, lean = _prepare_page(page, cfg)
+    guard = None
     try:
-        _esperar_sap_carregar(page, cfg)
+        if isinstance(browser, BorrowedSession) and is_ready(page):
+            log("Aba emprestada já autenticada; pulando carregamento/login.")
+        else:
+            _esperar_sap_carregar(page, cfg)
         session = SapSession(page, cfg)
 
+        def _restart():
+            # Nova sessão carregada antes de fechar a antiga; falha = antiga continua
+            nonlocal browser, context, page, static_cache, lean, session
+            if static_cache:
+                static_cache.close()  # grava o índice antes da nova sessão ler
+            new_browser, new_context, new_page = _open_browser(pw, cfg)
+            try:
+                new_cache, new_lean = _prepare_page(new_page, cfg)
+                _esperar_sap_carregar(new_page, cfg)
+            except Exception:
+                _close_browser(new_context, new_browser)
+                raise
+            if lean:
+                lean.close()
+            _close_browser(context, browser)
+            browser, context, page, static_cache, lean = new_browser, new_context, new_page, new_cache, new_lean
+            session = SapSession(page, cfg)
+            return page
+
+        # Aba emprestada pertence ao browser_service.py: só amostra, não recicla
+        guard = open_memory_guard(cfg, None if isinstance(browser, BorrowedSession) else _restart)
+        profiler = get_profiler(cfg)
         resultados = {}
-        for st in storages:
-            res = session.process_storage(st)
+        for i, st in enumerate(storages, start=1):
+            with profiler.sample(i, f"storage_{st}"):
+                res = session.process_storage(st)
             resultados[st] = res
+            if guard and i < len(storages):
+                guard.checkpoint(page, i)
 
         log("Resumo execução storages:")
         for k, v in resultados.items():
             log(f"{k}: {v}")
+        return resultados
     finally:
+        if guard:
+            guard.close()
+        get_artifacts(cfg).flush()
+        if static_cache:
+            static_cache.close()
+        if lean:
+            lean.close()
         shutdown(pw, browser, context)
\ No newline at end of file
@@ -4,6 +4,7 @@ import time
 from playwright.sync_api import Page, TimeoutError as PlaywrightTimeoutError
 from .logger import log
 from .exceptions import SapElementNotFound, SapTimeoutError
+from .request_tracker import get_request_tracker, begin_action, end_action
 
 GLOBAL_ACTION_DELAY: float = 0.0
 
@@ -37,7 +38,9 @@ def wait_until_any(page: Page, locators, timeout: float, poll: float = 0.5):
 
 def safe_click(locator, description: str = "", timeout: float = 10.0):
     locator.wait_for(state="visible", timeout=timeout * 1000)
+    mark = begin_action(locator.page)
     locator.click()
+    end_action(locator.page, mark, description)
     if description:
         log(f"Click: {description}")
     _apply_global_delay("Após click")
@@ -58,27 +61,20 @@ def wait_seconds(seconds: float, reason: str = ""):
         log(f"Aguardando {seconds:.1f}s ({reason})")
     time.sleep(seconds)
 
+def settle_or_wait(page: Page, mark, seconds: float, reason: str = ""):
+    """Espera o round trip da ação (mark = begin_action antes dela); sem rastreador, pausa fixa."""
+    if not end_action(page, mark, reason):
+        wait_seconds(seconds, reason)
+
 def wait_for_no_busy(page: Page, timeout: float, min_stable: float = 1.0, poll: float = 0.3):
-    busy_selectors = [
-        "div.sapUiBusy",
-        "div[class*='BusyIndicator']",
-        "div[id*='busy']",
-        "div[class*='urMsgBarInProgress']",
-        "img[alt*='Working']",
-        "img[alt*='Carregando']"
-    ]
+    tracker = get_request_tracker(page)
+    if tracker is not None and tracker.settle(timeout_ms=int(timeout * 1000)) and not _any_busy(page):
+        log("Interface estável (sem round trip pendente).")
+        return True
     end = time.time() + timeout
     stable_start = None
     while time.time() < end:
-        any_busy = False
-        for sel in busy_selectors:
-            try:
-                if page.locator(sel).first.is_visible():
-                    any_busy = True
-                    break
-            except Exception:
-                pass
-        if any_busy:
+        if _any_busy(page):
             stable_start = None
         else:
             if stable_start is None:
@@ -90,6 +86,23 @@ def wait_for_no_busy(page: Page, timeout: float, min_stable: float = 1.0, poll:
     log("Timeout aguardando estabilização (busy persistente).", level="WARN")
     return False
 
+def _any_busy(page: Page) -> bool:
+    busy_selectors = [
+        "div.sapUiBusy",
+        "div[class*='BusyIndicator']",
+        "div[id*='busy']",
+        "div[class*='urMsgBarInProgress']",
+        "img[alt*='Working']",
+        "img[alt*='Carregando']"
+    ]
+    for sel in busy_selectors:
+        try:
+            if page.locator(sel).first.is_visible():
+                return True
+        except Exception:
+            pass
+    return False
+
 def wait_for_interface_stable(page: Page, timeout: float, min_stable: float):
     log(f"Iniciando verificação de estabilidade da interface (timeout {timeout}s).")
     wait_for_no_busy(page, timeout=timeout, min_stable=min_stable)
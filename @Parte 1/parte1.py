@@ -1,15 +1,27 @@
 # parte1.py
 # c:\Users\WRL1PO\Documents\Projeto_Inventario\@Parte 1\parte1.py
+import argparse
 import sys
 from lib.utils import run_main
 from lib.logger import log
+from lib.profiling import get_profiler
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Parte 1 - ativação de storages (LX15 + SM35).")
+    parser.add_argument("--storage", action="append", default=[],
+                        help="Storage Type a processar (repetível); padrão: storages.csv.")
+    args = parser.parse_args(argv)
 
-def main():
     log("Iniciando automação Parte 1")
-    run_main()
+    with get_profiler().run("parte1"):
+        resultados = run_main(args.storage or None)
     log("Finalizado Parte 1")
+    # Código de saída para o orquestrador: 0 = todos OK / TRANSFER_ACTIVE
+    if not resultados or any(v == "ERROR" for v in resultados.values()):
+        return 1
+    return 0
 
 if __name__ == "__main__":
     if "" not in sys.path:
         sys.path.append("")
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -1,7 +1,12 @@
 # parte2.py
 import sys
 import time
+# Perfil de startup precisa ser instalado antes dos demais imports
+from lib import startup_profile
+startup_profile.install_from_argv(sys.argv)
+import argparse
 import csv
+from dataclasses import replace
 from pathlib import Path
 from playwright.sync_api import sync_playwright
 from lib.logger import get_logger
@@ -15,31 +20,44 @@ from lib.exceptions import (
     AutomationError,
 )
 from lib.error_handling import handle_flow_exception
-from lib.single_record_entry import process_single_record_entries
-# NOVOS IMPORTS
-import pyodbc
-import pandas as pd
-import unicodedata
-
-def _norm(v: str | None) -> str:
-    if v is None:
-        return ""
-    s = str(v).strip()
-    s = "".join(c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn")
-    return s.upper()
-
-def fetch_counting_records(reference_report_path: str) -> list[dict]:
+from lib.single_record_entry import (
+    load_reference_template,
+    prepare_launch_plan,
+    process_queued_docs,
+    process_single_record_entries,
+)
+from lib.doc_index import assign_docs, build_doc_index, prepare_template
+from lib.input_loader import InputLoader, InputLoadError
+from lib.profiling import get_profiler
+from lib.work_queue import WorkQueue, runner_id
+from lib.memory_monitor import open_memory_guard
+from lib.work_slice import WorkSlice, parse_shard
+from lib.doc_contents import load_doc_check
+# pyodbc/pandas são importados sob demanda (só no caminho do banco)
+
+# Código de saída quando não há nada a lançar (orquestrador: documentos ainda não existem)
+EXIT_NO_RECORDS = 3
+
+def fetch_counting_records(reference_report_path: str, storage_type: str = "H0A") -> list[dict]:
     """
-    Consulta banco (Tipo Deposito='H0A') e associa DOC vindo de Template_RPA.
-    Busca não sequencial: cada registro do banco procura em qualquer linha do template.
-    Índices usados:
-      full: (CENTRO, DEPOSITO, MATERIAL, BIN)
-      mat_bin: (MATERIAL, BIN)
-      bin_only: BIN
+    Consulta banco (Tipo Deposito = storage_type) e associa DOC vindo de Template_RPA.
+    Banco e template são carregados em paralelo (entradas independentes).
+    Busca não sequencial (índices full / mat_bin / bin_only): ver lib/doc_index.py.
     Só retorna registros com DOC e campos Material/Centro/Depósito não vazios.
     """
-    log.info("Consultando view dbo.vw_PowerBI_DataTable (Tipo Deposito='H0A')...")
-    sql = """
+    loader = InputLoader(max_workers=2)
+    try:
+        loader.submit("banco", query_counting_db, storage_type)
+        loader.submit("template", read_doc_template, reference_report_path)
+        return match_counting_records(loader.result("banco"), loader.result("template"))
+    finally:
+        loader.close()
+
+def query_counting_db(storage_type: str = "H0A"):
+    """Linhas da view de contagem (DataFrame) para o(s) tipo(s) de depósito ('H0A' ou 'H0A,J0A')."""
+    types = [t.strip().upper() for t in storage_type.split(",") if t.strip()]
+    log.info(f"Consultando view dbo.vw_PowerBI_DataTable (Tipo Deposito in {types})...")
+    sql = f"""
         SELECT
             Centro,
             Deposito,
@@ -48,101 +66,33 @@ def fetch_counting_records(reference_report_path: str) -> list[dict]:
             [Tipo Deposito] AS TipoDeposito,
             [Quantidade Eleita] AS QuantidadeEleita
         FROM dbo.vw_PowerBI_DataTable
-        WHERE [Tipo Deposito] = 'H0A'
+        WHERE [Tipo Deposito] IN ({", ".join("?" * len(types))})
     """
     import pandas as pd
+    import pyodbc
     try:
         with pyodbc.connect(DB_CONNECTION_STRING) as conn:
-            df_db = pd.read_sql(sql, conn)
+            df_db = pd.read_sql(sql, conn, params=types)
     except Exception as e:
         log.error(f"Falha consulta banco: {e}")
         raise
-    log.info(f"Registros banco (H0A): {len(df_db)}")
+    log.info(f"Registros banco ({storage_type}): {len(df_db)}")
+    return df_db
 
+def read_doc_template(reference_report_path: str):
+    """Template_RPA (DataFrame) já preparado para o índice de DOC."""
+    import pandas as pd
     log.info(f"Lendo template estoque: {reference_report_path}")
     try:
         df_tpl = pd.read_excel(reference_report_path, engine="openpyxl")
     except Exception as e:
         log.error(f"Erro lendo template: {e}")
         raise
+    return prepare_template(df_tpl)
 
-    # Renomear colunas para padrão
-    rename_map = {
-        "Depósito": "Deposito",
-        "Posição no depósito": "PosicaoDeposito",
-        "Tipo de depósito": "TipoDeposito",
-    }
-    for k, v in rename_map.items():
-        if k in df_tpl.columns:
-            df_tpl = df_tpl.rename(columns={k: v})
-
-    # Garantir colunas
-    for c in ["Centro","Deposito","PosicaoDeposito","Material","DOC","TipoDeposito"]:
-        if c not in df_tpl.columns:
-            df_tpl[c] = ""
-        df_tpl[c] = df_tpl[c].fillna("").astype(str).str.strip()
-
-    # Criar índices ignorando linhas sem DOC
-    full_index: dict[tuple, str] = {}
-    mat_bin_index: dict[tuple, str] = {}
-    bin_index: dict[str, str] = {}
-
-    for _, row in df_tpl.iterrows():
-        doc = row.get("DOC","").strip()
-        if not doc:
-            continue
-        centro = _norm(row.get("Centro"))
-        deposito = _norm(row.get("Deposito"))
-        material = _norm(row.get("Material"))
-        bin_ = _norm(row.get("PosicaoDeposito"))
-        if centro and deposito and material and bin_:
-            full_index[(centro, deposito, material, bin_)] = doc
-        elif material and bin_:
-            mat_bin_index[(material, bin_)] = doc
-        elif bin_:
-            bin_index[bin_] = doc
-
-    log.info(f"Índice DOC: full={len(full_index)} mat_bin={len(mat_bin_index)} bin={len(bin_index)}")
-
-    # Normalizar banco
-    for c in ["Centro","Deposito","PosicaoDeposito","Material"]:
-        df_db[c] = df_db[c].fillna("").astype(str).str.strip()
-
-    records: list[dict] = []
-    hit_full = hit_mat_bin = hit_bin = 0
-
-    for _, r in df_db.iterrows():
-        centro_n = _norm(r["Centro"])
-        deposito_n = _norm(r["Deposito"])
-        material_n = _norm(r["Material"])
-        bin_n = _norm(r["PosicaoDeposito"])
-
-        doc = None
-        key_full = (centro_n, deposito_n, material_n, bin_n)
-        if key_full in full_index:
-            doc = full_index[key_full]; hit_full += 1
-        elif (material_n, bin_n) in mat_bin_index:
-            doc = mat_bin_index[(material_n, bin_n)]; hit_mat_bin += 1
-        elif bin_n in bin_index:
-            doc = bin_index[bin_n]; hit_bin += 1
-
-        if not doc:
-            continue  # sem DOC não lança
-        # Exigir campos obrigatórios preenchidos
-        if not (r["Material"] and r["Centro"] and r["Deposito"]):
-            continue
-
-        records.append({
-            "center": r["Centro"],
-            "deposit": r["Deposito"],
-            "bin": r["PosicaoDeposito"],
-            "material": r["Material"],
-            "quantity": r.get("QuantidadeEleita"),
-            "doc": doc,
-            "deposit_type": r.get("TipoDeposito")
-        })
-
-    log.info(f"Associados DOC: full={hit_full} mat_bin={hit_mat_bin} bin={hit_bin} | Final={len(records)}")
+def match_counting_records(df_db, df_tpl) -> list[dict]:
+    """Associa o DOC do template às linhas do banco."""
+    records, _hits = assign_docs(df_db, build_doc_index(df_tpl))
     if not records:
         log.warning("Nenhum registro associado. Verifique se DOC corresponde às chaves (Material/Centro/Depósito/Bin).")
     else:
@@ -163,36 +113,115 @@ DB_CONNECTION_STRING = (
 
 log = get_logger("main")
 
-def run(transaction_code: str = "LI11N", inventory_number: str | None = None):
+def run(transaction_code: str = "LI11N", inventory_number: str | None = None, storage_type: str = "H0A",
+        work_slice: WorkSlice | None = None, template_path: str | None = None) -> int | None:
+    """
+    Retorna a quantidade de registros lançados; None quando não há registros
+    (nada a lançar: documentos ainda não existem).
+    inventory_number: só esse DOC (mesmo que --doc); work_slice: fatia da linha de comando.
+    """
+    work_slice = work_slice or WorkSlice()
+    if inventory_number:
+        work_slice = replace(work_slice, docs=work_slice.docs | {inventory_number.strip().upper()})
+    # PROFILE_MODE=run perfila tudo; PROFILE_MODE=record só 1 a cada PROFILE_EVERY_N registros
+    with get_profiler().run("parte2"):
+        return _run(transaction_code, storage_type, work_slice, _template_path(template_path))
+
+def _template_path(template_path: str | None = None) -> Path:
+    ref_path = Path(template_path or REFERENCE_REPORT_FILE)
+    if not ref_path.is_file():
+        log.error(f"Template não encontrado: {ref_path}")
+        raise FileNotFoundError(str(ref_path))
+    return ref_path
+
+def _start_input_loading(ref_path: Path, storage_type: str) -> InputLoader:
+    """Banco, template (índice de DOC) e template referência (pré-validação) em paralelo."""
+    loader = InputLoader(max_workers=3)
+    loader.submit("banco", query_counting_db, storage_type)
+    loader.submit("template", read_doc_template, str(ref_path))
+    if settings.PREFLIGHT_ENABLED:
+        loader.submit("referência", load_reference_template, str(ref_path))
+    return loader
+
+def _inputs_checkpoint(loader: InputLoader, step: str) -> bool:
+    """
+    Antes de cada passo de navegação: falha de carga aborta já (sem entrar no SAP);
+    banco já respondeu vazio = nada a lançar (False).
+    """
+    loader.check()
+    df_db = loader.peek("banco")
+    if df_db is not None and len(df_db) == 0:
+        log.warning(f"Banco sem registros; {step} dispensado.")
+        return False
+    return True
+
+def _run(transaction_code: str, storage_type: str, work_slice: WorkSlice, ref_path: Path) -> int | None:
+    # Entradas carregam enquanto o navegador abre e o login acontece
+    loader = _start_input_loading(ref_path, storage_type)
+    try:
+        return _run_session(transaction_code, storage_type, ref_path, loader, work_slice)
+    finally:
+        loader.close()
+
+def _memory_guard(sap: SAPSession, transaction_code: str):
+    """Amostras de memória; reciclagem só com navegador próprio (aba emprestada é do serviço)."""
+    return open_memory_guard(None if sap.borrowed else (lambda: sap.recycle(transaction_code)))
+
+def _doc_check(sap: SAPSession, records, transaction_code: str):
+    """Conteúdo dos DOCs pela LI03N (DOC_CONTENTS=1) e volta para a transação de lançamento."""
+    if not settings.DOC_CONTENTS:
+        return None
+    try:
+        return load_doc_check((r.get("doc") for r in records), sap.page)
+    finally:
+        sap.open_transaction(transaction_code)
+
+def _run_session(transaction_code: str, storage_type: str, ref_path: Path, loader: InputLoader,
+                 work_slice: WorkSlice) -> int | None:
     with sync_playwright() as pw:
-        sap = SAPSession(pw).start()
+        with startup_profile.phase("SAPSession.start (browser)"):
+            sap = SAPSession(pw).start()
         try:
-            sap.goto_base()
-            sap.open_transaction(transaction_code)
-
-            ref_path = Path(REFERENCE_REPORT_FILE)
-            if not ref_path.is_file():
-                log.error(f"Template não encontrado: {ref_path}")
-                raise FileNotFoundError(str(ref_path))
+            if not _inputs_checkpoint(loader, "login"):
+                return None
+            with startup_profile.phase("goto_base (login)"):
+                sap.goto_base(transaction_code)
+            if not _inputs_checkpoint(loader, f"abertura da {transaction_code}"):
+                return None
+            with startup_profile.phase(f"open_transaction {transaction_code}"):
+                sap.open_transaction(transaction_code)
 
             try:
-                records = fetch_counting_records(str(ref_path))
+                with startup_profile.phase("fetch_counting_records (espera pós-login)"):
+                    records = work_slice.apply(match_counting_records(loader.result("banco"), loader.result("template")))
+                    reference_records = loader.result("referência") if settings.PREFLIGHT_ENABLED else None
+                    loader.discard("banco", "template", "referência")
             except Exception as e:
                 handle_flow_exception(e, sap, "fetch_counting_records")
                 raise
+            startup_profile.report(log)
 
+            posted = None
             if not records:
                 log.warning("Nenhum registro retornado do banco. Encerrando.")
             else:
+                doc_check = _doc_check(sap, records, transaction_code)
+                guard = _memory_guard(sap, transaction_code)
                 try:
-                    process_single_record_entries(
+                    posted = process_single_record_entries(
                         sap.page,
                         reference_report_path=str(ref_path),
-                        records=records
+                        records=records,
+                        reference_records=reference_records,
+                        guard=guard,
+                        doc_check=doc_check
                     )
                 except Exception as e:
                     handle_flow_exception(e, sap, "single_record_entries")
                     raise
+                finally:
+                    if guard:
+                        guard.close()
 
             log.info("Fluxo concluído com sucesso.")
 
@@ -205,7 +234,10 @@ def run(transaction_code: str = "LI11N", inventory_number: str | None = None):
                     input("ENTER para fechar...")
                 except Exception:
                     pass
+            return posted
 
+        except InputLoadError as e:
+            handle_flow_exception(e, sap, "inputs"); raise
         except SAPMessageError as e:
             handle_flow_exception(e, sap, "sap_message"); raise
         except AutomationError as e:
@@ -215,7 +247,129 @@ def run(transaction_code: str = "LI11N", inventory_number: str | None = None):
         finally:
             sap.close()
 
+def reconcile_only(output_path: str, storage_type: str = "H0A", template_path: str | None = None):
+    """Só dados (sem navegador): banco + template -> relatório de conciliação (sem fatia: relatório completo)."""
+    from lib.reconciliation import run_reconciliation
+    ref_path = _template_path(template_path)
+    records = fetch_counting_records(str(ref_path), storage_type)
+    run_reconciliation(str(ref_path), output_path, records=records)
+
+def count_records(storage_type: str = "H0A", work_slice: WorkSlice | None = None,
+                  template_path: str | None = None) -> int:
+    """Só dados (sem navegador): quantos registros a execução lançaria (orquestrador: documentos já existem?)."""
+    records = fetch_counting_records(str(_template_path(template_path)), storage_type)
+    return len((work_slice or WorkSlice()).apply(records))
+
+def compile_queue(queue_path: str, storage_type: str = "H0A", work_slice: WorkSlice | None = None,
+                  template_path: str | None = None) -> int:
+    """Só dados (sem navegador): banco + template -> plano por DOC na fila SQLite."""
+    ref_path = _template_path(template_path)
+    work_slice = work_slice or WorkSlice()
+    loader = _start_input_loading(ref_path, storage_type)
+    try:
+        records = work_slice.apply(match_counting_records(loader.result("banco"), loader.result("template")))
+        reference_records = loader.result("referência") if settings.PREFLIGHT_ENABLED else None
+    finally:
+        loader.close()
+    doc_check = load_doc_check(r.get("doc") for r in records)  # só o cache (sem navegador)
+    plan = prepare_launch_plan(records, str(ref_path), reference_records, doc_check)
+    queue = WorkQueue(queue_path)
+    try:
+        counts = queue.compile(plan)
+        log.info(f"Fila {queue_path}: {counts} | estado: {queue.stats()}")
+    finally:
+        queue.close()
+    return len(plan)
+
+def run_queue(queue_path: str, transaction_code: str = "LI11N") -> int:
+    """Runner: uma sessão SAP consumindo DOCs da fila até esvaziar. Retorna DOCs concluídos."""
+    queue = WorkQueue(queue_path)
+    owner = runner_id()
+    try:
+        pending = queue.stats()
+        if pending["pending"] == 0 and pending["leased"] == 0:
+            log.warning(f"Fila {queue_path} sem DOCs pendentes ({pending}). Encerrando.")
+            return 0
+        log.info(f"Runner {owner} na fila {queue_path}: {pending}")
+        with get_profiler().run("parte2-runner"), sync_playwright() as pw:
+            sap = SAPSession(pw).start()
+            try:
+                sap.goto_base(transaction_code)
+                sap.open_transaction(transaction_code)
+                guard = _memory_guard(sap, transaction_code)
+                try:
+                    return process_queued_docs(sap.page, queue, owner, guard)["docs"]
+                finally:
+                    if guard:
+                        guard.close()
+            except SAPMessageError as e:
+                handle_flow_exception(e, sap, "sap_message"); raise
+            except AutomationError as e:
+                handle_flow_exception(e, sap, "automation_generic"); raise
+            except Exception as e:
+                handle_flow_exception(e, sap, "unexpected"); raise
+            finally:
+                sap.close()
+    finally:
+        queue.close()
+
+def _shard_arg(text: str) -> str:
+    try:
+        parse_shard(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+    return text
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description="Parte 2 - lançamento LI11N (Single Record Entry).",
+        epilog="Várias cópias sem sobreposição: --shard 1/3, --shard 2/3 e --shard 3/3 "
+               "(em máquinas ou janelas diferentes).")
+    parser.add_argument("transaction", nargs="?", default="LI11N")
+    parser.add_argument("inventory_number", nargs="?", default=None,
+                        help="Só esse DOC de inventário (mesmo que --doc).")
+    parser.add_argument("--storage-type", default="H0A",
+                        help="Tipo(s) de depósito consultado(s) no banco, separados por vírgula (padrão H0A).")
+    parser.add_argument("--doc", action="append", default=[], metavar="DOC",
+                        help="Só esses DOCs de inventário (repetível ou separados por vírgula).")
+    parser.add_argument("--plant", action="append", default=[], metavar="CENTRO",
+                        help="Só esses centros (repetível ou separados por vírgula).")
+    parser.add_argument("--storage-location", action="append", default=[], metavar="DEPOSITO",
+                        help="Só esses depósitos (repetível ou separados por vírgula).")
+    parser.add_argument("--shard", type=_shard_arg, metavar="i/N",
+                        help="Só os DOCs da fatia i de N (crc32 do DOC; todas as linhas do DOC na mesma fatia).")
+    parser.add_argument("--limit", type=int, default=0, metavar="N",
+                        help="No máximo N DOCs (inteiros, na ordem do banco).")
+    parser.add_argument("--template", metavar="ARQUIVO",
+                        help=f"Template_RPA.xlsx (padrão {REFERENCE_REPORT_FILE}).")
+    parser.add_argument("--reconcile", metavar="SAIDA",
+                        help="Gera o relatório contado x contábil (.xlsx/.csv/.parquet) e sai, sem abrir o SAP.")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="Tempo de import/fases de inicialização no log.")
+    parser.add_argument("--check", action="store_true",
+                        help="Só verifica se há registros (banco + template, sem abrir o SAP); código 3 se não houver.")
+    parser.add_argument("--compile-queue", action="store_true",
+                        help="Grava o plano de lançamento (um item por DOC) na fila SQLite e sai, sem abrir o SAP.")
+    parser.add_argument("--runner", action="store_true",
+                        help="Lança DOCs da fila (lease + heartbeat); vários runners podem rodar ao mesmo tempo.")
+    parser.add_argument("--queue", default=settings.QUEUE_PATH, metavar="ARQUIVO",
+                        help="Arquivo SQLite da fila (padrão QUEUE_PATH).")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
-    tx = sys.argv[1] if len(sys.argv) > 1 else "LI11N"
-    inv_arg = sys.argv[2] if len(sys.argv) > 2 else None
-    run(tx, inv_arg)
+    args = _parse_args(sys.argv[1:])
+    work_slice = WorkSlice.from_args(args.doc, args.plant, args.storage_location, args.shard, args.limit)
+    if work_slice.active:
+        log.info(f"Fatia de trabalho: {work_slice.describe()}")
+    if args.reconcile:
+        reconcile_only(args.reconcile, args.storage_type, args.template)
+    elif args.check:
+        if count_records(args.storage_type, work_slice, args.template) == 0:
+            sys.exit(EXIT_NO_RECORDS)
+    elif args.compile_queue:
+        if compile_queue(args.queue, args.storage_type, work_slice, args.template) == 0:
+            sys.exit(EXIT_NO_RECORDS)
+    elif args.runner:
+        run_queue(args.queue, args.transaction)
+    elif run(args.transaction, args.inventory_number, args.storage_type, work_slice, args.template) is None:
+        sys.exit(EXIT_NO_RECORDS)
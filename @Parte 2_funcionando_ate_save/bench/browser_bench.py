@@ -0,0 +1,134 @@
+# browser_bench.py
+# bench/browser_bench.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\bench\browser_bench.py
+"""
+Antes/depois do navegador enxuto (lib/lean_browser.py): abre o WebGUI em
+rodadas alternadas padrão x enxuto e mede
+  - tempo até a página ficar pronta (campo de transação visível, ou evento load)
+  - RSS somado dos processos do Chromium desta sessão (psutil, opcional;
+    páginas compartilhadas entre processos contam mais de uma vez)
+  - heap JS usado (CDP Performance.getMetrics) e requisições feitas/bloqueadas
+Resultados em bench/browser_results.jsonl com o commit atual.
+
+Uso (na pasta da Parte 2):
+  python bench/browser_bench.py                          # 3 rodadas em SAP_BASE_URL
+  python bench/browser_bench.py --repeat 5 --headless
+  python bench/browser_bench.py --url http://.../webgui --ready load
+"""
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+from playwright.sync_api import sync_playwright  # noqa: E402
+from run_bench import _git_commit  # noqa: E402
+from lib.config import settings  # noqa: E402
+from lib.logger import get_logger  # noqa: E402
+from lib.lean_browser import context_options, install_lean_page, launch_options  # noqa: E402
+from comum.memory_monitor import browser_rss_mb, js_heap_mb  # noqa: E402
+from lib import selectors  # noqa: E402
+
+RESULTS_FILE = os.path.join(HERE, "browser_results.jsonl")
+MODES = ("padrão", "enxuto")
+
+
+def run_once(pw, lean: bool, url: str, ready: str, headless: bool, timeout_s: float, settle_s: float) -> Dict:
+    browser = pw.chromium.launch(headless=headless, **launch_options(force=lean))
+    try:
+        context = browser.new_context(**context_options(force=lean))
+        page = context.new_page()
+        blocker = install_lean_page(page, force=True) if lean else None
+        requests = []
+        page.on("requestfinished", requests.append)
+        t0 = time.perf_counter()
+        page.goto(url, wait_until="load" if ready == "load" else "domcontentloaded", timeout=timeout_s * 1000)
+        if ready == "tx":
+            role, name = selectors.TX_INPUT_ROLE
+            page.get_by_role(role, name=name).first.wait_for(state="visible", timeout=timeout_s * 1000)
+        ready_s = time.perf_counter() - t0
+        page.wait_for_timeout(int(settle_s * 1000))  # memória depois do WebGUI assentar
+        return {
+            "ready_s": round(ready_s, 3),
+            "rss_mb": browser_rss_mb(),
+            "js_heap_mb": js_heap_mb(page)["js_heap_mb"],
+            "requests": len(requests),
+            "blocked": blocker.blocked if blocker else 0,
+        }
+    finally:
+        browser.close()
+
+
+def _median(rows: List[Dict], key: str) -> Optional[float]:
+    values = [r[key] for r in rows if r.get(key) is not None]
+    return round(statistics.median(values), 3) if values else None
+
+
+def _delta(now: Optional[float], before: Optional[float]) -> str:
+    if not now or not before:
+        return ""
+    return f"{(now - before) / before * 100:+.1f}%"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Navegador padrão x enxuto: tempo até pronto e memória.")
+    parser.add_argument("--url", default=settings.BASE_URL, help="Página medida (padrão SAP_BASE_URL).")
+    parser.add_argument("--ready", choices=("tx", "load"), default="tx",
+                        help="tx = campo de transação visível (precisa de SSO); load = evento load.")
+    parser.add_argument("--repeat", type=int, default=3, help="Rodadas por modo (alternadas).")
+    parser.add_argument("--headless", action="store_true", help="Sem janela.")
+    parser.add_argument("--timeout-s", type=float, default=120, help="Limite por rodada.")
+    parser.add_argument("--settle-s", type=float, default=2.0, help="Espera antes de medir a memória.")
+    parser.add_argument("--no-save", action="store_true", help="Não grava em bench/browser_results.jsonl.")
+    args = parser.parse_args(argv)
+
+    get_logger().setLevel(logging.WARNING)
+    info = _git_commit()
+    stamp = datetime.now().isoformat(timespec="seconds")
+    print(f"commit={info['commit']}{' (alterado)' if info['dirty'] else ''} url={args.url} pronto={args.ready}")
+    rows: Dict[str, List[Dict]] = {mode: [] for mode in MODES}
+    with sync_playwright() as pw:
+        for i in range(1, args.repeat + 1):
+            for mode in MODES:
+                try:
+                    r = run_once(pw, mode == "enxuto", args.url, args.ready, args.headless,
+                                 args.timeout_s, args.settle_s)
+                except Exception as e:
+                    print(f"rodada {i} {mode:<7} falhou: {e}")
+                    continue
+                rows[mode].append(r)
+                print(f"rodada {i} {mode:<7} pronto {r['ready_s']:.2f}s  RSS {r['rss_mb']} MB  "
+                      f"heap JS {r['js_heap_mb']} MB  req {r['requests']}  bloqueadas {r['blocked']}")
+
+    if any(r.get("rss_mb") is None for mode_rows in rows.values() for r in mode_rows):
+        print("psutil não instalado: RSS não medido (pip install psutil).")
+    summary = {mode: {key: _median(mode_rows, key) for key in ("ready_s", "rss_mb", "js_heap_mb", "requests")}
+               for mode, mode_rows in rows.items()}
+    print(f"{'mediana':<10}{'pronto (s)':>12}{'RSS (MB)':>12}{'heap JS (MB)':>14}{'requisições':>13}")
+    for mode in MODES:
+        s = summary[mode]
+        print(f"{mode:<10}{str(s['ready_s']):>12}{str(s['rss_mb']):>12}{str(s['js_heap_mb']):>14}"
+              f"{str(s['requests']):>13}")
+    base, lean = summary["padrão"], summary["enxuto"]
+    print(f"{'enxuto':<10}{_delta(lean['ready_s'], base['ready_s']):>12}{_delta(lean['rss_mb'], base['rss_mb']):>12}"
+          f"{_delta(lean['js_heap_mb'], base['js_heap_mb']):>14}{_delta(lean['requests'], base['requests']):>13}")
+
+    if not args.no_save and any(rows.values()):
+        with open(RESULTS_FILE, "a", encoding="utf-8") as f:
+            for mode in MODES:
+                f.write(json.dumps({"ts": stamp, **info, "url": args.url, "ready": args.ready, "mode": mode,
+                                    "runs": len(rows[mode]), **summary[mode]}, ensure_ascii=False) + "\n")
+        print(f"Resumo gravado em {RESULTS_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
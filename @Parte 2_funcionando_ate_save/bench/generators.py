@@ -0,0 +1,211 @@
+# generators.py
+# bench/generators.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\bench\generators.py
+"""
+Geradores determinísticos (semente fixa) de dados sintéticos para o bench:
+  - arquivo de contagem (cabeçalhos do SRE: Documento inventário, Qtd.contada, UD...)
+  - relatório de referência / Template_RPA (DOC, Estoque Total, UD...)
+  - linhas do banco (vw_PowerBI_DataTable, já com os aliases do SELECT)
+Mesma semente + mesmo tamanho => mesmos dados, para comparar commits.
+Gravação em .csv (;) e .xlsx (somente biblioteca padrão, inlineStr).
+"""
+import csv
+import random
+import zipfile
+from typing import Dict, Iterator, List, Sequence
+from xml.sax.saxutils import escape
+
+COUNTING_HEADER = [
+    "Documento inventário", "Material", "Centro", "Depósito", "Posição no depósito",
+    "Tipo de depósito", "Qtd.contada", "UD", "Estoque Total",
+]
+REFERENCE_HEADER = [
+    "DOC", "Material", "Centro", "Depósito", "Posição no depósito",
+    "Tipo de depósito", "Estoque Total", "UD",
+]
+DB_HEADER = ["Centro", "Deposito", "PosicaoDeposito", "Material", "TipoDeposito", "QuantidadeEleita"]
+
+PLANTS = ["BR01", "BR02", "BR03"]
+LOCATIONS = ["1000", "2000", "3000"]
+STORAGE_TYPES = ["H0A", "H0B", "P01"]
+LINES_PER_DOC = 50
+
+
+def _quantity_text(rng: random.Random, value: float) -> str:
+    """Formatos vistos nas planilhas: '12', '12,5', '1.234,50'."""
+    style = rng.random()
+    if value >= 1000 and style < 0.3:
+        inteiro, frac = f"{value:.2f}".split(".")
+        return f"{int(inteiro):,}".replace(",", ".") + "," + frac
+    if style < 0.6 and value.is_integer():
+        return str(int(value))
+    return f"{value:.3f}".replace(".", ",")
+
+
+def _bin(rng: random.Random) -> str:
+    if rng.random() < 0.5:
+        return str(rng.randrange(10**5, 10**7))          # numérico curto (zfill em _fix_storage_bin)
+    return f"{rng.randrange(1, 40):02d}-{rng.randrange(1, 30):02d}-{rng.randrange(1, 9):02d}"
+
+
+def positions(n: int, seed: int = 1) -> List[Dict[str, str]]:
+    """
+    n linhas de posição (bin/material) com UDs em sequência.
+    ~30% das posições têm 2 a 4 UDs consecutivas (mesmo material + bin).
+    """
+    rng = random.Random(seed)
+    materials = [str(rng.randrange(10**7, 10**8)) for _ in range(max(1, n // 4))]
+    rows: List[Dict[str, str]] = []
+    ud_seq = 10**9
+    while len(rows) < n:
+        base = {
+            "doc": str(100000 + len(rows) // LINES_PER_DOC),
+            "material": rng.choice(materials),
+            "plant": rng.choice(PLANTS),
+            "location": rng.choice(LOCATIONS),
+            "bin": _bin(rng),
+            "type": rng.choice(STORAGE_TYPES),
+        }
+        uds = rng.randrange(2, 5) if rng.random() < 0.3 else 0
+        for _ in range(uds or 1):
+            row = dict(base)
+            row["book"] = float(rng.randrange(0, 500))
+            if uds:
+                ud_seq += rng.randrange(1, 50)
+                row["ud"] = str(ud_seq)
+            else:
+                row["ud"] = ""
+            rows.append(row)
+    return rows[:n]
+
+
+def counting_rows(n: int, seed: int = 1) -> Iterator[List[str]]:
+    rng = random.Random(seed + 1000)
+    for p in positions(n, seed):
+        counted = max(0.0, p["book"] + rng.choice([0, 0, 0, -1, 1, -5, 3.5]))
+        yield [
+            p["doc"], p["material"], p["plant"], p["location"], p["bin"], p["type"],
+            _quantity_text(rng, counted), p["ud"], _quantity_text(rng, p["book"]),
+        ]
+
+
+def reference_rows(n: int, seed: int = 1) -> Iterator[list]:
+    """~10% sem centro/depósito e ~3% só com bin (caem nos índices mat_bin e bin_only)."""
+    rng = random.Random(seed + 3000)
+    for p in positions(n, seed):
+        r = rng.random()
+        plant, location, material = p["plant"], p["location"], p["material"]
+        if r < 0.13:
+            plant = location = ""
+        if r < 0.03:
+            material = ""
+        yield [p["doc"], material, plant, location, p["bin"], p["type"], p["book"], p["ud"]]
+
+
+def db_rows(n: int, seed: int = 1) -> List[Dict[str, object]]:
+    """
+    Linhas do banco sobre as mesmas posições da referência (mesma semente):
+    ~70% casam pela chave completa, ~15% só material+bin, ~10% sem DOC, ~5% com campo vazio.
+    """
+    rng = random.Random(seed + 2000)
+    out: List[Dict[str, object]] = []
+    for p in positions(n, seed):
+        r = rng.random()
+        plant, location, material = p["plant"], p["location"], p["material"]
+        bin_ = p["bin"]
+        if 0.70 <= r < 0.85:
+            plant = "BR99"
+        elif 0.85 <= r < 0.95:
+            bin_ = f"X-{rng.randrange(10**6)}"
+        elif r >= 0.95:
+            material = ""
+        out.append({
+            "Centro": plant,
+            "Deposito": location,
+            "PosicaoDeposito": bin_,
+            "Material": material,
+            "TipoDeposito": p["type"],
+            "QuantidadeEleita": p["book"],
+        })
+    return out
+
+
+def write_csv(path: str, header: Sequence[str], rows) -> str:
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(header)
+        writer.writerows(rows)
+    return path
+
+
+def _col_letters(idx: int) -> str:
+    s = ""
+    idx += 1
+    while idx:
+        idx, rem = divmod(idx - 1, 26)
+        s = chr(65 + rem) + s
+    return s
+
+
+_CONTENT_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '</Types>'
+)
+_ROOT_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="xl/workbook.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument"/>'
+    '</Relationships>'
+)
+_WORKBOOK = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Planilha1" sheetId="1" r:id="rId1"/></sheets></workbook>'
+)
+_WORKBOOK_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Target="worksheets/sheet1.xml" '
+    'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"/>'
+    '</Relationships>'
+)
+
+
+def write_xlsx(path: str, header: Sequence[str], rows) -> str:
+    """xlsx mínimo (uma aba, inlineStr); legível por openpyxl e pelo leitor leve."""
+    letters = [_col_letters(i) for i in range(len(header))]
+
+    def _row_xml(r: int, values) -> str:
+        cells = []
+        for i, v in enumerate(values):
+            ref = f"{letters[i]}{r}"
+            if isinstance(v, (int, float)):
+                cells.append(f'<c r="{ref}"><v>{v}</v></c>')
+            elif v != "":
+                cells.append(f'<c r="{ref}" t="inlineStr"><is><t>{escape(str(v))}</t></is></c>')
+        return f'<row r="{r}">{"".join(cells)}</row>'
+
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with zf.open("xl/worksheets/sheet1.xml", "w") as fh:
+            fh.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            fh.write(_row_xml(1, header).encode("utf-8"))
+            for r, values in enumerate(rows, start=2):
+                fh.write(_row_xml(r, values).encode("utf-8"))
+            fh.write(b"</sheetData></worksheet>")
+    return path
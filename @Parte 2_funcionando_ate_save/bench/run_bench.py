@@ -0,0 +1,321 @@
+# run_bench.py
+# bench/run_bench.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\bench\run_bench.py
+"""
+Bench das funções puras do caminho de dados (sem navegador, sem banco).
+Para cada função e tamanho: melhor tempo de N repetições e pico de memória
+(tracemalloc, medido numa execução separada para não distorcer o tempo).
+Resultados são acrescentados em bench/results.jsonl com o commit atual e
+comparados com a última medição de outro commit.
+
+Uso (na pasta da Parte 2):
+  python bench/run_bench.py                      # 10k e 100k
+  python bench/run_bench.py --sizes 10k,100k,1m
+  python bench/run_bench.py --only parse,doc_index --repeat 5
+"""
+import argparse
+import json
+import logging
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+import generators as gen  # noqa: E402
+from lib.logger import get_logger  # noqa: E402
+from lib import single_record_entry as sre  # noqa: E402
+from lib import doc_index  # noqa: E402
+from lib.records import ReferenceRow  # noqa: E402
+
+RESULTS_FILE = os.path.join(HERE, "results.jsonl")
+
+
+class Dataset:
+    """Dados de um tamanho, gerados sob demanda e reaproveitados entre funções."""
+
+    def __init__(self, n: int, workdir: str):
+        self.n = n
+        self.workdir = workdir
+        self._cache: Dict[str, object] = {}
+
+    def _get(self, key: str, build: Callable[[], object]):
+        if key not in self._cache:
+            self._cache[key] = build()
+        return self._cache[key]
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.workdir, f"{name}_{self.n}")
+
+    def counting_csv(self) -> str:
+        return self._get("counting_csv", lambda: gen.write_csv(
+            self._path("contagem") + ".csv", gen.COUNTING_HEADER, gen.counting_rows(self.n)))
+
+    def counting_xlsx(self) -> str:
+        return self._get("counting_xlsx", lambda: gen.write_xlsx(
+            self._path("contagem") + ".xlsx", gen.COUNTING_HEADER, gen.counting_rows(self.n)))
+
+    def reference_csv(self) -> str:
+        return self._get("reference_csv", lambda: gen.write_csv(
+            self._path("referencia") + ".csv", gen.REFERENCE_HEADER, gen.reference_rows(self.n)))
+
+    def reference_xlsx(self) -> str:
+        return self._get("reference_xlsx", lambda: gen.write_xlsx(
+            self._path("referencia") + ".xlsx", gen.REFERENCE_HEADER, gen.reference_rows(self.n)))
+
+    def counting_records(self) -> List[Dict[str, str]]:
+        return self._get("counting_records", lambda: sre.load_single_record_csv(self.counting_csv()))
+
+    def reference_records(self) -> List[ReferenceRow]:
+        return self._get("reference_records", lambda: sre.load_reference_template(self.reference_xlsx()))
+
+    def quantity_texts(self) -> List[str]:
+        return self._get("quantity_texts", lambda: [r[6] for r in gen.counting_rows(self.n)])
+
+    def bins(self) -> List[str]:
+        return self._get("bins", lambda: [r[4] for r in gen.counting_rows(self.n)])
+
+    def db_frame(self):
+        import pandas as pd
+        return pd.DataFrame(self._get("db_rows", lambda: gen.db_rows(self.n)))
+
+    def template_frame(self):
+        import pandas as pd
+        rows = self._get("template_rows", lambda: list(gen.reference_rows(self.n)))
+        return pd.DataFrame(rows, columns=gen.REFERENCE_HEADER).astype(str)
+
+
+# --- casos: recebem o Dataset e devolvem a função medida (sem argumentos) ---
+
+def _case_parse_number(ds: Dataset):
+    values = ds.quantity_texts()
+    return lambda: [sre._parse_number(v) for v in values]
+
+
+def _case_format_quantity(ds: Dataset):
+    values = [sre._parse_number(v) for v in ds.quantity_texts()]
+    return lambda: [sre._format_quantity(v) for v in values]
+
+
+def _case_fix_storage_bin(ds: Dataset):
+    values = ds.bins()
+    return lambda: [sre._fix_storage_bin(v) for v in values]
+
+
+def _case_norm_header(ds: Dataset):
+    values = (gen.COUNTING_HEADER * (ds.n // len(gen.COUNTING_HEADER) + 1))[:ds.n]
+    return lambda: [sre._norm(v) for v in values]
+
+
+def _case_norm_key(ds: Dataset):
+    values = ds.bins()
+    return lambda: [doc_index.norm_key(v) for v in values]
+
+
+def _ud_groups(ds: Dataset) -> List[List[ReferenceRow]]:
+    groups: Dict[tuple, List[ReferenceRow]] = {}
+    for ref in ds.reference_records():
+        if ref.ud:
+            groups.setdefault((ref.material_number, ref.storage_bin), []).append(ref)
+    return list(groups.values())
+
+
+def _case_adjust_ud_quantities(ds: Dataset):
+    groups = _ud_groups(ds)
+    counted = [sum(r.stock_total for r in g) + (i % 7) - 3 for i, g in enumerate(groups)]
+    return lambda: [sre._adjust_ud_quantities(c, g) for c, g in zip(counted, groups)]
+
+
+def _case_reallocate_quantities(ds: Dataset):
+    lists = [[r.stock_total for r in g] for g in _ud_groups(ds)]
+    cases = ["MENOR", "MAIOR", "IGUAL"]
+    return lambda: [sre._reallocate_quantities(v, cases[i % 3]) for i, v in enumerate(lists)]
+
+
+def _case_detect_ud_sequence(ds: Dataset):
+    records = ds.counting_records()
+
+    def run():
+        i = 0
+        while i < len(records):
+            _, i = sre._detect_ud_sequence(records, i)
+    return run
+
+
+def _case_index_marcelo(ds: Dataset):
+    records = ds.counting_records()
+    return lambda: sre._index_marcelo(records)
+
+
+def _case_load_csv(ds: Dataset):
+    path = ds.counting_csv()
+    return lambda: sre.load_single_record_csv(path)
+
+
+def _case_load_xlsx(ds: Dataset):
+    path = ds.counting_xlsx()
+    return lambda: sre.load_single_record_xlsx(path)
+
+
+def _case_load_comparison_report(ds: Dataset):
+    path = ds.reference_csv()
+    return lambda: sre.load_comparison_report(path)
+
+
+def _case_load_reference_template(ds: Dataset):
+    path = ds.reference_xlsx()
+    return lambda: sre.load_reference_template(path)
+
+
+def _case_build_doc_index(ds: Dataset):
+    tpl = doc_index.prepare_template(ds.template_frame())
+    return lambda: doc_index.build_doc_index(tpl)
+
+
+def _case_assign_docs(ds: Dataset):
+    indexes = doc_index.build_doc_index(doc_index.prepare_template(ds.template_frame()))
+    db = ds.db_frame()
+    return lambda: doc_index.assign_docs(db.copy(), indexes)
+
+
+def _case_assign_docs_empty_db(ds: Dataset):
+    # Regressão: banco sem linhas (colunas de chave float64 depois do map) quebrava o merge
+    indexes = doc_index.build_doc_index(doc_index.prepare_template(ds.template_frame()))
+    empty = ds.db_frame().iloc[0:0]
+
+    def run():
+        records, _hits = doc_index.assign_docs(empty.copy(), indexes)
+        if records:
+            raise AssertionError(f"banco vazio gerou {len(records)} registros")
+    return run
+
+
+CASES: Dict[str, Callable[[Dataset], Callable[[], object]]] = {
+    "parse_number": _case_parse_number,
+    "format_quantity": _case_format_quantity,
+    "fix_storage_bin": _case_fix_storage_bin,
+    "norm_header": _case_norm_header,
+    "norm_key": _case_norm_key,
+    "adjust_ud_quantities": _case_adjust_ud_quantities,
+    "reallocate_quantities": _case_reallocate_quantities,
+    "detect_ud_sequence": _case_detect_ud_sequence,
+    "index_marcelo": _case_index_marcelo,
+    "load_csv": _case_load_csv,
+    "load_xlsx": _case_load_xlsx,
+    "load_comparison_report": _case_load_comparison_report,
+    "load_reference_template": _case_load_reference_template,
+    "build_doc_index": _case_build_doc_index,
+    "assign_docs": _case_assign_docs,
+    "assign_docs_empty_db": _case_assign_docs_empty_db,
+}
+
+
+def _parse_size(text: str) -> int:
+    t = text.strip().lower()
+    mult = 1
+    if t.endswith("k"):
+        mult, t = 1_000, t[:-1]
+    elif t.endswith("m"):
+        mult, t = 1_000_000, t[:-1]
+    return int(float(t) * mult)
+
+
+def _git_commit() -> Dict[str, object]:
+    def _git(*args) -> str:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, timeout=30).stdout.strip()
+    try:
+        return {"commit": _git("rev-parse", "--short", "HEAD") or "desconhecido",
+                "dirty": bool(_git("status", "--porcelain", "--", ".", ":!bench/results.jsonl", ":!logs"))}
+    except Exception:
+        return {"commit": "desconhecido", "dirty": False}
+
+
+def measure(fn: Callable[[], object], repeat: int) -> Dict[str, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(best, 6), "peak_mb": round(peak / (1024 * 1024), 3)}
+
+
+def _previous_results(commit: str) -> Dict[tuple, dict]:
+    """Última medição de cada (função, tamanho) feita em outro commit."""
+    prev: Dict[tuple, dict] = {}
+    if not os.path.isfile(RESULTS_FILE):
+        return prev
+    with open(RESULTS_FILE, encoding="utf-8") as f:
+        for line in f:
+            try:
+                r = json.loads(line)
+            except ValueError:
+                continue
+            if r.get("commit") != commit:
+                prev[(r.get("bench"), r.get("size"))] = r
+    return prev
+
+
+def _delta(now: float, before: Optional[float]) -> str:
+    if not before:
+        return ""
+    return f"{(now - before) / before * 100:+.1f}%"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bench das funções de dados da Parte 2.")
+    parser.add_argument("--sizes", default="10k,100k", help="Tamanhos separados por vírgula (ex.: 10k,100k,1m).")
+    parser.add_argument("--only", default="", help="Filtra casos por substring (vírgula para vários).")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetições para o melhor tempo.")
+    parser.add_argument("--no-save", action="store_true", help="Não grava em bench/results.jsonl.")
+    args = parser.parse_args(argv)
+
+    get_logger().setLevel(logging.WARNING)  # loaders logam a cada chamada
+    sizes = [_parse_size(s) for s in args.sizes.split(",") if s.strip()]
+    filters = [f.strip() for f in args.only.split(",") if f.strip()]
+    names = [n for n in CASES if not filters or any(f in n for f in filters)]
+    info = _git_commit()
+    prev = _previous_results(info["commit"])
+    stamp = datetime.now().isoformat(timespec="seconds")
+
+    print(f"commit={info['commit']}{' (alterado)' if info['dirty'] else ''} python={sys.version.split()[0]}")
+    print(f"{'função':<26}{'tamanho':>10}{'tempo (s)':>12}{'pico (MB)':>12}{'vs anterior':>14}")
+    results = []
+    with tempfile.TemporaryDirectory(prefix="bench_") as workdir:
+        for n in sizes:
+            ds = Dataset(n, workdir)
+            for name in names:
+                try:
+                    fn = CASES[name](ds)
+                except ImportError as e:
+                    print(f"{name:<26}{n:>10}  pulado ({e})")
+                    continue
+                m = measure(fn, args.repeat)
+                before = prev.get((name, n), {})
+                print(f"{name:<26}{n:>10}{m['seconds']:>12.4f}{m['peak_mb']:>12.2f}"
+                      f"{_delta(m['seconds'], before.get('seconds')):>14}")
+                results.append({"ts": stamp, **info, "python": sys.version.split()[0],
+                                "bench": name, "size": n, "repeat": args.repeat, **m})
+
+    if results and not args.no_save:
+        with open(RESULTS_FILE, "a", encoding="utf-8") as f:
+            for r in results:
+                f.write(json.dumps(r, ensure_ascii=False) + "\n")
+        print(f"{len(results)} medições gravadas em {RESULTS_FILE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,14 @@
+# __init__.py
+# lib/__init__.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\__init__.py
+"""
+Bibliotecas da Parte 2.
+Coloca a raiz do repositório no sys.path para o pacote comum/ (código
+compartilhado com a Parte 1).
+"""
+import os
+import sys
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if _ROOT not in sys.path:
+    sys.path.append(_ROOT)
@@ -0,0 +1,30 @@
+# artifacts.py
+# lib/artifacts.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\artifacts.py
+"""
+Evidências de erro da Parte 2 (ARTIFACT_*); implementação em comum/artifacts.py.
+"""
+import atexit
+from typing import Optional
+from comum.artifacts import ArtifactService
+from .config import settings
+from .logger import recent_lines
+
+_SERVICE: Optional[ArtifactService] = None
+
+
+def get_artifacts() -> ArtifactService:
+    global _SERVICE
+    if _SERVICE is None:
+        _SERVICE = ArtifactService(
+            settings.ARTIFACT_DIR,
+            settings.ARTIFACT_MAX_MB,
+            image_format=settings.ARTIFACT_FORMAT,
+            jpeg_quality=settings.ARTIFACT_JPEG_QUALITY,
+            full_page=settings.ARTIFACT_FULL_PAGE,
+            dom_snapshot=settings.ARTIFACT_DOM,
+            log_lines=settings.ARTIFACT_LOG_LINES,
+            recent_lines=recent_lines,
+        )
+        atexit.register(_SERVICE.close)
+    return _SERVICE
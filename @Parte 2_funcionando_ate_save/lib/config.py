@@ -46,10 +46,35 @@ class Settings:
         os.getenv("SINGLE_RECORD_INTERVAL_S",
                   str(_jget("playback.single_record_interval_s", 1.0)))
     )
+    BROWSER_CDP: str = os.getenv(
+        "SAP_BROWSER_CDP",
+        _jget("browser.cdp", "")
+    )  # '' = navegador próprio; 'auto' ou URL CDP = aba emprestada do browser_service.py
     SLOW_MO: int = int(
         os.getenv("SLOW_MO",
                   str(_jget("browser.slow_mo_ms", 0)))
     )
+    LEAN_BROWSER: bool = (
+        os.getenv("LEAN_BROWSER",
+                  str(_jget("browser.lean", False))).lower()
+        in ("1", "true", "yes")
+    )  # sem animações, recursos não essenciais bloqueados, viewport pequeno (lean_browser.py)
+    LEAN_BLOCK_TYPES: str = os.getenv(
+        "LEAN_BLOCK_TYPES",
+        _jget("browser.lean_block_types", "image,font,media")
+    )  # resource_type do Playwright, separados por vírgula
+    LEAN_ALLOW: str = os.getenv(
+        "LEAN_ALLOW",
+        _jget("browser.lean_allow", "SAP-icons")
+    )  # regex de URL liberadas mesmo com o tipo bloqueado (fonte de ícones dos botões)
+    LEAN_VIEWPORT: str = os.getenv(
+        "LEAN_VIEWPORT",
+        _jget("browser.lean_viewport", "1024x640")
+    )  # '' = viewport padrão
+    LEAN_CHROMIUM_ARGS: str = os.getenv(
+        "LEAN_CHROMIUM_ARGS",
+        _jget("browser.lean_chromium_args", "")
+    )  # flags extras, separadas por vírgula
     DEFAULT_TIMEOUT: int = int(
         os.getenv("DEFAULT_TIMEOUT_MS",
                   str(_jget("timeouts.appear_ms", 15000)))
@@ -92,6 +117,252 @@ class Settings:
         "ZERO_STOCK_MODE",
         _jget("playback.zero_stock_mode", "mark")
     ).lower()  # valores suportados: 'mark' ou 'skip'
+    LIGHT_READER_MAX_MB: float = float(
+        os.getenv("LIGHT_READER_MAX_MB",
+                  str(_jget("inputs.light_reader_max_mb", 5)))
+    )  # .xlsx até esse tamanho é lido sem pandas/openpyxl
+    FAST_FORM_FILL: bool = (
+        os.getenv("FAST_FORM_FILL",
+                  str(_jget("playback.fast_form_fill", True))).lower()
+        in ("1", "true", "yes")
+    )  # preenche a tela SRE num único evaluate (fallback campo a campo)
+    STATUS_STREAM: bool = (
+        os.getenv("STATUS_STREAM",
+                  str(_jget("playback.status_stream", True))).lower()
+        in ("1", "true", "yes")
+    )  # mensagens da barra de status via push (expose_binding)
+    STATUS_GRACE_MS: int = int(
+        os.getenv("STATUS_GRACE_MS",
+                  str(_jget("timeouts.status_grace_ms", 150)))
+    )  # janela para receber erro do SAP após Enter
+    NAV_OKCODE: bool = (
+        os.getenv("NAV_OKCODE",
+                  str(_jget("playback.nav_okcode", True))).lower()
+        in ("1", "true", "yes")
+    )  # troca de transação por '/nTCODE' (navigation.py); False = digitação/cliques antigos
+    NAV_DEEP_LINK: bool = (
+        os.getenv("NAV_DEEP_LINK",
+                  str(_jget("playback.nav_deep_link", False))).lower()
+        in ("1", "true", "yes")
+    )  # abre a sessão direto na transação pela URL (?~transaction=)
+    REQUEST_TRACKER: bool = (
+        os.getenv("REQUEST_TRACKER",
+                  str(_jget("playback.request_tracker", True))).lower()
+        in ("1", "true", "yes")
+    )  # fim de ação = round trip do WebGUI concluído + DOM pintado (request_tracker.py)
+    SETTLE_START_MS: int = int(
+        os.getenv("SETTLE_START_MS",
+                  str(_jget("timeouts.settle_start_ms", 300)))
+    )  # ação sem requisição nesse prazo é considerada local
+    SETTLE_QUIET_MS: int = int(
+        os.getenv("SETTLE_QUIET_MS",
+                  str(_jget("timeouts.settle_quiet_ms", 80)))
+    )  # sem round trip pendente por esse tempo = resposta aplicada
+    STATIC_CACHE: bool = (
+        os.getenv("STATIC_CACHE",
+                  str(_jget("static_cache.enabled", False))).lower()
+        in ("1", "true", "yes")
+    )  # JS/CSS/temas/imagens do WebGUI servidos do disco (static_cache.py)
+    STATIC_CACHE_DIR: str = os.getenv(
+        "STATIC_CACHE_DIR",
+        _jget("static_cache.dir", os.path.join(os.getcwd(), "cache", "static"))
+    )
+    STATIC_CACHE_MAX_MB: float = float(
+        os.getenv("STATIC_CACHE_MAX_MB",
+                  str(_jget("static_cache.max_mb", 300)))
+    )
+    STATIC_CACHE_TTL_S: float = float(
+        os.getenv("STATIC_CACHE_TTL_S",
+                  str(_jget("static_cache.ttl_s", 86400)))
+    )  # validade quando o servidor não manda max-age/Expires
+    STATIC_CACHE_VERSION: str = os.getenv(
+        "STATIC_CACHE_VERSION",
+        str(_jget("static_cache.version", ""))
+    )  # trocar o valor descarta o cache (ex.: após upgrade do ITS)
+    LEDGER_ENABLED: bool = (
+        os.getenv("LEDGER_ENABLED",
+                  str(_jget("ledger.enabled", True))).lower()
+        in ("1", "true", "yes")
+    )
+    LEDGER_PATH: str = os.getenv(
+        "LEDGER_PATH",
+        _jget("ledger.path", os.path.join(os.getcwd(), "posting_ledger.db"))
+    )  # SQLite com linhas lançadas / DOCs salvos (retomada após queda)
+    QUEUE_PATH: str = os.getenv(
+        "QUEUE_PATH",
+        _jget("queue.path", os.path.join(os.getcwd(), "posting_queue.db"))
+    )  # fila de DOCs (--compile-queue / --runner); pasta compartilhada = vários runners
+    QUEUE_LEASE_S: float = float(
+        os.getenv("QUEUE_LEASE_S",
+                  str(_jget("queue.lease_s", 300)))
+    )  # DOC sem heartbeat por esse tempo volta para a fila (runner morto)
+    QUEUE_HEARTBEAT_S: float = float(
+        os.getenv("QUEUE_HEARTBEAT_S",
+                  str(_jget("queue.heartbeat_s", 30)))
+    )
+    QUEUE_MAX_ATTEMPTS: int = int(
+        os.getenv("QUEUE_MAX_ATTEMPTS",
+                  str(_jget("queue.max_attempts", 3)))
+    )  # leases por DOC antes de marcar como falho
+    DOC_CONTENTS: bool = (
+        os.getenv("DOC_CONTENTS",
+                  str(_jget("doc_contents.enabled", False))).lower()
+        in ("1", "true", "yes")
+    )  # lê os itens de cada DOC (LI03N) antes de lançar: pula já contados, rejeita bin/material fora do DOC
+    DOC_CONTENTS_PATH: str = os.getenv(
+        "DOC_CONTENTS_PATH",
+        _jget("doc_contents.path", os.path.join(os.getcwd(), "doc_contents.db"))
+    )
+    DOC_CONTENTS_TTL_S: float = float(
+        os.getenv("DOC_CONTENTS_TTL_S",
+                  str(_jget("doc_contents.ttl_s", 1800)))
+    )  # conteúdo mais velho que isso é relido do SAP
+    DOC_CONTENTS_TCODE: str = os.getenv(
+        "DOC_CONTENTS_TCODE",
+        _jget("doc_contents.tcode", "LI03N")
+    )
+    DOC_CONTENTS_WAREHOUSE: str = os.getenv(
+        "DOC_CONTENTS_WAREHOUSE",
+        _jget("doc_contents.warehouse", "BR2")
+    )
+    DOC_CONTENTS_MAX_PAGES: int = int(
+        os.getenv("DOC_CONTENTS_MAX_PAGES",
+                  str(_jget("doc_contents.max_pages", 200)))
+    )  # PageDown por DOC; acima disso o conteúdo é descartado
+    DOC_CONTENTS_BIN_COLUMN: str = os.getenv(
+        "DOC_CONTENTS_BIN_COLUMN",
+        _jget("doc_contents.bin_column", r"storage bin|^bin|posi")
+    )  # regex do cabeçalho da coluna
+    DOC_CONTENTS_MATERIAL_COLUMN: str = os.getenv(
+        "DOC_CONTENTS_MATERIAL_COLUMN",
+        _jget("doc_contents.material_column", r"^material")
+    )
+    DOC_CONTENTS_COUNTED_COLUMN: str = os.getenv(
+        "DOC_CONTENTS_COUNTED_COLUMN",
+        _jget("doc_contents.counted_column", r"count|contad")
+    )
+    DOC_CONTENTS_COUNTED_VALUES: str = os.getenv(
+        "DOC_CONTENTS_COUNTED_VALUES",
+        _jget("doc_contents.counted_values", r"^(x|yes|sim|counted|contado)$")
+    )  # valor da célula que marca item contado
+    PREFLIGHT_ENABLED: bool = (
+        os.getenv("PREFLIGHT_ENABLED",
+                  str(_jget("preflight.enabled", True))).lower()
+        in ("1", "true", "yes")
+    )
+    PREFLIGHT_STRICT_BINS: bool = (
+        os.getenv("PREFLIGHT_STRICT_BINS",
+                  str(_jget("preflight.strict_bins", False))).lower()
+        in ("1", "true", "yes")
+    )  # rejeita bin vazio / fora da referência (desligado: lança como antes)
+    REJECTS_DIR: str = os.getenv(
+        "REJECTS_DIR",
+        _jget("preflight.rejects_dir", os.path.join(os.getcwd(), "logs"))
+    )  # CSV com linhas rejeitadas na pré-validação
+    PIPELINE_QUEUE_SIZE: int = int(
+        os.getenv("PIPELINE_QUEUE_SIZE",
+                  str(_jget("playback.pipeline_queue_size", 200)))
+    )  # registros prontos aguardando lançamento (fila preparação -> SAP)
+    PROFILE_MODE: str = os.getenv(
+        "PROFILE_MODE",
+        _jget("profiling.mode", "off")
+    ).lower()  # 'off', 'run' (execução inteira) ou 'record' (1 a cada N registros)
+    PROFILE_EVERY_N: int = int(
+        os.getenv("PROFILE_EVERY_N",
+                  str(_jget("profiling.every_n", 10)))
+    )
+    PROFILE_TOP_N: int = int(
+        os.getenv("PROFILE_TOP_N",
+                  str(_jget("profiling.top_n", 25)))
+    )
+    PROFILE_DIR: str = os.getenv(
+        "PROFILE_DIR",
+        _jget("profiling.dir", os.path.join(os.getcwd(), "logs"))
+    )  # .prof e resumo top-N
+    MEMORY_MONITOR: bool = (
+        os.getenv("MEMORY_MONITOR",
+                  str(_jget("memory.enabled", False))).lower()
+        in ("1", "true", "yes")
+    )  # opt-in: amostras em logs/memory_*.jsonl + reciclagem (memory_monitor.py)
+    MEMORY_SAMPLE_EVERY_N: int = int(
+        os.getenv("MEMORY_SAMPLE_EVERY_N",
+                  str(_jget("memory.sample_every_n", 25)))
+    )
+    MEMORY_TRACEMALLOC: bool = (
+        os.getenv("MEMORY_TRACEMALLOC",
+                  str(_jget("memory.tracemalloc", False))).lower()
+        in ("1", "true", "yes")
+    )  # heap do Python por tracemalloc (custo extra em cada alocação)
+    MEMORY_DIR: str = os.getenv(
+        "MEMORY_DIR",
+        _jget("memory.dir", os.path.join(os.getcwd(), "logs"))
+    )
+    RECYCLE_EVERY_N: int = int(
+        os.getenv("RECYCLE_EVERY_N",
+                  str(_jget("memory.recycle_every_n", 0)))
+    )  # nova sessão de navegador a cada N registros (0 = só pelos limites abaixo)
+    RECYCLE_BROWSER_RSS_MB: float = float(
+        os.getenv("RECYCLE_BROWSER_RSS_MB",
+                  str(_jget("memory.recycle_browser_rss_mb", 0)))
+    )  # 0 = sem limite; precisa de psutil
+    RECYCLE_JS_HEAP_MB: float = float(
+        os.getenv("RECYCLE_JS_HEAP_MB",
+                  str(_jget("memory.recycle_js_heap_mb", 0)))
+    )  # 0 = sem limite
+    LIST_EXPORT_DIR: str = os.getenv(
+        "LIST_EXPORT_DIR",
+        _jget("list_export.dir", os.path.join(os.getcwd(), "logs", "exports"))
+    )  # arquivos baixados pelas exportações de lista (lib/list_export.py)
+    LIST_EXPORT_OK_CODE: str = os.getenv(
+        "LIST_EXPORT_OK_CODE",
+        _jget("list_export.ok_code", "%PC")
+    )  # Lista > Gravar > Arquivo local
+    LIST_EXPORT_FORMAT: str = os.getenv(
+        "LIST_EXPORT_FORMAT",
+        _jget("list_export.format", r"spreadsheet|planilha")
+    )  # regex do formato no diálogo (planilha = texto com tabulação)
+    LIST_EXPORT_EXECUTE_KEY: str = os.getenv(
+        "LIST_EXPORT_EXECUTE_KEY",
+        _jget("list_export.execute_key", "F8")
+    )
+    LIST_EXPORT_TIMEOUT_S: float = float(
+        os.getenv("LIST_EXPORT_TIMEOUT_S",
+                  str(_jget("list_export.timeout_s", 120)))
+    )  # espera pelo download
+    LIST_EXPORT_DECIMAL: str = os.getenv(
+        "LIST_EXPORT_DECIMAL",
+        _jget("list_export.decimal", ",")
+    )  # separador decimal do perfil do usuário SAP: ',' = 1.234,567 (pt-BR) | '.' = 1,234.567
+    ARTIFACT_DIR: str = os.getenv(
+        "ARTIFACT_DIR",
+        _jget("artifacts.dir", os.path.join(os.getcwd(), "logs", "artifacts"))
+    )
+    ARTIFACT_MAX_MB: float = float(
+        os.getenv("ARTIFACT_MAX_MB",
+                  str(_jget("artifacts.max_mb", 200)))
+    )  # cota em disco; acima disso remove as evidências mais antigas
+    ARTIFACT_FORMAT: str = os.getenv(
+        "ARTIFACT_FORMAT",
+        _jget("artifacts.format", "jpeg")
+    ).lower()  # 'jpeg' ou 'png'
+    ARTIFACT_JPEG_QUALITY: int = int(
+        os.getenv("ARTIFACT_JPEG_QUALITY",
+                  str(_jget("artifacts.jpeg_quality", 70)))
+    )
+    ARTIFACT_FULL_PAGE: bool = (
+        os.getenv("ARTIFACT_FULL_PAGE",
+                  str(_jget("artifacts.full_page", False))).lower()
+        in ("1", "true", "yes")
+    )
+    ARTIFACT_DOM: bool = (
+        os.getenv("ARTIFACT_DOM",
+                  str(_jget("artifacts.dom_snapshot", True))).lower()
+        in ("1", "true", "yes")
+    )
+    ARTIFACT_LOG_LINES: int = int(
+        os.getenv("ARTIFACT_LOG_LINES",
+                  str(_jget("artifacts.log_lines", 200)))
+    )
 
 settings = Settings()
 
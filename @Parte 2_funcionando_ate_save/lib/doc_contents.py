@@ -0,0 +1,299 @@
+# doc_contents.py
+# lib/doc_contents.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\doc_contents.py
+"""
+Conteúdo dos DOCs de inventário lido do SAP (LI03N) antes do lançamento
+(DOC_CONTENTS=1): bins/materiais de cada DOC e quais itens já estão contados.
+  - prefetch: um LI03N por DOC da lista de lançamento (OK-code /nLI03N), tabela
+    de itens lida numa chamada evaluate por página (não célula a célula)
+  - cache local (SQLite, DOC_CONTENTS_PATH) válido por DOC_CONTENTS_TTL_S; DOC
+    ainda fresco não é relido (nova execução / --compile-queue usam o cache);
+    DOC salvo no lançamento sai do cache (invalidate), os itens mudaram no SAP
+  - DocCheck na preparação: item já contado no SAP é pulado (sem lançamento
+    duplicado); bin/material fora do DOC vai para o CSV de rejeitados
+DOC que não pôde ser lido fica sem conferência (o lançamento segue como antes).
+Colunas localizadas pelo cabeçalho (DOC_CONTENTS_*_COLUMN, regex).
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+from playwright.sync_api import Page
+from .config import settings
+from .logger import get_logger
+from .navigation import goto_transaction
+from .page_actions import fill_role_textbox, safe_press
+from .preflight import norm_code
+from .records import LaunchRecord
+from .status_stream import get_status_stream
+from . import selectors
+
+log = get_logger("doc_contents")
+
+ALREADY_COUNTED = "item já contado no SAP"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc TEXT PRIMARY KEY,
+    fetched_at REAL NOT NULL,
+    n_items INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    doc TEXT NOT NULL,
+    storage_bin TEXT NOT NULL,
+    material TEXT NOT NULL,
+    counted INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_items_doc ON items(doc);
+"""
+
+# Tabela de itens: maior [role=grid] da página; checkbox vira 'X'
+_READ_GRID_JS = """
+() => {
+  let grid = null, most = 0;
+  for (const g of document.querySelectorAll('[role="grid"]')) {
+    const n = g.querySelectorAll('[role="row"]').length;
+    if (n > most) { grid = g; most = n; }
+  }
+  if (!grid) return null;
+  const text = (c) => {
+    const input = c.querySelector('input');
+    if (input) return input.type === 'checkbox' ? (input.checked ? 'X' : '') : (input.value || '').trim();
+    return (c.innerText || '').trim();
+  };
+  const rows = [];
+  let headers = [];
+  for (const r of grid.querySelectorAll('[role="row"]')) {
+    const heads = r.querySelectorAll('[role="columnheader"]');
+    if (heads.length && !headers.length) { headers = Array.from(heads, text); continue; }
+    const cells = Array.from(r.querySelectorAll('[role="gridcell"]'), text);
+    if (cells.some(v => v)) rows.push({key: r.getAttribute('aria-rowindex') || '', cells});
+  }
+  return {headers, rows};
+}
+"""
+
+
+@dataclass
+class DocItem:
+    storage_bin: str
+    material: str
+    counted: bool
+
+
+class DocContentsCache:
+    def __init__(self, path: str, ttl_s: float):
+        self.path = path
+        self.ttl_s = ttl_s
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def fresh(self, docs: Iterable[str]) -> Dict[str, List[DocItem]]:
+        """DOCs lidos há menos de ttl_s (os demais precisam de novo LI03N)."""
+        limit = time.time() - self.ttl_s
+        out: Dict[str, List[DocItem]] = {}
+        with self._lock:
+            for doc in docs:
+                row = self._conn.execute("SELECT fetched_at FROM docs WHERE doc = ?", (doc,)).fetchone()
+                if row is None or row[0] < limit:
+                    continue
+                out[doc] = [DocItem(b, m, bool(c)) for b, m, c in self._conn.execute(
+                    "SELECT storage_bin, material, counted FROM items WHERE doc = ?", (doc,))]
+        return out
+
+    def put(self, doc: str, items: List[DocItem]):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM items WHERE doc = ?", (doc,))
+            self._conn.executemany(
+                "INSERT INTO items VALUES (?, ?, ?, ?)",
+                [(doc, i.storage_bin, i.material, int(i.counted)) for i in items],
+            )
+            self._conn.execute("INSERT OR REPLACE INTO docs VALUES (?, ?, ?)", (doc, time.time(), len(items)))
+
+    def invalidate(self, doc: str):
+        """
+        Descarta o conteúdo do DOC (salvo nesta execução): a próxima conferência lê a
+        LI03N de novo. Chamado no laço de lançamento: falha só vira aviso.
+        """
+        doc = str(doc).strip()
+        try:
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM items WHERE doc = ?", (doc,))
+                self._conn.execute("DELETE FROM docs WHERE doc = ?", (doc,))
+        except sqlite3.Error as e:
+            log.warning(f"DOC {doc}: cache de conteúdo não invalidado ({e}).")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _column(headers: List[str], pattern: str) -> Optional[int]:
+    rx = re.compile(pattern, re.I)
+    for i, h in enumerate(headers):
+        if rx.search(h):
+            return i
+    return None
+
+
+def _parse_grid(grid: Optional[dict]) -> Optional[Dict[str, object]]:
+    if not grid or not grid.get("headers"):
+        return None
+    headers = grid["headers"]
+    cols = {
+        "bin": _column(headers, settings.DOC_CONTENTS_BIN_COLUMN),
+        "material": _column(headers, settings.DOC_CONTENTS_MATERIAL_COLUMN),
+        "counted": _column(headers, settings.DOC_CONTENTS_COUNTED_COLUMN),
+    }
+    if cols["bin"] is None or cols["material"] is None:
+        log.warning(f"LI03N: colunas de bin/material não encontradas no cabeçalho {headers}.")
+        return None
+    return {"cols": cols, "width": len(headers)}
+
+
+def _counted(value: str) -> bool:
+    return bool(re.search(settings.DOC_CONTENTS_COUNTED_VALUES, value.strip(), re.I)) if value.strip() else False
+
+
+def read_document_items(page: Page, doc: str) -> Optional[List[DocItem]]:
+    """
+    Abre o DOC na LI03N e lê todas as páginas da tabela de itens. None = não lido
+    (inclusive leitura vazia ou incompleta: conteúdo parcial rejeitaria linhas válidas).
+    """
+    if not goto_transaction(page, settings.DOC_CONTENTS_TCODE):
+        return None
+    fill_role_textbox(page, ("textbox", "Warehouse Number / Warehouse"), settings.DOC_CONTENTS_WAREHOUSE,
+                      press_enter=False)
+    stream = get_status_stream(page)
+    mark = stream.mark() if stream else 0
+    fill_role_textbox(page, selectors.INVENTORY_NUMBER_ROLE, doc, press_enter=True)
+    if stream:
+        stream.raise_if_error(mark, context=f"LI03N DOC={doc}")
+
+    layout = None
+    items: List[DocItem] = []
+    seen = set()
+    for _ in range(settings.DOC_CONTENTS_MAX_PAGES):
+        grid = page.evaluate(_READ_GRID_JS)
+        layout = layout or _parse_grid(grid)
+        if layout is None:
+            return None
+        cols, width = layout["cols"], layout["width"]
+        new = 0
+        for row in grid["rows"]:
+            cells = row["cells"]
+            if len(cells) > width:
+                cells = cells[len(cells) - width:]  # coluna de seleção da linha à esquerda
+            elif len(cells) < width:
+                continue  # linha de totais/agrupamento
+            key = row["key"] or "|".join(cells)
+            if key in seen:
+                continue
+            seen.add(key)
+            new += 1
+            bin_, material = cells[cols["bin"]], cells[cols["material"]]
+            if not bin_ and not material:
+                continue
+            counted = _counted(cells[cols["counted"]]) if cols["counted"] is not None else False
+            items.append(DocItem(norm_code(bin_), norm_code(material), counted))
+        if not new:
+            break
+        # Próxima página da tabela (o WebGUI só renderiza as linhas visíveis)
+        safe_press(page, "PageDown", f"LI03N DOC {doc}")
+    else:
+        log.warning(f"DOC {doc}: mais de {settings.DOC_CONTENTS_MAX_PAGES} páginas na LI03N; conteúdo descartado.")
+        return None
+    return items or None
+
+
+def prefetch(page: Page, docs: Iterable[str], cache: DocContentsCache) -> Dict[str, List[DocItem]]:
+    """Conteúdo de cada DOC: do cache se fresco, senão LI03N. O chamador volta para a LI11N."""
+    docs = list(dict.fromkeys(d for d in docs if d))
+    contents = cache.fresh(docs)
+    missing = [d for d in docs if d not in contents]
+    log.info(f"Conteúdo dos DOCs: {len(contents)} do cache, {len(missing)} a ler na {settings.DOC_CONTENTS_TCODE}.")
+    start = time.perf_counter()
+    failed = 0
+    for i, doc in enumerate(missing, start=1):
+        try:
+            items = read_document_items(page, doc)
+        except Exception as e:
+            log.warning(f"DOC {doc}: conteúdo não lido ({e}).")
+            items = None
+        if items is None:
+            failed += 1
+            if failed >= 3 and failed == i:
+                log.warning("Leitura da LI03N falhou nos primeiros DOCs; prefetch interrompido.")
+                break
+            continue
+        cache.put(doc, items)
+        contents[doc] = items
+        log.info(f"[{i}/{len(missing)}] DOC {doc}: {len(items)} itens, {sum(it.counted for it in items)} contados.")
+    if missing:
+        log.info(f"Prefetch em {time.perf_counter() - start:.1f}s ({failed} DOCs sem conteúdo).")
+    return contents
+
+
+class DocCheck:
+    """Conferência das linhas de lançamento contra o conteúdo dos DOCs."""
+
+    def __init__(self, contents: Dict[str, List[DocItem]]):
+        self._items: Dict[str, Dict[tuple, bool]] = {}
+        for doc, items in contents.items():
+            by_key: Dict[tuple, bool] = {}
+            for it in items:
+                # Mesmo bin/material em vários itens: contado só se todos estiverem
+                by_key[(it.storage_bin, it.material)] = by_key.get((it.storage_bin, it.material), True) and it.counted
+            self._items[norm_code(doc)] = by_key
+        self.counted = 0
+
+    def __bool__(self) -> bool:
+        return bool(self._items)
+
+    def check(self, rec: LaunchRecord) -> Optional[str]:
+        """ALREADY_COUNTED, motivo de rejeição ou None (lança; DOC sem conteúdo também)."""
+        items = self._items.get(norm_code(rec.inventory_record))
+        if items is None:
+            return None
+        counted = items.get((norm_code(rec.storage_bin), norm_code(rec.material_number)))
+        if counted is None:
+            return f"bin {rec.storage_bin} / material {rec.material_number} não consta no DOC {rec.inventory_record}"
+        if counted:
+            self.counted += 1
+            return ALREADY_COUNTED
+        return None
+
+
+def open_doc_contents() -> Optional[DocContentsCache]:
+    if not settings.DOC_CONTENTS:
+        return None
+    return DocContentsCache(settings.DOC_CONTENTS_PATH, settings.DOC_CONTENTS_TTL_S)
+
+
+def load_doc_check(docs: Iterable[str], page: Optional[Page] = None) -> Optional[DocCheck]:
+    """
+    DocCheck dos DOCs (DOC_CONTENTS=1). Com página lê da LI03N o que não está
+    fresco no cache; sem página (--compile-queue) usa só o cache.
+    Qualquer falha devolve None: o lançamento segue sem conferência.
+    """
+    cache = open_doc_contents()
+    if cache is None:
+        return None
+    try:
+        docs = list(dict.fromkeys(d for d in docs if d))
+        contents = prefetch(page, docs, cache) if page is not None else cache.fresh(docs)
+        if page is None:
+            log.info(f"Conteúdo dos DOCs (cache): {len(contents)} de {len(docs)} DOCs.")
+        check = DocCheck(contents)
+        return check if check else None
+    except Exception as e:
+        log.warning(f"Conteúdo dos DOCs indisponível ({e}); lançando sem conferência.")
+        return None
+    finally:
+        cache.close()
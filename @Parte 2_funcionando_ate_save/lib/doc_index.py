@@ -0,0 +1,148 @@
+# doc_index.py
+# lib/doc_index.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\doc_index.py
+"""
+Associação de DOC (Template_RPA) aos registros do banco.
+Busca não sequencial: cada registro do banco procura em qualquer linha do template.
+Índices usados (precedência nessa ordem):
+  full: (CENTRO, DEPOSITO, MATERIAL, BIN)
+  mat_bin: (MATERIAL, BIN)
+  bin_only: BIN
+Tudo em operações de tabela: chaves normalizadas como colunas (norm_key só uma vez
+por valor distinto), índices = tabelas sem chave repetida (última linha vence, como
+no dicionário antigo) e um merge left por nível sobre o banco inteiro.
+Separado de Parte2.fetch_counting_records para poder ser medido (bench/) sem banco.
+"""
+import unicodedata
+from typing import Dict, List, Tuple
+from .logger import get_logger
+
+log = get_logger("doc_index")
+
+TEMPLATE_RENAME = {
+    "Depósito": "Deposito",
+    "Posição no depósito": "PosicaoDeposito",
+    "Tipo de depósito": "TipoDeposito",
+}
+TEMPLATE_COLUMNS = ["Centro", "Deposito", "PosicaoDeposito", "Material", "DOC", "TipoDeposito"]
+DB_COLUMNS = ["Centro", "Deposito", "PosicaoDeposito", "Material"]
+
+# Colunas de chave normalizada e níveis do índice (nome, colunas da chave)
+_KEYS = {"Centro": "_centro", "Deposito": "_deposito", "Material": "_material", "PosicaoDeposito": "_bin"}
+TIERS = (
+    ("full", ["_centro", "_deposito", "_material", "_bin"]),
+    ("mat_bin", ["_material", "_bin"]),
+    ("bin", ["_bin"]),
+)
+
+
+def norm_key(v: str | None) -> str:
+    if v is None:
+        return ""
+    s = str(v).strip()
+    s = "".join(c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn")
+    return s.upper()
+
+
+def norm_column(series):
+    """norm_key da coluna inteira, calculado uma vez por valor distinto."""
+    mapping = {v: norm_key(v) for v in series.unique()}
+    return series.map(mapping)
+
+
+def _key_frame(df):
+    """
+    Chaves normalizadas (mesma ordem de linhas, índice posicional). Sempre texto:
+    coluna vazia viria float64 do map e o merge com a outra tabela falharia.
+    """
+    keys = df[list(_KEYS)].rename(columns=_KEYS).reset_index(drop=True)
+    for c in _KEYS.values():
+        keys[c] = norm_column(keys[c]).astype(str)
+    return keys
+
+
+def prepare_template(df_tpl):
+    """Renomeia colunas para o padrão e garante as colunas usadas (texto, sem NaN)."""
+    for k, v in TEMPLATE_RENAME.items():
+        if k in df_tpl.columns:
+            df_tpl = df_tpl.rename(columns={k: v})
+    for c in TEMPLATE_COLUMNS:
+        if c not in df_tpl.columns:
+            df_tpl[c] = ""
+        df_tpl[c] = df_tpl[c].fillna("").astype(str).str.strip()
+    return df_tpl
+
+
+def build_doc_index(df_tpl) -> tuple:
+    """
+    Índices (full, mat_bin, bin) como tabelas [colunas da chave..., DOC], ignorando
+    linhas sem DOC. Cada linha do template entra só no nível mais completo que suas
+    chaves permitem; chave repetida fica com a última linha.
+    """
+    keys = _key_frame(df_tpl)
+    keys["DOC"] = df_tpl["DOC"].astype(str).str.strip().to_numpy()
+    keys = keys[keys["DOC"] != ""]
+    has = {c: keys[c] != "" for c in _KEYS.values()}
+    full = has["_centro"] & has["_deposito"] & has["_material"] & has["_bin"]
+    mat_bin = ~full & has["_material"] & has["_bin"]
+    bin_only = ~full & ~mat_bin & has["_bin"]
+
+    indexes = tuple(
+        keys.loc[mask, cols + ["DOC"]].drop_duplicates(subset=cols, keep="last").reset_index(drop=True)
+        for (_, cols), mask in zip(TIERS, (full, mat_bin, bin_only))
+    )
+    log.info(f"Índice DOC: full={len(indexes[0])} mat_bin={len(indexes[1])} bin={len(indexes[2])}")
+    return indexes
+
+
+def assign_docs(df_db, indexes) -> Tuple[List[dict], Dict[str, int]]:
+    """
+    Registros prontos para lançamento (com DOC e Material/Centro/Depósito preenchidos),
+    na ordem do banco, e contagem de acertos por índice.
+    """
+    hits = {"full": 0, "mat_bin": 0, "bin": 0}
+    if df_db.empty:
+        log.info("Associados DOC: banco sem registros | Final=0")
+        return [], hits
+    for c in DB_COLUMNS:
+        df_db[c] = df_db[c].fillna("").astype(str).str.strip()
+
+    # Um merge left por nível (chaves únicas no índice: não multiplica linhas, mantém a ordem)
+    work = _key_frame(df_db)
+    for (name, cols), index in zip(TIERS, indexes):
+        work = work.merge(index.rename(columns={"DOC": f"_doc_{name}"}), on=cols, how="left")
+
+    # Precedência: full, depois mat_bin, depois bin
+    hit_full = work["_doc_full"].notna()
+    hit_mat_bin = ~hit_full & work["_doc_mat_bin"].notna()
+    hit_bin = ~hit_full & ~hit_mat_bin & work["_doc_bin"].notna()
+    doc = work["_doc_full"].where(hit_full, work["_doc_mat_bin"].where(hit_mat_bin, work["_doc_bin"]))
+
+    # Sem DOC não lança; exigir campos obrigatórios preenchidos
+    keep = (doc.notna()
+            & (df_db["Material"].to_numpy() != "")
+            & (df_db["Centro"].to_numpy() != "")
+            & (df_db["Deposito"].to_numpy() != "")).to_numpy()
+    rows = df_db[keep]
+    n = len(rows)
+    quantity = rows["QuantidadeEleita"] if "QuantidadeEleita" in rows.columns else [None] * n
+    deposit_type = rows["TipoDeposito"] if "TipoDeposito" in rows.columns else [None] * n
+
+    records: list[dict] = [
+        {
+            "center": centro,
+            "deposit": deposito,
+            "bin": bin_,
+            "material": material,
+            "quantity": qty,
+            "doc": d,
+            "deposit_type": tipo,
+        }
+        for centro, deposito, bin_, material, qty, d, tipo in zip(
+            rows["Centro"], rows["Deposito"], rows["PosicaoDeposito"], rows["Material"],
+            quantity, doc[keep], deposit_type)
+    ]
+
+    hits.update(full=int(hit_full.sum()), mat_bin=int(hit_mat_bin.sum()), bin=int(hit_bin.sum()))
+    log.info(f"Associados DOC: full={hits['full']} mat_bin={hits['mat_bin']} bin={hits['bin']} | Final={len(records)}")
+    return records, hits
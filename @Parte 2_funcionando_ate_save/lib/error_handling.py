@@ -1,11 +1,10 @@
 # error_handling.py
 # lib/error_handling.py
 # filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\error_handling.py
-import os
-from datetime import datetime
 from typing import Tuple, Type
 from .logger import get_logger
 from .config import settings
+from .artifacts import get_artifacts
 from .exceptions import (
     AutomationError,
     ElementNotFound,
@@ -27,17 +26,13 @@ _ERROR_MAP: dict[Type[Exception], Tuple[str, str]] = {
 def _screenshot(page, prefix: str):
     if not settings.SCREENSHOT_ON_ERROR or page is None:
         return
-    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-    name = f"{prefix}_{ts}.png"
-    try:
-        page.screenshot(path=name)
-        log.info(f"Screenshot salva: {name}")
-    except Exception as e:
-        log.error(f"Falha ao salvar screenshot: {e}")
+    # Captura em memória; gravação/cota na thread de evidências
+    name = get_artifacts().capture(page, prefix)
+    log.info(f"Evidências enfileiradas: {name}")
 
 def handle_flow_exception(exc: Exception, sap_session, stage: str):
     """
-    Centraliza tratamento: log estruturado + screenshot.
+    Centraliza tratamento: log estruturado + evidências (screenshot, DOM, log).
     Retorna código simbólico do erro.
     """
     page = getattr(sap_session, "page", None)
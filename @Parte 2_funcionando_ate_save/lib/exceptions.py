@@ -27,4 +27,10 @@ class PageNotIdle(AutomationError):
     default_message = "Página não ficou estável."
 
 class SAPMessageError(AutomationError):
-    default_message = "Mensagem de erro retornada pelo SAP."
\ No newline at end of file
+    default_message = "Mensagem de erro retornada pelo SAP."
+
+class FieldNotConfirmed(AutomationError):
+    default_message = "Valor digitado não confirmado pelo SAP."
+
+class ListExportError(AutomationError):
+    default_message = "Exportação de lista do SAP falhou."
\ No newline at end of file
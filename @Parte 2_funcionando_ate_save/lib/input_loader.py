@@ -0,0 +1,90 @@
+# input_loader.py
+# lib/input_loader.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\input_loader.py
+"""
+Carga das entradas (banco, Template_RPA, arquivo de contagem) em threads,
+em paralelo com a abertura do navegador e o login no SAP.
+Cada entrada é uma tarefa nomeada; check() levanta a primeira falha já
+ocorrida (o chamador confere antes de cada passo de navegação) e result()
+espera a tarefa terminar. As threads não tocam no Playwright.
+"""
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+from .logger import get_logger
+
+log = get_logger("inputs")
+
+
+class InputLoadError(RuntimeError):
+    def __init__(self, name: str, cause: BaseException):
+        super().__init__(f"Falha ao carregar '{name}': {cause}")
+        self.name = name
+        self.cause = cause
+
+
+class InputLoader:
+    def __init__(self, max_workers: int = 3):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="inputs")
+        self._tasks: Dict[str, Future] = {}
+        self._t0 = time.perf_counter()
+
+    def submit(self, name: str, fn: Callable[..., Any], *args, **kwargs) -> Future:
+        future = self._pool.submit(self._timed, name, fn, *args, **kwargs)
+        future.add_done_callback(lambda f, n=name: self._report(n, f))
+        self._tasks[name] = future
+        return future
+
+    def _timed(self, name: str, fn: Callable[..., Any], *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            log.info(f"Entrada '{name}' em {time.perf_counter() - start:.2f}s "
+                     f"(+{time.perf_counter() - self._t0:.2f}s desde o início da carga)")
+
+    @staticmethod
+    def _report(name: str, future: Future):
+        # Registra a falha assim que acontece, mesmo com o login ainda em andamento
+        if not future.cancelled() and future.exception() is not None:
+            log.error(f"Falha ao carregar '{name}': {future.exception()}")
+
+    def done(self, name: str) -> bool:
+        return self._tasks[name].done()
+
+    def check(self):
+        """Levanta InputLoadError se alguma tarefa já terminou com erro (não espera as demais)."""
+        for name, future in self._tasks.items():
+            if future.done() and not future.cancelled() and future.exception() is not None:
+                raise InputLoadError(name, future.exception())
+
+    def peek(self, name: str, default: Any = None) -> Any:
+        """Resultado se a tarefa já terminou com sucesso; senão default (não espera)."""
+        future = self._tasks.get(name)
+        if future is None or not future.done() or future.cancelled() or future.exception() is not None:
+            return default
+        return future.result()
+
+    def result(self, name: str, timeout: Optional[float] = None) -> Any:
+        future = self._tasks[name]
+        if not future.done():
+            start = time.perf_counter()
+            log.info(f"Aguardando entrada '{name}'...")
+            future.exception(timeout=timeout)
+            log.info(f"Entrada '{name}' pronta após {time.perf_counter() - start:.2f}s de espera.")
+        if future.exception() is not None:
+            raise InputLoadError(name, future.exception())
+        return future.result()
+
+    def discard(self, *names: str):
+        """Solta os resultados já consumidos (DataFrames não ficam vivos a execução inteira)."""
+        for name in names:
+            future = self._tasks.pop(name, None)
+            if future is not None:
+                future.cancel()
+
+    def close(self):
+        # Não espera tarefas em andamento (ex.: consulta longa após falha no SAP)
+        for future in self._tasks.values():
+            future.cancel()
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,82 @@
+# launch_feed.py
+# lib/launch_feed.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\launch_feed.py
+"""
+Produtor/consumidor entre a preparação da lista de lançamento e o lançamento no SAP.
+A preparação (leitura de arquivos, casamento com referência, UDs, validação)
+roda numa thread e entrega registros prontos por uma fila limitada; o loop de
+lançamento (thread principal, dona do Playwright) consome à medida que chegam.
+"""
+import queue
+import threading
+from typing import Callable, Iterable, Iterator, Optional
+from .config import settings
+from .logger import get_logger
+
+log = get_logger("feed")
+
+_DONE = object()
+
+
+class LaunchFeed:
+    def __init__(self, producer: Callable[[], Iterable], maxsize: Optional[int] = None):
+        self._producer = producer
+        self._queue: "queue.Queue" = queue.Queue(maxsize=maxsize or settings.PIPELINE_QUEUE_SIZE)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="launch-prep", daemon=True)
+        self.produced = 0
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+    @property
+    def total(self) -> Optional[int]:
+        """Total de registros (conhecido só quando a preparação termina)."""
+        return self.produced if self.done else None
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _put(self, item) -> bool:
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        items = self._producer()
+        try:
+            for item in items:
+                if not self._put(item):
+                    return
+                self.produced += 1
+        except BaseException as e:
+            self.error = e
+            log.error(f"Falha na preparação dos lançamentos: {e}")
+        finally:
+            if hasattr(items, "close"):
+                items.close()
+            self.done = True
+            self._put(_DONE)
+
+    def __iter__(self) -> Iterator:
+        while True:
+            item = self._queue.get()
+            if item is _DONE:
+                if self.error is not None:
+                    raise self.error
+                return
+            yield item
+
+    def close(self):
+        """Interrompe o produtor (ex.: erro no lançamento) e libera a fila."""
+        self._stop.set()
+        try:
+            while True:
+                self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        self._thread.join(timeout=5)
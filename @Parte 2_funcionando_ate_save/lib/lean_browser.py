@@ -0,0 +1,38 @@
+# lean_browser.py
+# lib/lean_browser.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\lean_browser.py
+"""
+Perfil enxuto do navegador na Parte 2; implementação em comum/lean_browser.py.
+Opt-in (LEAN_BROWSER=1; force=True no bench): tipos bloqueados LEAN_BLOCK_TYPES,
+URLs liberadas LEAN_ALLOW, viewport LEAN_VIEWPORT, flags extras LEAN_CHROMIUM_ARGS.
+"""
+from typing import Iterable, Optional
+from comum import lean_browser
+from comum.lean_browser import ResourceBlocker
+from .config import settings
+
+
+def launch_options(force: bool = False) -> dict:
+    """Argumentos extras do chromium.launch (vazio sem LEAN_BROWSER ou force)."""
+    if not (settings.LEAN_BROWSER or force):
+        return {}
+    return lean_browser.launch_options(settings.LEAN_CHROMIUM_ARGS)
+
+
+def context_options(force: bool = False) -> dict:
+    """Argumentos extras do browser.new_context (vazio sem LEAN_BROWSER ou force)."""
+    if not (settings.LEAN_BROWSER or force):
+        return {}
+    return lean_browser.context_options(settings.LEAN_VIEWPORT)
+
+
+def install_lean_page(page, block_types: Optional[Iterable[str]] = None,
+                      allow: Optional[Iterable[str]] = None, force: bool = False) -> Optional[ResourceBlocker]:
+    """CSS sem animação + bloqueio de recursos na página (LEAN_BROWSER=1 ou force)."""
+    if not (settings.LEAN_BROWSER or force):
+        return None
+    if block_types is None:
+        block_types = lean_browser.split_list(settings.LEAN_BLOCK_TYPES)
+    if allow is None:
+        allow = lean_browser.split_list(settings.LEAN_ALLOW)
+    return lean_browser.install_lean_page(page, block_types, allow)
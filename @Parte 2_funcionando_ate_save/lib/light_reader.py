@@ -0,0 +1,133 @@
+# light_reader.py
+# lib/light_reader.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\light_reader.py
+"""
+Leitor leve (somente biblioteca padrão) para planilhas .xlsx pequenas.
+Evita o custo de importar pandas/openpyxl em execuções com poucos registros.
+Lê apenas a primeira aba e devolve as linhas como listas de strings.
+"""
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import List
+
+from .config import settings
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_NS_PKG_REL = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+def is_small_file(path: str) -> bool:
+    """True se o arquivo couber no limite do leitor leve (LIGHT_READER_MAX_MB)."""
+    try:
+        size = Path(path).stat().st_size
+    except OSError:
+        return False
+    return size <= settings.LIGHT_READER_MAX_MB * 1024 * 1024
+
+
+def _col_index(letters: str) -> int:
+    idx = 0
+    for ch in letters:
+        idx = idx * 26 + (ord(ch) - 64)
+    return idx - 1
+
+
+def _text_of(elem) -> str:
+    # <si> pode ter <t> direto ou vários <r><t> (rich text)
+    return "".join(t.text or "" for t in elem.iter(f"{_NS_MAIN}t"))
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> List[str]:
+    try:
+        data = zf.read("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    root = ET.fromstring(data)
+    return [_text_of(si) for si in root.iter(f"{_NS_MAIN}si")]
+
+
+def _first_sheet_path(zf: zipfile.ZipFile) -> str:
+    default = "xl/worksheets/sheet1.xml"
+    try:
+        wb = ET.fromstring(zf.read("xl/workbook.xml"))
+        rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    except KeyError:
+        return default
+    sheet = wb.find(f"{_NS_MAIN}sheets/{_NS_MAIN}sheet")
+    if sheet is None:
+        return default
+    rid = sheet.get(f"{_NS_REL}id")
+    for rel in rels.iter(f"{_NS_PKG_REL}Relationship"):
+        if rel.get("Id") == rid:
+            target = rel.get("Target", "")
+            if target.startswith("/"):
+                return target.lstrip("/")
+            return posixpath.normpath(posixpath.join("xl", target))
+    return default
+
+
+def _cell_value(cell, shared: List[str]) -> str:
+    ctype = cell.get("t")
+    if ctype == "inlineStr":
+        is_elem = cell.find(f"{_NS_MAIN}is")
+        return _text_of(is_elem).strip() if is_elem is not None else ""
+    v = cell.find(f"{_NS_MAIN}v")
+    if v is None or v.text is None:
+        return ""
+    raw = v.text
+    if ctype == "s":
+        try:
+            return shared[int(raw)].strip()
+        except (ValueError, IndexError):
+            return ""
+    if ctype == "b":
+        return "True" if raw == "1" else "False"
+    if ctype in ("str", "e"):
+        return raw.strip()
+    # Numérico: mantém inteiros sem '.0'
+    if raw.endswith(".0"):
+        raw = raw[:-2]
+    return raw
+
+
+def read_xlsx_rows(path: str) -> List[List[str]]:
+    """
+    Retorna todas as linhas da primeira aba (incluindo cabeçalho) como listas de strings.
+    Células vazias viram "" (e não 'nan' como no pandas).
+    """
+    rows: List[List[str]] = []
+    with zipfile.ZipFile(path) as zf:
+        shared = _shared_strings(zf)
+        with zf.open(_first_sheet_path(zf)) as fh:
+            for _, elem in ET.iterparse(fh, events=("end",)):
+                if elem.tag != f"{_NS_MAIN}row":
+                    continue
+                values: List[str] = []
+                for cell in elem.iter(f"{_NS_MAIN}c"):
+                    m = _CELL_REF.match(cell.get("r", ""))
+                    col = _col_index(m.group(1)) if m else len(values)
+                    while len(values) < col:
+                        values.append("")
+                    values.append(_cell_value(cell, shared))
+                rows.append(values)
+                elem.clear()
+    return rows
+
+
+def read_xlsx_dicts(path: str) -> List[dict]:
+    """Como read_xlsx_rows, mas usando a primeira linha como cabeçalho."""
+    rows = read_xlsx_rows(path)
+    if not rows:
+        return []
+    header = [h.strip() for h in rows[0]]
+    out = []
+    for line in rows[1:]:
+        if not any(c.strip() for c in line):
+            continue
+        out.append({h: (line[i] if i < len(line) else "") for i, h in enumerate(header) if h})
+    return out
@@ -0,0 +1,159 @@
+# list_export.py
+# lib/list_export.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\list_export.py
+"""
+Leitura em massa de listas do SAP (estoque por bin, lista de DOCs...) por
+exportação, em vez de ler a tela célula a célula:
+  - abre a transação/relatório por OK-code, preenche a tela de seleção e
+    executa (LIST_EXPORT_EXECUTE_KEY)
+  - OK-code LIST_EXPORT_OK_CODE (%PC: Lista > Gravar > Arquivo local), formato
+    LIST_EXPORT_FORMAT e confirmação; o WebGUI entrega o arquivo como download
+    do navegador, capturado com page.expect_download
+  - arquivo salvo em LIST_EXPORT_DIR e lido por load_comparison_report
+    (mesmos registros normalizados do template de referência)
+A "planilha" do SAP é texto com tabulação mesmo quando vem como .xls: o
+conteúdo é conferido e o arquivo fica .txt nesse caso.
+Falha em qualquer etapa levanta ListExportError; o chamador decide o caminho
+alternativo. Quem chama volta para a transação de trabalho depois.
+
+Uso:
+  records = export_records(page, "LX03", [(("textbox", "Warehouse Number"), "BR2")])
+"""
+import re
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from playwright.sync_api import Page
+from .config import settings
+from .logger import get_logger
+from .exceptions import ListExportError
+from .navigation import goto_transaction
+from .page_actions import fill_role_textbox, safe_press
+from .request_tracker import begin_action, end_action
+from .status_stream import get_status_stream
+from .single_record_entry import load_comparison_report
+from . import selectors
+
+log = get_logger("list_export")
+
+# ((role, nome acessível), valor) de cada campo da tela de seleção
+SelectionField = Tuple[Tuple[str, str], str]
+
+_XLSX_MAGIC = b"PK\x03\x04"
+_XLS_MAGIC = b"\xd0\xcf\x11\xe0"
+
+
+def _visible(locator) -> bool:
+    try:
+        return locator.count() > 0 and locator.first.is_visible()
+    except Exception:
+        return False
+
+
+def run_list(page: Page, tcode: str, fields: Iterable[SelectionField] = ()):
+    """Abre a transação, preenche a seleção e executa até a lista aparecer."""
+    if not goto_transaction(page, tcode):
+        raise ListExportError(f"Transação {tcode} não abriu.", context=tcode)
+    for role_and_name, value in fields:
+        fill_role_textbox(page, role_and_name, value)
+    stream = get_status_stream(page)
+    mark = stream.mark() if stream else 0
+    safe_press(page, settings.LIST_EXPORT_EXECUTE_KEY, f"executar {tcode}")
+    if stream:
+        stream.raise_if_error(mark, context=f"{tcode} seleção")
+
+
+def _send_ok_code(page: Page, code: str):
+    role, name = selectors.TX_INPUT_ROLE
+    tx = page.get_by_role(role, name=name)
+    if not _visible(tx):
+        raise ListExportError("Campo de transação indisponível na lista.", context=code)
+    action = begin_action(page)
+    tx.first.fill(code)
+    tx.first.press("Enter")
+    end_action(page, action, f"OK-code {code}")
+
+
+def _confirm_dialogs(page: Page, downloads: list):
+    """
+    Formato no primeiro diálogo; diálogo de diretório/arquivo (se houver) com o nome
+    sugerido. Um clique por diálogo: o botão segue visível até o round trip voltar,
+    e um segundo clique confirmaria o diálogo seguinte sem querer.
+    """
+    radio = page.get_by_role("radio", name=re.compile(settings.LIST_EXPORT_FORMAT, re.I))
+    try:
+        radio.first.wait_for(state="visible", timeout=settings.DEFAULT_TIMEOUT)
+    except Exception:
+        raise ListExportError("Diálogo de formato não apareceu.", context=settings.LIST_EXPORT_OK_CODE)
+    radio.first.click()
+    safe_press(page, "Enter", "formato da exportação")
+    button = page.get_by_role("button", name=re.compile(selectors.EXPORT_CONFIRM_BUTTON_NAME, re.I))
+    end = time.time() + settings.DEFAULT_TIMEOUT / 1000.0
+    poll_ms = max(10, int(settings.WAIT_POLL_INTERVAL * 1000))
+    clicked = False
+    while not downloads and time.time() < end:
+        visible = _visible(button)
+        if visible and not clicked:
+            action = begin_action(page)
+            button.first.click()
+            end_action(page, action, "confirmar arquivo local")
+        # Botão sumiu: próximo diálogo (se aparecer) ganha o seu clique
+        clicked = visible
+        page.wait_for_timeout(poll_ms)
+
+
+def _content_suffix(path: Path) -> str:
+    with path.open("rb") as f:
+        head = f.read(8)
+    if head.startswith(_XLSX_MAGIC):
+        return ".xlsx"
+    if head.startswith(_XLS_MAGIC):
+        return ".xls"
+    return ".txt"
+
+
+def export_list(page: Page, tcode: str, fields: Iterable[SelectionField] = (),
+                out_dir: Optional[str] = None) -> Path:
+    """Executa a lista e baixa a exportação. Devolve o arquivo salvo."""
+    start = time.perf_counter()
+    run_list(page, tcode, fields)
+    downloads: list = []
+    on_download = downloads.append
+    page.on("download", on_download)
+    try:
+        with page.expect_download(timeout=settings.LIST_EXPORT_TIMEOUT_S * 1000) as info:
+            _send_ok_code(page, settings.LIST_EXPORT_OK_CODE)
+            _confirm_dialogs(page, downloads)
+        download = info.value
+    except ListExportError:
+        raise
+    except Exception as e:
+        raise ListExportError(f"Download não recebido: {e}", context=tcode)
+    finally:
+        page.remove_listener("download", on_download)
+
+    folder = Path(out_dir or settings.LIST_EXPORT_DIR)
+    folder.mkdir(parents=True, exist_ok=True)
+    stem = f"{tcode.lower()}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    path = folder / f"{stem}{Path(download.suggested_filename or '').suffix.lower() or '.txt'}"
+    download.save_as(str(path))
+    failure = download.failure()
+    if failure:
+        raise ListExportError(f"Download falhou: {failure}", context=tcode)
+    suffix = _content_suffix(path)
+    if suffix != path.suffix:
+        path = path.replace(path.with_suffix(suffix))
+    log.info(f"Exportação {tcode}: {path.name} ({path.stat().st_size // 1024} KB) "
+             f"em {time.perf_counter() - start:.1f}s.")
+    return path
+
+
+def export_records(page: Page, tcode: str, fields: Iterable[SelectionField] = (),
+                   out_dir: Optional[str] = None) -> List[Dict[str, str]]:
+    """Lista do SAP em registros normalizados (mesmas chaves do template de referência)."""
+    path = export_list(page, tcode, fields, out_dir)
+    rows = load_comparison_report(str(path))
+    if not rows:
+        raise ListExportError(f"Exportação sem linhas reconhecidas: {path}", context=tcode)
+    return rows
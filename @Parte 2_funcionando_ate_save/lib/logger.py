@@ -3,9 +3,21 @@
 # filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\logger.py
 import logging
 import os
+from collections import deque
 from datetime import datetime
 
 _LOGGER = None
+_RECENT: deque = deque(maxlen=1000)  # últimas linhas formatadas (anexadas às evidências de erro)
+
+class _RecentLinesHandler(logging.Handler):
+    def emit(self, record):
+        try:
+            _RECENT.append(self.format(record))
+        except Exception:
+            pass
+
+def recent_lines(n: int = 200) -> list:
+    return list(_RECENT)[-n:]
 
 def get_logger(name: str = "app"):
     global _LOGGER
@@ -31,5 +43,16 @@ def get_logger(name: str = "app"):
     fh.setFormatter(fmt)
     logger.addHandler(fh)
 
+    rh = _RecentLinesHandler()
+    rh.setFormatter(fmt)
+    logger.addHandler(rh)
+
+    # Módulos compartilhados (comum/) logam em "comum.*": mesmos destinos
+    shared = logging.getLogger("comum")
+    shared.setLevel(logging.INFO)
+    shared.propagate = False
+    for h in (sh, fh, rh):
+        shared.addHandler(h)
+
     _LOGGER = logger
     return logger
\ No newline at end of file
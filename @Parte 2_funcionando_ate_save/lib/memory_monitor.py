@@ -0,0 +1,24 @@
+# memory_monitor.py
+# lib/memory_monitor.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\memory_monitor.py
+"""
+Memória em execuções longas na Parte 2 (amostras e reciclagem do navegador só em
+fronteira de DOC, nada pendente de Save no SAP); implementação em
+comum/memory_monitor.py. Opt-in (MEMORY_MONITOR=1): a cada MEMORY_SAMPLE_EVERY_N
+registros em MEMORY_DIR, reciclagem por RECYCLE_EVERY_N / RECYCLE_BROWSER_RSS_MB /
+RECYCLE_JS_HEAP_MB.
+"""
+from typing import Callable, Optional
+from playwright.sync_api import Page
+from comum import memory_monitor
+from comum.memory_monitor import MemoryGuard
+from .config import settings
+
+
+def open_memory_guard(restart: Optional[Callable[[], Page]] = None, label: str = "parte2") -> Optional[MemoryGuard]:
+    """MEMORY_MONITOR=0 (padrão) desliga amostragem e reciclagem."""
+    if not settings.MEMORY_MONITOR:
+        return None
+    return memory_monitor.open_memory_guard(restart, label, settings.MEMORY_SAMPLE_EVERY_N, settings.MEMORY_DIR,
+                                            settings.MEMORY_TRACEMALLOC, settings.RECYCLE_EVERY_N,
+                                            settings.RECYCLE_BROWSER_RSS_MB, settings.RECYCLE_JS_HEAP_MB)
@@ -0,0 +1,39 @@
+# navigation.py
+# lib/navigation.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\navigation.py
+"""
+Navegação por OK-code da Parte 2 ('/nLI11N', '/n'); implementação em
+comum/navigation.py. Aqui ficam as telas de destino, os tempos (DEFAULT_TIMEOUT,
+WAIT_POLL_INTERVAL) e a barra de status: recusa do SAP ao OK-code levanta
+SAPMessageError, que goto_transaction repassa ao chamador.
+"""
+import re
+from typing import Callable, Dict, Optional
+from playwright.sync_api import Page
+from comum.navigation import Navigator, deep_link_url, mark_landed, visible
+from .config import settings
+from .exceptions import SAPMessageError
+from .status_stream import get_status_stream
+
+# Tela de destino de cada transação (conferência de chegada)
+ARRIVALS: Dict[str, Callable[[Page], bool]] = {
+    "LI11N": lambda page: visible(page.get_by_role("textbox", name=re.compile(r"Number of system inventory", re.I))),
+}
+
+
+def _status_guard(page: Page) -> Optional[Callable[[str], None]]:
+    stream = get_status_stream(page)
+    if not stream:
+        return None
+    seq = stream.mark()
+    return lambda context: stream.raise_if_error(seq, context=context)
+
+
+_NAV = Navigator(ARRIVALS, timeout_ms=settings.DEFAULT_TIMEOUT,
+                 poll_ms=int(settings.WAIT_POLL_INTERVAL * 1000),
+                 status_guard=_status_guard, fatal=(SAPMessageError,))
+
+wait_arrival = _NAV.wait_arrival
+ok_code = _NAV.ok_code
+goto_transaction = _NAV.goto_transaction
+go_home = _NAV.go_home
@@ -2,12 +2,16 @@
 # lib/page_actions.py
 # filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\page_actions.py
 import time
-from typing import Optional, Tuple
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
 from playwright.sync_api import Page
 from .config import settings
 from .logger import get_logger
 from .wait_utils import wait_for_locator_visible, wait_for
+from .exceptions import ActionTimeout
 from . import selectors
+from .status_stream import get_status_stream
+from .request_tracker import get_request_tracker
 
 log = get_logger("actions")
 
@@ -17,6 +21,15 @@ def _post_action_delay(step_desc: str):
     if settings.ACTION_DELAY_MS > 0:
         time.sleep(settings.ACTION_DELAY_MS / 1000.0)
 
+@contextmanager
+def _round_trip(page: Page, desc: str):
+    """Envolve uma ação que vai ao servidor: ao sair, espera o round trip e o DOM aplicado."""
+    tracker = get_request_tracker(page)
+    mark = tracker.mark() if tracker else None
+    yield
+    if tracker is not None:
+        tracker.settle(mark, action_desc=desc)
+
 def _role_locator(page: Page, role: str, name: str):
     return page.get_by_role(role, name=name)
 
@@ -29,7 +42,8 @@ def fill_role_textbox(page: Page, role_and_name: Tuple[str, str], value: str, pr
     locator.click()
     locator.fill(value)
     if press_enter:
-        locator.press("Enter")
+        with _round_trip(page, desc):
+            locator.press("Enter")
     _post_action_delay(desc)
 
 def press_enter_role(page: Page, role_and_name: Tuple[str, str]):
@@ -38,20 +52,23 @@ def press_enter_role(page: Page, role_and_name: Tuple[str, str]):
     log.info(desc)
     locator = _role_locator(page, role, name)
     locator.wait_for(state="visible", timeout=settings.DEFAULT_TIMEOUT)
-    locator.press("Enter")
+    with _round_trip(page, desc):
+        locator.press("Enter")
     _post_action_delay(desc)
 
 def safe_press(page: Page, key: str, desc: str = ""):
     step = f"Press key {key} {desc}".strip()
     log.info(step)
-    page.keyboard.press(key)
+    with _round_trip(page, step):
+        page.keyboard.press(key)
     _post_action_delay(step)
 
 def click_when_visible(page: Page, selector: str, desc: str = ""):
     loc = wait_for_locator_visible(page, selector)
     step = f"Clique em {desc or selector}"
     log.info(step)
-    loc.click()
+    with _round_trip(page, step):
+        loc.click()
     _post_action_delay(step)
 
 def handle_popups_if_any(page: Page):
@@ -62,13 +79,18 @@ def handle_popups_if_any(page: Page):
         buttons = page.locator(selectors.POPUP_OK_BUTTONS)
         if buttons.count() > 0:
             try:
-                buttons.first.click(timeout=2000)
+                with _round_trip(page, "Fechar popup"):
+                    buttons.first.click(timeout=2000)
                 log.info("Popup fechado.")
             except Exception:
                 pass
         _post_action_delay(step)
 
 def read_status_message(page: Page) -> Optional[str]:
+    stream = get_status_stream(page)
+    if stream is not None:
+        latest = stream.latest()
+        return (latest.text or None) if latest else None
     try:
         loc = page.locator(selectors.STATUS_BAR_SELECTOR)
         if loc.count() > 0:
@@ -80,15 +102,115 @@ def read_status_message(page: Page) -> Optional[str]:
 
 def wait_status_clear(page: Page, timeout_ms: Optional[int] = None):
     keywords = ("Processando", "Carregando", "Loading", "Aguarde")
-    def _clear():
-        msg = read_status_message(page)
+    def _is_clear(msg: Optional[str]) -> bool:
         if not msg:
             return True
         lowered = msg.lower()
         return not any(k.lower() in lowered for k in keywords)
+    stream = get_status_stream(page)
+    if stream is not None:
+        if stream.wait_until(lambda m: _is_clear(m.text if m else None),
+                             timeout_ms=timeout_ms, action_desc="Status livre"):
+            return
+        raise ActionTimeout("Timeout aguardando: Status livre", context="Status livre")
+    def _clear():
+        return _is_clear(read_status_message(page))
     wait_for(_clear, timeout_ms=timeout_ms, action_desc="Status livre")
 
 def ensure_post_action_stable(page: Page):
     handle_popups_if_any(page)
+    tracker = get_request_tracker(page)
+    if tracker is not None:
+        tracker.settle(action_desc="Sem round trip pendente")
     wait_status_clear(page)
-    _post_action_delay("Estado estável pós-ação")
\ No newline at end of file
+    _post_action_delay("Estado estável pós-ação")
+
+# Localiza textboxes pelo nome acessível: aria-labelledby, aria-label, <label for>, title, placeholder.
+_FIND_TEXTBOX_JS = """
+  const norm = (t) => (t || '').replace(/\\s+/g, ' ').trim().toLowerCase();
+  const nameOf = (el) => {
+    const ids = (el.getAttribute('aria-labelledby') || '').split(/\\s+/).filter(Boolean);
+    const byIds = ids.map(id => { const n = document.getElementById(id); return n ? n.textContent : ''; }).join(' ');
+    if (norm(byIds)) return norm(byIds);
+    if (norm(el.getAttribute('aria-label'))) return norm(el.getAttribute('aria-label'));
+    if (el.id) {
+      const lbl = document.querySelector(`label[for="${CSS.escape(el.id)}"]`);
+      if (lbl && norm(lbl.textContent)) return norm(lbl.textContent);
+    }
+    return norm(el.getAttribute('title') || el.getAttribute('placeholder'));
+  };
+  const visible = (el) => !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length);
+  const inputs = Array.from(document.querySelectorAll(
+    'input:not([type]), input[type="text"], input[type="search"], input[type="number"], textarea, [role="textbox"]'
+  )).filter(visible).map(el => [el, nameOf(el)]);
+  const find = (label) => {
+    const want = norm(label);
+    let hits = inputs.filter(([, n]) => n === want);
+    if (hits.length === 0) hits = inputs.filter(([, n]) => n.includes(want));
+    return hits.length === 1 ? hits[0][0] : null;
+  };
+  const valueOf = (el) => ('value' in el) ? el.value : el.textContent;
+"""
+
+# Preenche vários textboxes numa única chamada in-page (evaluate)
+_FAST_FILL_JS = """
+(fields) => {
+""" + _FIND_TEXTBOX_JS + """
+  const setter = Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set;
+  const taSetter = Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set;
+  const result = {};
+  for (const [label, value] of fields) {
+    const el = find(label);
+    if (!el || el.disabled || el.readOnly) { result[label] = null; continue; }
+    el.focus();
+    el.dispatchEvent(new Event('focus', { bubbles: true }));
+    if (el instanceof HTMLTextAreaElement) taSetter.call(el, value);
+    else if (el instanceof HTMLInputElement) setter.call(el, value);
+    else el.textContent = value;
+    el.dispatchEvent(new Event('input', { bubbles: true }));
+    el.dispatchEvent(new KeyboardEvent('keyup', { bubbles: true }));
+    el.dispatchEvent(new Event('change', { bubbles: true }));
+    el.dispatchEvent(new Event('blur', { bubbles: true }));
+    result[label] = true;
+  }
+  return result;
+}
+"""
+
+# Lê os valores exibidos (depois do round trip: o que o servidor devolveu na tela)
+_READ_TEXTBOXES_JS = """
+(labels) => {
+""" + _FIND_TEXTBOX_JS + """
+  const result = {};
+  for (const label of labels) {
+    const el = find(label);
+    result[label] = el ? valueOf(el) : null;
+  }
+  return result;
+}
+"""
+
+def fill_textboxes_fast(page: Page, fields: List[Tuple[str, str]]) -> List[str]:
+    """
+    Preenche todos os textboxes (nome acessível, valor) numa única chamada,
+    disparando input/change. Retorna os nomes NÃO localizados (campo ausente,
+    ambíguo ou bloqueado) para o fallback campo a campo. Se o valor chegou ao
+    SAP só dá para saber depois do round trip (read_textboxes).
+    """
+    payload = [[name, value or ""] for name, value in fields]
+    try:
+        result = page.evaluate(_FAST_FILL_JS, payload)
+    except Exception as e:
+        log.debug(f"Preenchimento rápido falhou: {e}")
+        return [name for name, _ in fields]
+    failed = [name for name, _ in payload if not (result or {}).get(name)]
+    log.info(f"Preenchimento rápido: {len(payload) - len(failed)}/{len(payload)} campos preenchidos.")
+    return failed
+
+def read_textboxes(page: Page, names: List[str]) -> Dict[str, Optional[str]]:
+    """Valores exibidos nos textboxes (None = campo não localizado)."""
+    try:
+        return page.evaluate(_READ_TEXTBOXES_JS, list(names)) or {}
+    except Exception as e:
+        log.debug(f"Leitura dos campos falhou: {e}")
+        return {}
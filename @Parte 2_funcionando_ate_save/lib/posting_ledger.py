@@ -0,0 +1,106 @@
+# posting_ledger.py
+# lib/posting_ledger.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\posting_ledger.py
+"""
+Ledger local (SQLite) de lançamentos.
+Cada linha lançada com sucesso é gravada pela impressão digital
+(DOC, material, bin, UD, quantidade); cada DOC salvo também é registrado.
+Ao reexecutar após uma queda, as linhas já lançadas são puladas antes de
+qualquer navegação no SAP.
+"""
+import hashlib
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Optional
+from .config import settings
+from .records import LaunchRecord
+from .logger import get_logger
+
+log = get_logger("ledger")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS posted_lines (
+    fingerprint TEXT PRIMARY KEY,
+    doc TEXT NOT NULL,
+    material TEXT,
+    storage_bin TEXT,
+    ud TEXT,
+    quantity TEXT,
+    posted_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_posted_lines_doc ON posted_lines(doc);
+CREATE TABLE IF NOT EXISTS saved_docs (
+    doc TEXT PRIMARY KEY,
+    saved_at TEXT NOT NULL
+);
+"""
+
+
+def _key_fields(rec: LaunchRecord):
+    return (
+        rec.inventory_record,
+        rec.material_number,
+        rec.storage_bin,
+        (rec.ud or "").strip(),
+        rec.quantity_text,
+    )
+
+
+def fingerprint(rec: LaunchRecord) -> str:
+    raw = "|".join(_key_fields(rec))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class PostingLedger:
+    def __init__(self, path: str):
+        self.path = path
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        # check_same_thread=False: preparação pode rodar em outra thread; acesso serializado pelo lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.executescript(_SCHEMA)
+
+    def is_posted(self, rec: LaunchRecord) -> bool:
+        with self._lock:
+            cur = self._conn.execute("SELECT 1 FROM posted_lines WHERE fingerprint = ?", (fingerprint(rec),))
+            return cur.fetchone() is not None
+
+    def mark_posted(self, rec: LaunchRecord):
+        doc, material, bin_, ud, qty = _key_fields(rec)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO posted_lines VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (fingerprint(rec), doc, material, bin_, ud, qty, datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def is_doc_saved(self, doc: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute("SELECT 1 FROM saved_docs WHERE doc = ?", (str(doc).strip(),))
+            return cur.fetchone() is not None
+
+    def mark_doc_saved(self, doc: str):
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO saved_docs VALUES (?, ?)",
+                (str(doc).strip(), datetime.now().isoformat(timespec="seconds")),
+            )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def open_ledger() -> Optional[PostingLedger]:
+    if not settings.LEDGER_ENABLED:
+        return None
+    try:
+        ledger = PostingLedger(settings.LEDGER_PATH)
+    except Exception as e:
+        log.warning(f"Ledger indisponível ({settings.LEDGER_PATH}): {e}. Seguindo sem retomada.")
+        return None
+    log.info(f"Ledger de lançamentos: {settings.LEDGER_PATH}")
+    return ledger
@@ -0,0 +1,124 @@
+# preflight.py
+# lib/preflight.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\preflight.py
+"""
+Validação prévia das linhas de lançamento contra a referência (Template_RPA)
+antes de qualquer navegação no SAP.
+Os índices (bins por tipo de depósito, materiais por bin) são montados uma vez
+em sets; cada linha custa apenas consultas de hash. A checagem é por linha (não
+por DataFrame): os registros chegam um a um à fila de lançamento e a consulta
+a set já fica na casa dos microssegundos.
+Bin vazio ou ausente da referência só é rejeitado com PREFLIGHT_STRICT_BINS=1
+(antes da pré-validação essas linhas eram lançadas normalmente).
+Linhas rejeitadas vão para um CSV com o motivo.
+"""
+import csv
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from .config import settings
+from .logger import get_logger
+from .records import LaunchRecord, ReferenceRow
+
+log = get_logger("preflight")
+
+_NUMBER = re.compile(r"^-?\d+(\.\d+)?$")
+
+
+def parse_quantity(value) -> Optional[float]:
+    """Como _parse_number, mas devolve None para texto não numérico (em vez de 0.0)."""
+    if value is None:
+        return None
+    s = str(value).strip()
+    if not s or s.lower() in ("nan", "none"):
+        return None
+    if s.count(",") == 1 and s.count(".") >= 1:
+        s = s.replace(".", "")
+    s = s.replace(",", ".")
+    if not _NUMBER.match(s):
+        return None
+    return float(s)
+
+
+def norm_code(value) -> str:
+    """Normaliza códigos vindos do Excel/banco ('00123', '123.0', ' 123 ' -> '123')."""
+    s = str(value or "").strip().upper()
+    if s.endswith(".0") and s[:-2].isdigit():
+        s = s[:-2]
+    if s.isdigit():
+        s = s.lstrip("0") or "0"
+    return s
+
+
+def _is_blank(value) -> bool:
+    s = str(value or "").strip().lower()
+    return s == "" or s == "nan"
+
+
+class Preflight:
+    def __init__(self, reference_records: Iterable[ReferenceRow], strict_bins: Optional[bool] = None):
+        self.strict_bins = settings.PREFLIGHT_STRICT_BINS if strict_bins is None else strict_bins
+        self.bins_by_type: Dict[str, Set[str]] = {}
+        self.materials_by_bin: Dict[str, Set[str]] = {}
+        self.all_bins: Set[str] = set()
+        for ref in reference_records:
+            bin_ = norm_code(ref.storage_bin)
+            if not bin_:
+                continue
+            self.all_bins.add(bin_)
+            stype = norm_code(ref.storage_type)
+            if stype:
+                self.bins_by_type.setdefault(stype, set()).add(bin_)
+            material = norm_code(ref.material_number)
+            if material:
+                self.materials_by_bin.setdefault(bin_, set()).add(material)
+        self.has_reference = bool(self.all_bins)
+
+    def check(self, rec: LaunchRecord) -> Optional[str]:
+        """Retorna o motivo da rejeição ou None se a linha pode ser lançada."""
+        reasons: List[str] = []
+        if _is_blank(rec.inventory_record):
+            reasons.append("DOC ausente")
+        if rec.quantity is None:
+            reasons.append(f"quantidade inválida '{rec.quantity_raw}'")
+        bin_ = norm_code(rec.storage_bin)
+        if not bin_:
+            if self.strict_bins:
+                reasons.append("bin vazio")
+        elif self.has_reference:
+            stype = norm_code(rec.storage_type)
+            known = self.bins_by_type.get(stype) if stype else None
+            if known is not None and bin_ not in known:
+                if self.strict_bins:
+                    reasons.append(f"bin {rec.storage_bin} não existe no tipo {rec.storage_type}")
+            elif known is None and bin_ not in self.all_bins:
+                if self.strict_bins:
+                    reasons.append(f"bin {rec.storage_bin} não existe na referência")
+            else:
+                materials = self.materials_by_bin.get(bin_)
+                if materials is not None and norm_code(rec.material_number) not in materials:
+                    reasons.append(f"material {rec.material_number} não consta no bin {rec.storage_bin}")
+        return "; ".join(reasons) or None
+
+
+_REJECT_COLUMNS = [
+    "inventory_record", "material_number", "storage_bin", "storage_type",
+    "plant", "storage_location", "ud", "quantity_raw",
+]
+
+
+def write_rejects(rejects: List[Tuple[LaunchRecord, str]], prefix: str = "rejeitados") -> Optional[str]:
+    """Grava CSV (;) com as linhas rejeitadas e o motivo. Retorna o caminho."""
+    if not rejects:
+        return None
+    os.makedirs(settings.REJECTS_DIR, exist_ok=True)
+    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(settings.REJECTS_DIR, f"{prefix}_{ts}.csv")
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f, delimiter=";")
+        writer.writerow(_REJECT_COLUMNS[:-1] + ["counted_quantity", "motivo"])
+        for rec, reason in rejects:
+            writer.writerow([getattr(rec, c, "") for c in _REJECT_COLUMNS] + [reason])
+    log.warning(f"{len(rejects)} linhas rejeitadas na pré-validação. Arquivo: {path}")
+    return path
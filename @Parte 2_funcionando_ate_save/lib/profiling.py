@@ -0,0 +1,26 @@
+# profiling.py
+# lib/profiling.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\profiling.py
+"""
+Profiler opcional (cProfile) da Parte 2; implementação em comum/profiling.py.
+PROFILE_MODE:
+  off    - desligado (padrão)
+  run    - perfila a execução inteira de run()
+  record - perfila só 1 a cada PROFILE_EVERY_N registros (_process_single_record)
+Arquivos em PROFILE_DIR (padrão: pasta logs da execução).
+Só a thread principal é perfilada (a thread de preparação não entra).
+"""
+from typing import Optional
+from comum.profiling import MODES, RunProfiler, summarize
+from .config import settings
+
+_PROFILER: Optional[RunProfiler] = None
+
+
+def get_profiler() -> RunProfiler:
+    global _PROFILER
+    if _PROFILER is None:
+        _PROFILER = RunProfiler(
+            settings.PROFILE_MODE, settings.PROFILE_EVERY_N, settings.PROFILE_TOP_N, settings.PROFILE_DIR
+        )
+    return _PROFILER
@@ -0,0 +1,297 @@
+# reconciliation.py
+# lib/reconciliation.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\reconciliation.py
+"""
+Relatório de conciliação contado x contábil, antes do lançamento.
+Mesma regra de UD do lançamento (_adjust_ud_quantities), só que vetorizada
+sobre o conjunto inteiro com group-by do pandas:
+  - falta (contado < contábil): remove começando da UD mais antiga;
+  - sobra (contado > contábil): soma tudo na UD mais nova;
+  - linhas sem UD de uma posição com UD ficam com o estoque contábil.
+Posição = (centro, depósito, bin, material).
+Saída: detalhe por material/bin/UD + resumo por centro e tipo de depósito,
+em .xlsx (duas abas), .csv (;) ou .parquet.
+"""
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from .logger import get_logger
+from .light_reader import is_small_file, read_xlsx_dicts
+
+log = get_logger("reconciliation")
+
+KEY = ["plant", "storage_location", "storage_bin", "material_number"]
+
+# Colunas do banco (fetch_counting_records) -> padrão interno
+_DB_RENAME = {
+    "doc": "inventory_record",
+    "material": "material_number",
+    "center": "plant",
+    "deposit": "storage_location",
+    "bin": "storage_bin",
+    "deposit_type": "storage_type",
+    "quantity": "counted",
+}
+
+# Colunas do Template_RPA -> padrão interno
+_TEMPLATE_COLUMNS = {
+    "DOC": "inventory_record",
+    "Material": "material_number",
+    "Centro": "plant",
+    "Depósito": "storage_location",
+    "Deposito": "storage_location",
+    "Posição no depósito": "storage_bin",
+    "Posição no Deposito": "storage_bin",
+    "Tipo de depósito": "storage_type",
+    "TipoDeposito": "storage_type",
+    "Estoque Total": "book",
+    "EstoqueTotal": "book",
+    "UD": "ud",
+}
+
+_DETAIL_COLUMNS = [
+    "plant", "storage_type", "storage_location", "storage_bin", "material_number",
+    "ud", "inventory_record", "book", "counted_total", "book_key", "delta",
+    "adjusted", "adjustment", "zero_stock", "zeroed", "status",
+]
+
+
+def _code(s):
+    """Códigos como texto ('123.0' do Excel -> '123', NaN -> '')."""
+    s = s.astype("string").fillna("").str.strip()
+    s = s.str.replace(r"^(\d+)\.0$", r"\1", regex=True)
+    return s.mask(s.str.lower() == "nan", "").astype(object)
+
+
+def _number(s):
+    """'1.234,5' / '5,00' / 7 -> float; texto inválido -> NaN."""
+    import pandas as pd
+    if pd.api.types.is_numeric_dtype(s):
+        return s.astype(float)
+    t = s.astype("string").fillna("").str.strip()
+    thousands = t.str.contains(",", regex=False) & t.str.contains(".", regex=False)
+    t = t.mask(thousands, t.str.replace(".", "", regex=False))
+    t = t.str.replace(",", ".", regex=False)
+    return pd.to_numeric(t, errors="coerce").astype(float)
+
+
+def _ensure(df, columns: List[str]):
+    for c in columns:
+        if c not in df.columns:
+            df[c] = ""
+    return df
+
+
+def reference_frame(reference_report_path: str):
+    """Template_RPA como DataFrame no padrão interno (book numérico, ud_number)."""
+    import pandas as pd
+    if is_small_file(reference_report_path):
+        df = pd.DataFrame(read_xlsx_dicts(reference_report_path))
+    else:
+        df = pd.read_excel(reference_report_path, engine="openpyxl")
+    df = df.rename(columns={c: _TEMPLATE_COLUMNS[c] for c in df.columns if c in _TEMPLATE_COLUMNS})
+    df = _ensure(df, KEY + ["inventory_record", "storage_type", "ud", "book"])
+    for c in KEY + ["inventory_record", "storage_type", "ud"]:
+        df[c] = _code(df[c])
+    df["book"] = _number(df["book"]).fillna(0.0)
+    df["ud_number"] = pd.to_numeric(df["ud"], errors="coerce").fillna(0).astype("int64")
+    return df[KEY + ["inventory_record", "storage_type", "ud", "ud_number", "book"]]
+
+
+def counting_frame(records: List[Dict[str, str]]):
+    """
+    Registros de contagem (formato do banco ou do arquivo de contagem) como
+    DataFrame no padrão interno, somados por posição.
+    """
+    import pandas as pd
+    df = pd.DataFrame(records)
+    df = df.rename(columns={c: _DB_RENAME[c] for c in df.columns if c in _DB_RENAME})
+    if "counted" not in df.columns:
+        # Arquivo de contagem: counted_quantity (ou quantity_alt)
+        df = _ensure(df, ["counted_quantity", "quantity_alt"])
+        qty = df["counted_quantity"].astype("string").fillna("").str.strip()
+        df["counted"] = qty.mask(qty == "", df["quantity_alt"])
+    df = _ensure(df, KEY + ["inventory_record", "storage_type"])
+    for c in KEY + ["inventory_record", "storage_type"]:
+        df[c] = _code(df[c])
+    df["counted"] = _number(df["counted"]).fillna(0.0)
+    return (
+        df.groupby(KEY, sort=False, as_index=False)
+        .agg(counted=("counted", "sum"),
+             inventory_record=("inventory_record", "first"),
+             storage_type=("storage_type", "first"))
+    )
+
+
+def _allocate(ud):
+    """Distribuição do delta nas UDs (vetorizada). ud vem ordenado por KEY + ud_number."""
+    import numpy as np
+    g = ud.groupby(KEY, sort=False)["book"]
+    before = g.cumsum() - ud["book"]                       # contábil das UDs mais antigas
+    to_remove = (-ud["delta"]).clip(lower=0)
+    removed = np.minimum((to_remove - before).clip(lower=0), ud["book"])
+    newest = ~ud.duplicated(KEY, keep="last")
+    added = ud["delta"].clip(lower=0).where(newest, 0.0)
+    return ud["book"] - removed + added
+
+
+def reconcile(counting, reference):
+    """
+    Retorna (detalhe, resumo).
+    counting: saída de counting_frame; reference: saída de reference_frame.
+    """
+    import numpy as np
+    import pandas as pd
+    ref = reference.copy()
+    ref["is_ud"] = ref["ud"] != ""
+    ref["has_ud"] = ref.groupby(KEY, sort=False)["is_ud"].transform("any")
+
+    # Posições sem UD viram uma linha só (o lançamento manda o total contado)
+    plain = (
+        ref[~ref["has_ud"]]
+        .groupby(KEY, sort=False, as_index=False)
+        .agg(inventory_record=("inventory_record", "first"),
+             storage_type=("storage_type", "first"),
+             book=("book", "sum"))
+    )
+    plain["ud"] = ""
+    plain["ud_number"] = 0
+    plain["is_ud"] = False
+    plain["has_ud"] = False
+    ref = pd.concat([ref[ref["has_ud"]], plain], ignore_index=True)
+
+    # Contábil comparado com o contado: só UDs quando a posição tem UD
+    ref["book_key"] = (
+        ref["book"].where(ref["is_ud"] | ~ref["has_ud"], 0.0)
+        .groupby([ref[k] for k in KEY], sort=False).transform("sum")
+    )
+
+    detail = ref.merge(
+        counting.rename(columns={
+            "counted": "counted_total",
+            "inventory_record": "doc_counted",
+            "storage_type": "type_counted",
+        }),
+        on=KEY, how="outer", indicator=True,
+    )
+    detail["inventory_record"] = detail["inventory_record"].fillna(detail["doc_counted"])
+    detail["storage_type"] = detail["storage_type"].fillna(detail["type_counted"])
+    detail["ud"] = detail["ud"].fillna("")
+    detail["ud_number"] = detail["ud_number"].fillna(0)
+    detail["is_ud"] = detail["is_ud"].fillna(False).astype(bool)
+    detail["has_ud"] = detail["has_ud"].fillna(False).astype(bool)
+    detail["book"] = detail["book"].fillna(0.0)
+    detail["book_key"] = detail["book_key"].fillna(0.0)
+    detail["delta"] = detail["counted_total"] - detail["book_key"]
+
+    # Ajuste por linha
+    detail["adjusted"] = np.where(detail["has_ud"], detail["book"], detail["counted_total"])
+    detail = detail.sort_values(KEY + ["ud_number"], kind="stable", ignore_index=True)
+    ud_mask = detail["is_ud"] & detail["counted_total"].notna()
+    if ud_mask.any():
+        detail.loc[ud_mask, "adjusted"] = _allocate(detail.loc[ud_mask, KEY + ["book", "delta"]])
+    detail.loc[detail["counted_total"].isna(), "adjusted"] = np.nan
+    detail["adjustment"] = detail["adjusted"] - detail["book"]
+    detail["zero_stock"] = detail["adjusted"] == 0
+    detail["zeroed"] = detail["zero_stock"] & (detail["book"] > 0)
+
+    detail["status"] = np.select(
+        [
+            detail["_merge"] == "right_only",
+            detail["_merge"] == "left_only",
+            detail["delta"] > 0,
+            detail["delta"] < 0,
+        ],
+        ["sem_referencia", "nao_contado", "sobra", "falta"],
+        default="ok",
+    )
+    detail = detail[_DETAIL_COLUMNS]
+    return detail, summarize(detail)
+
+
+def summarize(detail):
+    """Totais por centro e tipo de depósito (+ linha TOTAL)."""
+    import pandas as pd
+    by = ["plant", "storage_type"]
+    positions = detail.drop_duplicates(KEY)
+    per_position = positions.groupby(by, sort=True).agg(
+        positions=("material_number", "size"),
+        materials=("material_number", "nunique"),
+        counted=("counted_total", "sum"),
+        surplus=("delta", lambda d: d.clip(lower=0).sum()),
+        shortage=("delta", lambda d: d.clip(upper=0).sum()),
+        not_counted=("status", lambda s: (s == "nao_contado").sum()),
+        no_reference=("status", lambda s: (s == "sem_referencia").sum()),
+    )
+    per_line = detail.groupby(by, sort=True).agg(
+        lines=("material_number", "size"),
+        book=("book", "sum"),
+        adjusted=("adjusted", "sum"),
+        adjustment=("adjustment", "sum"),
+        zero_stock=("zero_stock", "sum"),
+        zeroed=("zeroed", "sum"),
+    )
+    summary = per_position.join(per_line).reset_index()
+    total = summary.drop(columns=by).sum(numeric_only=True)
+    total["materials"] = detail["material_number"].nunique()
+    total["plant"], total["storage_type"] = "TOTAL", ""
+    summary = pd.concat([summary, total.to_frame().T], ignore_index=True)
+    for c in summary.columns.drop(by):
+        summary[c] = summary[c].astype("int64" if c in _COUNT_COLUMNS else float)
+    return summary[by + [c for c in summary.columns if c not in by]]
+
+
+_COUNT_COLUMNS = ("positions", "materials", "not_counted", "no_reference", "lines", "zero_stock", "zeroed")
+
+
+def write_report(detail, summary, output_path: str) -> List[str]:
+    """Grava conforme a extensão. Retorna os arquivos gerados."""
+    out = Path(output_path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    ext = out.suffix.lower()
+    if ext == ".xlsx":
+        import pandas as pd
+        with pd.ExcelWriter(out, engine="openpyxl") as writer:
+            detail.to_excel(writer, sheet_name="Detalhe", index=False)
+            summary.to_excel(writer, sheet_name="Resumo", index=False)
+        return [str(out)]
+    summary_path = out.with_name(f"{out.stem}_resumo{out.suffix}")
+    if ext == ".csv":
+        for df, p in ((detail, out), (summary, summary_path)):
+            df.to_csv(p, sep=";", decimal=",", index=False, encoding="utf-8-sig")
+    elif ext == ".parquet":
+        detail.to_parquet(out, index=False)
+        summary.to_parquet(summary_path, index=False)
+    else:
+        raise ValueError(f"Formato não suportado: {ext} (use .xlsx, .csv ou .parquet)")
+    return [str(out), str(summary_path)]
+
+
+def run_reconciliation(
+    reference_report_path: str,
+    output_path: str,
+    records: Optional[List[Dict[str, str]]] = None,
+    contagem_path: Optional[str] = None
+) -> Tuple[object, object]:
+    """Monta e grava o relatório. Fonte da contagem: records (banco) ou contagem_path."""
+    t0 = time.perf_counter()
+    if records is None:
+        if not contagem_path:
+            raise ValueError("Forneça 'records' ou 'contagem_path'.")
+        from .single_record_entry import load_single_record_file
+        records = load_single_record_file(contagem_path)
+    counting = counting_frame(records)
+    reference = reference_frame(reference_report_path)
+    t1 = time.perf_counter()
+    detail, summary = reconcile(counting, reference)
+    t2 = time.perf_counter()
+    files = write_report(detail, summary, output_path)
+    t3 = time.perf_counter()
+    log.info(
+        f"Conciliação: {len(counting)} posições contadas | {len(reference)} linhas referência | "
+        f"{len(detail)} linhas no relatório."
+    )
+    log.info(f"Conciliação tempos: leitura={t1 - t0:.2f}s cálculo={t2 - t1:.2f}s gravação={t3 - t2:.2f}s")
+    for f in files:
+        log.info(f"Relatório gravado: {f}")
+    return detail, summary
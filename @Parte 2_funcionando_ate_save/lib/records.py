@@ -0,0 +1,51 @@
+# records.py
+# lib/records.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\records.py
+"""
+Tipos compactos (slots) para linhas de referência e de lançamento.
+Quantidades já chegam convertidas para número (uma vez só) e os códigos
+repetidos (centro, depósito, tipo de depósito) são internados, de modo que
+milhares de linhas compartilham a mesma string.
+"""
+import sys
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+
+def intern_code(value) -> str:
+    s = str(value or "").strip()
+    return sys.intern(s) if s else ""
+
+
+@dataclass(slots=True)
+class ReferenceRow:
+    """Linha do Template_RPA (estoque contábil por bin/UD)."""
+    inventory_record: str
+    material_number: str
+    plant: str
+    storage_location: str
+    storage_bin: str
+    storage_type: str
+    stock_total: float
+    ud: str
+    ud_number: int
+
+
+@dataclass(slots=True)
+class LaunchRecord:
+    """Linha a lançar na Single Record Entry."""
+    inventory_record: str
+    material_number: str
+    storage_bin: str
+    plant: str
+    storage_location: str
+    storage_type: str
+    quantity: Optional[float]        # None => texto não numérico (rejeitado na pré-validação)
+    quantity_text: str               # já formatado para o SAP ('7', '7,5')
+    quantity_raw: str = ""
+    ud: str = ""
+    stock_total: Optional[float] = None
+    doc_save: bool = False           # fluxo DB: Save na última linha do DOC
+
+    def as_dict(self) -> dict:
+        return asdict(self)
@@ -0,0 +1,20 @@
+# request_tracker.py
+# lib/request_tracker.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\request_tracker.py
+"""
+Rastreador de round trips do WebGUI (ITS) da Parte 2; implementação em
+comum/request_tracker.py. Substitui as heurísticas (tamanho do HTML, palavras
+da barra de status, pausas fixas) quando REQUEST_TRACKER=1; tempos em
+SETTLE_START_MS / SETTLE_QUIET_MS / PAGE_IDLE_TIMEOUT_MS.
+"""
+from typing import Optional
+from playwright.sync_api import Page
+from comum.request_tracker import RequestTracker, attach_tracker, begin_action, end_action, get_request_tracker
+from .config import settings
+
+
+def attach_request_tracker(page: Page) -> Optional[RequestTracker]:
+    if not settings.REQUEST_TRACKER:
+        return None
+    return attach_tracker(page, settings.BASE_URL, settings.SETTLE_START_MS, settings.SETTLE_QUIET_MS,
+                          settings.PAGE_IDLE_TIMEOUT, log_done=settings.VERBOSE_STEPS)
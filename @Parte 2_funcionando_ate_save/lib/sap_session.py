@@ -10,6 +10,13 @@ from .page_actions import (
     ensure_post_action_stable,
 )
 from . import selectors
+from .status_stream import attach_status_stream, detach_status_stream
+from .request_tracker import attach_request_tracker
+from .static_cache import install_static_cache
+from .lean_browser import context_options, install_lean_page, launch_options
+from .navigation import deep_link_url, goto_transaction, mark_landed, wait_arrival
+from comum.browser_client import BorrowedSession, is_ready, resolve_endpoint
+from .artifacts import get_artifacts
 import time
 import re  # <-- adicionado
 
@@ -21,29 +28,105 @@ class SAPSession:
         self.browser: Browser | None = None
         self.context: BrowserContext | None = None
         self.page: Page | None = None
+        self.status = None  # StatusBarStream (push da barra de status)
+        self.borrowed: BorrowedSession | None = None  # aba do browser_service.py (SAP_BROWSER_CDP)
+        self.static_cache = None  # StaticCache (STATIC_CACHE=1)
+        self.lean = None  # ResourceBlocker (LEAN_BROWSER=1)
         self._system_message_handled: bool = False  # controle para executar só uma vez
 
     def start(self):
-        log.info("Iniciando browser.")
-        self.browser = self.playwright.chromium.launch(
-            headless=settings.HEADLESS,
-            slow_mo=settings.SLOW_MO
-        )
-        self.context = self.browser.new_context()
-        self.page = self.context.new_page()
+        if settings.BROWSER_CDP:
+            self._borrow()
+        if self.page is None:
+            log.info("Iniciando browser.")
+            self.browser = self.playwright.chromium.launch(
+                headless=settings.HEADLESS,
+                slow_mo=settings.SLOW_MO,
+                **launch_options()
+            )
+            self.context = self.browser.new_context(**context_options())
+            self.page = self.context.new_page()
+        self.static_cache = install_static_cache(self.page)
+        self.lean = install_lean_page(self.page)  # depois do cache: bloqueia antes de consultar o disco
+        self.status = attach_status_stream(self.page)
+        attach_request_tracker(self.page)
         return self
 
-    def goto_base(self):
-        log.info(f"Acessando URL: {settings.BASE_URL}")
-        self.page.goto(settings.BASE_URL, wait_until="load")
+    def _borrow(self):
+        endpoint = resolve_endpoint(settings.BROWSER_CDP)
+        if not endpoint:
+            log.warning("Serviço de navegador não encontrado (SAP_BROWSER_CDP). Iniciando navegador próprio.")
+            return
+        borrowed = BorrowedSession(self.playwright, endpoint, settings.BASE_URL, slow_mo=settings.SLOW_MO)
+        try:
+            self.page = borrowed.acquire()
+            self.borrowed = borrowed
+        except Exception as e:
+            log.warning(f"Falha ao conectar no serviço de navegador ({e}). Iniciando navegador próprio.")
+            borrowed.close()
+            self.page = None
+
+    def goto_base(self, transaction: str | None = None):
+        """transaction + NAV_DEEP_LINK: abre a sessão direto na transação pela URL."""
+        if self.borrowed and is_ready(self.page):
+            log.info("Aba emprestada já autenticada; pulando acesso/login.")
+            return
+        url = settings.BASE_URL
+        if transaction and settings.NAV_DEEP_LINK:
+            url = deep_link_url(settings.BASE_URL, transaction)
+        log.info(f"Acessando URL: {url}")
+        self.page.goto(url, wait_until="load")
         wait_page_idle(self.page)
         self._try_dismiss_initial_system_message()  # nova chamada
+        if url != settings.BASE_URL:
+            if wait_arrival(self.page, transaction):
+                mark_landed(self.page, transaction)
+            else:
+                log.warning(f"Deep link não abriu {transaction}; seguirá pela navegação normal.")
 
     def open_transaction(self, code: str):
         log.info(f"Abrindo transação: {code}")
+        if settings.NAV_OKCODE and goto_transaction(self.page, code):
+            return
         fill_role_textbox(self.page, selectors.TX_INPUT_ROLE, code, press_enter=True)
         ensure_post_action_stable(self.page)
 
+    def recycle(self, transaction: str) -> Page:
+        """
+        Troca navegador/contexto/página (execuções longas, memory_monitor.py):
+        a nova sessão faz login e abre a transação antes de a antiga fechar;
+        se falhar, a antiga volta a valer e a exceção sobe.
+        """
+        old = (self.browser, self.context, self.page, self.static_cache, self.lean)
+        if self.static_cache:
+            self.static_cache.close()  # grava o índice antes da nova sessão ler
+        self.browser = self.context = self.page = None
+        self.static_cache = self.lean = None
+        self._system_message_handled = False
+        try:
+            self.start()
+            self.goto_base(transaction)
+            self.open_transaction(transaction)
+        except Exception:
+            self._close_browser(self.context, self.browser)
+            self.browser, self.context, self.page, self.static_cache, self.lean = old
+            raise
+        browser, context, _, _, lean = old
+        if lean:
+            lean.close()
+        self._close_browser(context, browser)
+        return self.page
+
+    @staticmethod
+    def _close_browser(context: BrowserContext | None, browser: Browser | None):
+        for closeable in (context, browser):
+            if closeable is None:
+                continue
+            try:
+                closeable.close()
+            except Exception as e:
+                log.debug(f"Erro ao fechar navegador antigo: {e}")
+
     def set_inventory_number(self, number: str):
         fill_role_textbox(self.page, ("textbox", "Warehouse Number / Warehouse"), "BR2", press_enter=False)
         log.info("Warehouse Number / Warehouse preenchido com 'BR2'.")
@@ -53,7 +136,15 @@ class SAPSession:
 
     def close(self):
         log.info("Encerrando sessão.")
+        get_artifacts().flush()
+        if self.static_cache:
+            self.static_cache.close()
+        if self.lean:
+            self.lean.close()
         try:
+            if self.borrowed:
+                detach_status_stream(self.page)
+                self.borrowed.close()
             if self.context:
                 self.context.close()
             if self.browser:
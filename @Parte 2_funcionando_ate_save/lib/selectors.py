@@ -7,4 +7,7 @@ INVENTORY_NUMBER_ROLE = ("textbox", "Number of system inventory")
 STATUS_BAR_SELECTOR = "div[id*='statusbar'], span[id*='status']"
 POPUP_DIALOG_SELECTOR = "div[role='dialog'], div[aria-modal='true']"
 POPUP_OK_BUTTONS = "button:has-text('OK'), button:has-text('Ok'), button:has-text('Continuar')"
-ERROR_MESSAGE_SELECTOR = "span[class*='sapMMsgStripError'], .msg-error"
\ No newline at end of file
+ERROR_MESSAGE_SELECTOR = "span[class*='sapMMsgStripError'], .msg-error"
+
+# Exportação de lista (%PC): botão final do diálogo de arquivo local
+EXPORT_CONFIRM_BUTTON_NAME = r"^(Generate|Gerar|Replace|Substituir|Transfer|Transferir)$"
\ No newline at end of file
@@ -5,13 +5,26 @@ import re
 import time
 import unicodedata
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Iterator, List, Dict, Optional, Tuple
 from playwright.sync_api import Page
 from .logger import get_logger
-from .exceptions import ElementNotFound
+from .exceptions import ElementNotFound, FieldNotConfirmed, SAPMessageError
 from .config import settings
 from .wait_utils import wait_for  # reutiliza função genérica
-from .page_actions import fill_role_textbox  # se ainda não importado
+from .page_actions import fill_role_textbox, fill_textboxes_fast, read_textboxes
+from .light_reader import is_small_file, read_xlsx_rows, read_xlsx_dicts
+from .status_stream import get_status_stream
+from .request_tracker import begin_action, end_action
+from .navigation import goto_transaction
+from .posting_ledger import PostingLedger, open_ledger
+from .preflight import Preflight, norm_code, parse_quantity, write_rejects
+from .launch_feed import LaunchFeed
+from .input_loader import InputLoader
+from .work_queue import Heartbeat, WorkQueue, group_by_doc
+from .memory_monitor import MemoryGuard
+from .doc_contents import ALREADY_COUNTED, DocCheck, DocContentsCache, open_doc_contents
+from .profiling import get_profiler
+from .records import LaunchRecord, ReferenceRow, intern_code
 
 log = get_logger("single_record")
 
@@ -45,6 +58,15 @@ SRE_HEADER_ALIASES.update({
     "documento inventário": "inventory_record",
 })
 
+# Cabeçalhos das listas exportadas do SAP em inglês (lib/list_export.py)
+SRE_HEADER_ALIASES.update({
+    "storage type": "storage_type",
+    "total stock": "stock_total",
+    "storage unit": "ud",
+    "inventory document": "inventory_record",
+    "inventory record": "inventory_record",
+})
+
 def _norm(s: str) -> str:
     return "".join(c for c in unicodedata.normalize("NFD", s) if unicodedata.category(c) != "Mn").lower().strip()
 
@@ -68,6 +90,39 @@ def _parse_number(num_str: str) -> float:
     except Exception:
         return 0.0
 
+def _header_map(raw_header: List[str]) -> Dict[int, str]:
+    header_map: Dict[int, str] = {}
+    for idx, col in enumerate(raw_header):
+        key_norm = _norm(str(col))
+        if key_norm in SRE_HEADER_ALIASES:
+            header_map[idx] = SRE_HEADER_ALIASES[key_norm]
+        elif key_norm in EXPECTED_HEADERS:
+            header_map[idx] = EXPECTED_HEADERS[key_norm]
+    return header_map
+
+def _cell_text(v) -> str:
+    """
+    Valor de célula como texto, igual nos dois leitores de planilha: vazio/NaN = '',
+    número inteiro sem '.0' (pandas devolve 4711.0 onde o leitor leve dá '4711').
+    """
+    if v is None:
+        return ""
+    if isinstance(v, float):
+        if v != v:
+            return ""
+        if v.is_integer():
+            return str(int(v))
+    s = str(v).strip()
+    return "" if s.lower() == "nan" else s
+
+def _map_lines(header_map: Dict[int, str], lines) -> List[Dict[str, str]]:
+    rows: List[Dict[str, str]] = []
+    for line in lines:
+        if not any(cell.strip() for cell in line):
+            continue
+        rows.append({v: (line[i].strip() if i < len(line) else "") for i, v in header_map.items()})
+    return rows
+
 def load_single_record_csv(csv_path: str, delimiter: str = ";") -> List[Dict[str, str]]:
     path = Path(csv_path)
     if not path.is_file():
@@ -75,23 +130,14 @@ def load_single_record_csv(csv_path: str, delimiter: str = ";") -> List[Dict[str
     rows: List[Dict[str, str]] = []
     with path.open("r", encoding="utf-8-sig") as f:
         reader = csv.reader(f, delimiter=delimiter)
-        header_map: Dict[int, str] = {}
         try:
             raw_header = next(reader)
         except StopIteration:
             return rows
-        for idx, col in enumerate(raw_header):
-            key_norm = _norm(col)
-            if key_norm in SRE_HEADER_ALIASES:
-                header_map[idx] = SRE_HEADER_ALIASES[key_norm]
-            elif key_norm in EXPECTED_HEADERS:
-                header_map[idx] = EXPECTED_HEADERS[key_norm]
+        header_map = _header_map(raw_header)
         if not header_map:
             log.warning("Cabeçalho não reconhecido no CSV principal.")
-        for line in reader:
-            if not any(cell.strip() for cell in line):
-                continue
-            rows.append({v: (line[i].strip() if i < len(line) else "") for i, v in header_map.items()})
+        rows = _map_lines(header_map, reader)
     log.info(f"Carregado CSV '{csv_path}' com {len(rows)} registros.")
     return rows
 
@@ -138,7 +184,7 @@ def load_single_record_excel(excel_path: str) -> List[Dict[str, str]]:
             "ud": ""
         }
         for orig, std_key in col_map.items():
-            std[std_key] = str(r.get(orig, "")).strip()
+            std[std_key] = _cell_text(r.get(orig))
         std["storage_bin"] = _fix_storage_bin(std["storage_bin"])
         # Se counted_quantity presente, replica para quantity_alt para envio ao SAP
         if std.get("counted_quantity"):
@@ -149,6 +195,26 @@ def load_single_record_excel(excel_path: str) -> List[Dict[str, str]]:
     log.info(f"Carregado Excel '{excel_path}' com {len(rows)} registros.")
     return rows
 
+def load_single_record_xlsx(xlsx_path: str) -> List[Dict[str, str]]:
+    """
+    Leitura .xlsx sem pandas (leitor leve). Mesmo pós-processamento do .xlsb.
+    """
+    if not Path(xlsx_path).is_file():
+        raise FileNotFoundError(f"Arquivo Excel não encontrado: {xlsx_path}")
+    table = read_xlsx_rows(xlsx_path)
+    if not table:
+        return []
+    header_map = _header_map(table[0])
+    if "inventory_record" not in header_map.values():
+        raise ValueError("Coluna 'Documento inventário' obrigatória não encontrada no Excel.")
+    rows = _map_lines(header_map, table[1:])
+    for std in rows:
+        std["storage_bin"] = _fix_storage_bin(std.get("storage_bin", ""))
+        if std.get("counted_quantity"):
+            std["quantity_alt"] = std["counted_quantity"]
+    log.info(f"Carregado Excel (leitor leve) '{xlsx_path}' com {len(rows)} registros.")
+    return rows
+
 def _single_record_button_locator(page: Page):
     time.sleep(1)
     return page.locator("div").filter(has_text=re.compile(r"^Single Record Entry$"))
@@ -157,14 +223,75 @@ def load_single_record_file(path: str) -> List[Dict[str, str]]:
     ext = Path(path).suffix.lower()
     if ext == ".xlsb":
         return load_single_record_excel(path)
+    if ext == ".xlsx":
+        return load_single_record_xlsx(path)
     if ext == ".csv":
         return load_single_record_csv(path)
-    raise ValueError(f"Extensão não suportada: {ext} (use .xlsb ou .csv)")
+    raise ValueError(f"Extensão não suportada: {ext} (use .xlsb, .xlsx ou .csv)")
 
 # Substituir antiga load_marcelo_report por função genérica:
+def _read_text_lines(path: Path) -> List[str]:
+    """Arquivo local do SAP: UTF-16 (BOM), UTF-8 ou, sem ser UTF-8, cp1252."""
+    data = path.read_bytes()
+    if data[:2] in (b"\xff\xfe", b"\xfe\xff"):
+        text = data.decode("utf-16")
+    else:
+        try:
+            text = data.decode("utf-8-sig")
+        except UnicodeDecodeError:
+            text = data.decode("cp1252", errors="replace")
+    return text.splitlines()
+
+def _split_list_line(line: str) -> List[str]:
+    if "\t" in line:
+        return line.split("\t")
+    # Lista 'não convertida': colunas entre '|'
+    return line.strip().strip("|").split("|")
+
+def _list_number(text: str, decimal: Optional[str] = None) -> str:
+    """
+    Quantidade no formato do usuário SAP em texto com ponto decimal. O separador
+    decimal vem de LIST_EXPORT_DECIMAL (perfil do usuário), não do texto:
+    com ',' '1.234,000' -> '1234' e '1.234' -> '1234'; com '.' '1,234.5' -> '1234.5'.
+    Sinal à direita ('5,000-') vira '-5'; o que não for número fica como está.
+    """
+    decimal = (decimal or settings.LIST_EXPORT_DECIMAL).strip() or ","
+    thousands = "," if decimal == "." else "."
+    s = text.strip().replace(" ", "").replace("\xa0", "")
+    sign = ""
+    if s.endswith("-"):
+        sign, s = "-", s[:-1]
+    s = s.replace(thousands, "").replace(decimal, ".")
+    try:
+        value = float(sign + s)
+    except ValueError:
+        return text
+    return f"{value:f}".rstrip("0").rstrip(".")
+
+def load_list_text(path_str: str) -> List[Dict[str, str]]:
+    """
+    Lista exportada do SAP como texto (planilha = tabulação, não convertido = '|').
+    Título/data antes da tabela e linhas de traços são ignorados: o cabeçalho é a
+    primeira linha com pelo menos duas colunas conhecidas; o cabeçalho repetido
+    a cada página da lista também. stock_total sai com ponto decimal.
+    """
+    lines = [ln for ln in _read_text_lines(Path(path_str))
+             if ln.strip() and not re.fullmatch(r"[\s\-|]+", ln)]
+    for i, line in enumerate(lines):
+        header_map = _header_map(_split_list_line(line))
+        if len(header_map) >= 2:
+            cells = (_split_list_line(ln) for ln in lines[i + 1:])
+            rows = _map_lines(header_map, (c for c in cells if _header_map(c) != header_map))
+            for row in rows:
+                if row.get("stock_total"):
+                    row["stock_total"] = _list_number(row["stock_total"])
+            return rows
+    log.warning(f"Cabeçalho não reconhecido na lista '{path_str}'.")
+    return []
+
 def load_comparison_report(path_str: str) -> List[Dict[str, str]]:
     """
-    Lê relatório de comparação (Excel .xlsx/.xls ou .csv).
+    Lê relatório de comparação (Excel .xlsx/.xls, .csv ou lista do SAP em texto .txt/.tsv).
     Campos relevantes: material_number, storageBin, stock_total, (plant, storage_location se existirem).
     """
     if not path_str:
@@ -180,6 +307,24 @@ def load_comparison_report(path_str: str) -> List[Dict[str, str]]:
 
     ext = path.suffix.lower()
     rows: List[Dict[str, str]] = []
+    if ext in (".txt", ".tsv"):
+        try:
+            rows = load_list_text(path_str)
+        except PermissionError:
+            log.warning(f"Permissão negada ao ler '{path_str}'. Ignorando comparação.")
+            return []
+        log.info(f"Carregado relatório referência texto '{path_str}' com {len(rows)} registros.")
+        return rows
+    if ext == ".xlsx" and is_small_file(path_str):
+        try:
+            table = read_xlsx_rows(path_str)
+        except PermissionError:
+            log.warning(f"Permissão negada ao ler '{path_str}'. Ignorando comparação.")
+            return []
+        if table:
+            rows = _map_lines(_header_map(table[0]), table[1:])
+        log.info(f"Carregado relatório referência Excel (leitor leve) '{path_str}' com {len(rows)} registros.")
+        return rows
     if ext in [".xlsx", ".xls"]:
         try:
             import pandas as pd
@@ -202,7 +347,7 @@ def load_comparison_report(path_str: str) -> List[Dict[str, str]]:
         for _, r in df.iterrows():
             entry = {}
             for orig, std_key in col_map.items():
-                entry[std_key] = str(r.get(orig, "")).strip()
+                entry[std_key] = _cell_text(r.get(orig))
             if any(entry.values()):
                 rows.append(entry)
         log.info(f"Carregado relatório referência Excel '{path_str}' com {len(rows)} registros.")
@@ -217,17 +362,7 @@ def load_comparison_report(path_str: str) -> List[Dict[str, str]]:
                 raw_header = next(reader)
             except StopIteration:
                 return rows
-            header_map: Dict[int, str] = {}
-            for idx, col in enumerate(raw_header):
-                n = _norm(col)
-                if n in SRE_HEADER_ALIASES:
-                    header_map[idx] = SRE_HEADER_ALIASES[n]
-                elif n in EXPECTED_HEADERS:
-                    header_map[idx] = EXPECTED_HEADERS[n]
-            for line in reader:
-                if not any(cell.strip() for cell in line):
-                    continue
-                rows.append({v: (line[i].strip() if i < len(line) else "") for i, v in header_map.items()})
+            rows = _map_lines(_header_map(raw_header), reader)
     except PermissionError:
         log.warning(f"Permissão negada ao ler '{path_str}'. Ignorando comparação.")
         return []
@@ -247,6 +382,60 @@ def _fill_field(page: Page, role_name: str, value: str):
     tb.click()
     tb.fill(value)
 
+QTY_FIELD = "Counted quantity in alternative unit of measure"
+
+def _fill_form(page: Page, fields: List[Tuple[str, str]], tag: str = "") -> List[Tuple[str, str]]:
+    """
+    Preenche a tela SRE. Tenta o caminho rápido (um evaluate); campos não
+    localizados caem no caminho antigo (_fill_field) um a um.
+    Retorna os campos preenchidos pelo caminho rápido (conferidos após o round trip).
+    """
+    pending = fields
+    fast: List[Tuple[str, str]] = []
+    if settings.FAST_FORM_FILL:
+        failed = fill_textboxes_fast(page, fields)
+        fast = [(name, value) for name, value in fields if name not in failed]
+        if not failed:
+            return fast
+        log.warning(f"{tag} Preenchimento rápido não localizou {failed}. Usando campo a campo.")
+        pending = [(name, value) for name, value in fields if name in failed]
+    for name, value in pending:
+        _fill_field(page, name, value)
+        _pause()
+    return fast
+
+def _same_value(name: str, wanted: str, shown: Optional[str]) -> bool:
+    if shown is None:
+        return False
+    if name == QTY_FIELD:
+        return parse_quantity(shown) == parse_quantity(wanted)
+    return norm_code(shown) == norm_code(wanted)  # SAP devolve em maiúsculas / sem zeros à esquerda
+
+def _lost_fields(page: Page, fields: List[Tuple[str, str]]) -> List[Tuple[str, str]]:
+    shown = read_textboxes(page, [name for name, _ in fields])
+    return [(name, value) for name, value in fields if not _same_value(name, value, shown.get(name))]
+
+def _confirm_fast_fill(page: Page, fields: List[Tuple[str, str]], qty_field, tag: str):
+    """
+    Depois do primeiro Enter (round trip), confere na tela devolvida pelo SAP os
+    campos do caminho rápido. Valor perdido é redigitado campo a campo e
+    confirmado com novo Enter; se ainda assim não aparecer, o registro é abortado.
+    """
+    lost = _lost_fields(page, fields)
+    if not lost:
+        return
+    log.warning(f"{tag} SAP não recebeu {[name for name, _ in lost]}; redigitando campo a campo.")
+    for name, value in lost:
+        _fill_field(page, name, value)
+        _pause()
+    action = begin_action(page)
+    qty_field.first.press("Enter")
+    if not end_action(page, action, f"{tag} Enter após redigitar"):
+        _pause()
+    lost = _lost_fields(page, lost)
+    if lost:
+        raise FieldNotConfirmed(context=f"{tag} campos {[name for name, _ in lost]}")
+
 def _click_cancel_once(page: Page):
     """
     Clica em 'Cancel' se visível (não trata confirmação).
@@ -412,14 +601,14 @@ def _parse_ud_number(ud_str: str) -> int:
     except Exception:
         return 0
 
-def _adjust_ud_quantities(counted_total: float, ud_rows: List[Dict[str, str]]) -> List[float]:
+def _adjust_ud_quantities(counted_total: float, ud_rows: List[ReferenceRow]) -> List[float]:
     """
     Recebe linhas UD (cada com stock_total) e aplica delta conforme regras.
     Retorna lista final de quantidades para cada UD na ordem crescente de UD.
     """
     # Ordena crescente (antigas primeiro)
-    ordered = sorted(ud_rows, key=lambda r: _parse_ud_number(r.get("ud", "")))
-    original = [_parse_number(r.get("stock_total", "")) for r in ordered]
+    ordered = sorted(ud_rows, key=lambda r: r.ud_number)
+    original = [r.stock_total for r in ordered]
     soma_ud = sum(original)
     delta = counted_total - soma_ud
     if delta == 0:
@@ -470,250 +659,526 @@ def _save_and_confirm(page: Page, timeout_yes_s: float = 4.0) -> bool:
         log.warning(f"Falha ao clicar Save: {e}")
     return False
 
+# Renomeia conforme mapa usado em Parte2
+_TEMPLATE_RENAME = {
+    'Depósito': 'Deposito',
+    'Posição no depósito': 'Posição no Deposito',
+    'Tipo de depósito': 'TipoDeposito',
+    'Estoque Total': 'EstoqueTotal'
+}
+
+def _template_rows(reference_report_path: str):
+    """
+    Linhas do Template_RPA como dicts {coluna: valor}.
+    Arquivos pequenos usam o leitor leve; grandes usam pandas (import sob demanda).
+    """
+    if is_small_file(reference_report_path):
+        for row in read_xlsx_dicts(reference_report_path):
+            yield {_TEMPLATE_RENAME.get(k, k): v for k, v in row.items()}
+        return
+    import pandas as pd
+    df_temp = pd.read_excel(reference_report_path, engine="openpyxl")
+    df_temp = df_temp.rename(columns={c: _TEMPLATE_RENAME[c] for c in df_temp.columns if c in _TEMPLATE_RENAME})
+    for _, row in df_temp.iterrows():
+        yield row
+
+def _cell(row, col: str) -> str:
+    return _cell_text(row.get(col))
+
+def load_reference_template(reference_report_path: Optional[str]) -> List[ReferenceRow]:
+    reference_records: List[ReferenceRow] = []
+    if not reference_report_path:
+        log.warning("Sem caminho de template referência.")
+        return reference_records
+    if not Path(reference_report_path).is_file():
+        log.warning(f"Template referência não encontrado: {reference_report_path}")
+        return reference_records
+    try:
+        for row in _template_rows(reference_report_path):
+            ud = _cell(row, "UD")
+            reference_records.append(ReferenceRow(
+                inventory_record=intern_code(_cell(row, "DOC")),
+                material_number=_cell(row, "Material"),
+                plant=intern_code(_cell(row, "Centro")),
+                storage_location=intern_code(_cell(row, "Deposito")),
+                storage_bin=_cell(row, "Posição no Deposito"),
+                storage_type=intern_code(_cell(row, "TipoDeposito")),
+                stock_total=_parse_number(_cell(row, "EstoqueTotal")),
+                ud=ud,
+                ud_number=_parse_ud_number(ud) if ud else 0,
+            ))
+        log.info(f"Template referência carregado: {len(reference_records)} linhas.")
+    except Exception as e:
+        log.warning(f"Falha ao ler template referência: {e}. Prosseguindo sem referência.")
+    return reference_records
+
 def process_single_record_entries(
     page: Page,
     contagem_path: Optional[str] = None,
     reference_report_path: Optional[str] = None,
-    records: Optional[List[Dict[str, str]]] = None
-):
+    records: Optional[List[Dict[str, str]]] = None,
+    reference_records: Optional[List[ReferenceRow]] = None,
+    guard: Optional[MemoryGuard] = None,
+    doc_check: Optional[DocCheck] = None
+) -> int:
     """
     Registra apenas se Material, Centro (plant) e Depósito (storage_location) estiverem preenchidos.
+    Retorna a quantidade de registros efetivamente lançados.
+    Linhas já registradas no ledger (execução anterior) são puladas.
+    A preparação roda em thread própria (LaunchFeed): o lançamento começa assim
+    que o primeiro registro fica pronto, sem esperar a lista inteira.
+    reference_records: template já carregado (carga em paralelo com o login); None = lê reference_report_path.
+    guard: amostra memória e recicla o navegador nas fronteiras de DOC.
+    doc_check: conteúdo dos DOCs lido do SAP (pula itens já contados, rejeita bin/material fora do DOC).
     """
     # REMOVIDO: definição interna de _is_invalid_field
-
-    if records is not None:
-        filtered = []
-        skipped = 0
-        for r in records:
-            doc = r.get("doc")
-            material = r.get("material")
-            plant = r.get("center")
-            deposit = r.get("deposit")
-            if any([
-                _is_invalid_field(doc),
-                _is_invalid_field(material),
-                _is_invalid_field(plant),
-                _is_invalid_field(deposit)
-            ]):
-                skipped += 1
+    ledger = open_ledger()
+    doc_cache = open_doc_contents()
+    feed = LaunchFeed(lambda: _prepare_launch_records(contagem_path, reference_report_path, records, ledger,
+                                                      reference_records, doc_check))
+    try:
+        feed.start()
+        return _post_launch_records(page, feed, ledger, guard, doc_cache)
+    finally:
+        feed.close()
+        if ledger:
+            ledger.close()
+        if doc_cache:
+            doc_cache.close()
+
+def _post_launch_records(page: Page, feed: LaunchFeed, ledger: Optional[PostingLedger],
+                        guard: Optional[MemoryGuard] = None,
+                        doc_cache: Optional[DocContentsCache] = None) -> int:
+    """
+    Consome os registros prontos. Registros com doc_save (fluxo DB) esperam o
+    próximo para saber se são o último do DOC (Save em vez de Cancel).
+    doc_cache: DOC salvo sai do cache de conteúdo (DOC_CONTENTS=1).
+    Retorna quantos foram lançados (recusas do SAP não contam).
+    """
+    posted = 0
+    done = 0
+    pending: Optional[LaunchRecord] = None
+    profiler = get_profiler()
+
+    def _post(rec: LaunchRecord, is_last_in_doc: bool):
+        nonlocal posted, done, page
+        posted += 1
+        with profiler.sample(posted, "registro"):
+            if _process_single_record(page, rec, posted, feed.total, is_last_in_doc=is_last_in_doc, ledger=ledger,
+                                      doc_cache=doc_cache):
+                done += 1
+        # Fronteira de DOC: nada pendente de Save, a sessão pode ser trocada
+        if guard and (is_last_in_doc or not rec.doc_save):
+            page = guard.checkpoint(page, posted)
+
+    for rec in feed:
+        if pending is not None:
+            _post(pending, pending.inventory_record != rec.inventory_record)
+            pending = None
+        if rec.doc_save:
+            pending = rec
+        else:
+            _post(rec, False)
+    if pending is not None:
+        _post(pending, True)
+    log.info(f"Lançamentos concluídos: {done} de {posted} registros lançados.")
+    return done
+
+def prepare_launch_plan(
+    records: List[Dict[str, str]],
+    reference_report_path: Optional[str] = None,
+    reference_records: Optional[List[ReferenceRow]] = None,
+    doc_check: Optional[DocCheck] = None
+) -> List[Tuple[str, List[LaunchRecord]]]:
+    """
+    Plano de lançamento do fluxo DB (--compile-queue): mesma preparação de
+    process_single_record_entries, sem navegador, agrupada por DOC.
+    """
+    ledger = open_ledger()
+    try:
+        prepared = list(_prepare_launch_records(None, reference_report_path, records, ledger, reference_records,
+                                                doc_check))
+    finally:
+        if ledger:
+            ledger.close()
+    plan = group_by_doc(prepared)
+    log.info(f"Plano de lançamento: {len(prepared)} linhas em {len(plan)} DOCs.")
+    return plan
+
+def process_queued_docs(page: Page, queue: WorkQueue, owner: str,
+                        guard: Optional[MemoryGuard] = None) -> Dict[str, int]:
+    """
+    Runner: pega DOCs da fila (lease) até esvaziar, com heartbeat durante o
+    lançamento. DOC com linha recusada vai para 'failed'; lease perdido no meio
+    do DOC interrompe o DOC (outro runner já o retomou). Sem DOC livre mas com
+    leases de outros runners ativos: espera, para retomar os que vencerem.
+    """
+    ledger = open_ledger()
+    doc_cache = open_doc_contents()
+    profiler = get_profiler()
+    counts = {"docs": 0, "falhos": 0, "linhas": 0}
+    try:
+        while True:
+            item = queue.lease(owner)
+            if item is None:
+                if queue.stats()["leased"] == 0:
+                    break
+                log.info("Fila sem DOC livre; aguardando leases de outros runners.")
+                time.sleep(settings.QUEUE_HEARTBEAT_S)
                 continue
-            filtered.append(r)
-        log.info(f"Registros recebidos (DB): {len(records)} | Válidos p/ lançamento: {len(filtered)} | Pulados (campos vazios/nan): {skipped}")
-        total = len(filtered)
-        # Ordena por DOC preservando ordem original para detectar último de cada DOC
-        # Cria lista de mapeados com flag last
-        mapped_seq: List[Dict[str, str]] = []
-        for idx, r in enumerate(filtered):
-            mapped_seq.append({
-                "inventory_record": str(r.get("doc")).strip(),
-                "material_number": str(r.get("material")).strip(),
-                "storage_bin": str(r.get("bin") or "").strip(),
-                "plant": str(r.get("center")).strip(),
-                "storage_location": str(r.get("deposit")).strip(),
-                "storage_type": str(r.get("deposit_type") or "").strip(),
-                "counted_quantity": _format_quantity(_parse_number(r.get("quantity"))),
-                "quantity_alt": _format_quantity(_parse_number(r.get("quantity"))),
-                "ud": "",
-                "stock_total": "",
-                "__doc__": str(r.get("doc")).strip()
-            })
-        # Marca último por DOC olhando próximo diferente
-        for i in range(len(mapped_seq)):
-            cur_doc = mapped_seq[i]["__doc__"]
-            next_doc = mapped_seq[i+1]["__doc__"] if i+1 < len(mapped_seq) else None
-            mapped_seq[i]["__last_in_doc__"] = (cur_doc != next_doc)
-
-        for idx, rec in enumerate(mapped_seq, start=1):
-            _process_single_record(page, rec, idx, total, is_last_in_doc=rec["__last_in_doc__"])
-        log.info("Lançamentos (DB) concluídos com lógica Save por DOC.")
-        return
-    # Preparar registros de contagem
-    if records is not None:
-        contagem_records: List[Dict[str, str]] = []
-        for r in records:
-            contagem_records.append({
-                "inventory_record": str(r.get("doc") or "").strip(),
-                "material_number": str(r.get("material") or "").strip(),
-                "storage_bin": str(r.get("bin") or "").strip(),
-                "plant": str(r.get("center") or "").strip(),
-                "storage_location": str(r.get("deposit") or "").strip(),
-                "storage_type": str(r.get("deposit_type") or "").strip(),
-                "counted_quantity": str(r.get("quantity") or "0"),  # total contado
-                "quantity_alt": str(r.get("quantity") or "0"),
-                "ud": "",
-                "stock_total": ""  # não vem do DB
-            })
-        log.info(f"Contagem (DB) carregada: {len(contagem_records)} registros.")
+            doc, lines = item.doc, item.lines
+            if ledger and ledger.is_doc_saved(doc):
+                log.info(f"DOC {doc} já salvo (ledger); marcado como concluído.")
+                queue.complete(doc, owner)
+                continue
+            log.info(f"DOC {doc}: {len(lines)} linhas (tentativa {item.attempts}).")
+            # DOC sem Save registrado: todas as linhas de novo (linha já lançada não é pulada)
+            if ledger and any(ledger.is_posted(rec) for rec in lines):
+                log.warning(f"DOC {doc} tem linhas lançadas sem Save registrado. Relançando DOC.")
+            failed = 0
+            with Heartbeat(queue, doc, owner) as hb:
+                for i, rec in enumerate(lines, start=1):
+                    if hb.lost:
+                        break
+                    with profiler.sample(counts["linhas"] + 1, "registro"):
+                        ok = _process_single_record(page, rec, i, len(lines), seq_info=f"DOC {doc}",
+                                                    is_last_in_doc=rec.doc_save and i == len(lines), ledger=ledger,
+                                                    doc_cache=doc_cache)
+                    counts["linhas"] += 1
+                    failed += not ok
+            if hb.lost:
+                counts["falhos"] += 1
+                continue
+            if failed:
+                queue.fail(doc, owner, f"{failed} de {len(lines)} linhas não lançadas")
+                counts["falhos"] += 1
+                log.error(f"DOC {doc}: {failed} linhas falharam; marcado como falho.")
+            else:
+                queue.complete(doc, owner)
+                counts["docs"] += 1
+            if guard:
+                page = guard.checkpoint(page, counts["linhas"])
+    finally:
+        if ledger:
+            ledger.close()
+        if doc_cache:
+            doc_cache.close()
+    log.info(f"Runner {owner}: {counts['docs']} DOCs concluídos, {counts['falhos']} falhos, "
+             f"{counts['linhas']} linhas. Fila: {queue.stats()}")
+    return counts
+
+def _launch_record(
+    inventory_record,
+    material_number,
+    storage_bin,
+    plant,
+    storage_location,
+    storage_type,
+    quantity_raw,
+    **extra
+) -> LaunchRecord:
+    """Monta o registro convertendo a quantidade uma única vez."""
+    raw = "" if quantity_raw is None else str(quantity_raw).strip()
+    quantity = parse_quantity(raw)
+    # Texto não numérico: mantém o comportamento antigo (0) caso a pré-validação esteja desligada
+    text = _format_quantity(quantity if quantity is not None else _parse_number(raw))
+    return LaunchRecord(
+        inventory_record=intern_code(inventory_record),
+        material_number=str(material_number or "").strip(),
+        storage_bin=str(storage_bin or "").strip(),
+        plant=intern_code(plant),
+        storage_location=intern_code(storage_location),
+        storage_type=intern_code(storage_type),
+        quantity=quantity,
+        quantity_text=text,
+        quantity_raw=raw,
+        **extra
+    )
+
+def _prepare_launch_records(
+    contagem_path: Optional[str],
+    reference_report_path: Optional[str],
+    records: Optional[List[Dict[str, str]]],
+    ledger: Optional[PostingLedger],
+    reference_records: Optional[List[ReferenceRow]] = None,
+    doc_check: Optional[DocCheck] = None
+) -> Iterator[LaunchRecord]:
+    """
+    Produtor (thread de preparação): entrega registros de lançamento já
+    validados e ainda não lançados, na ordem de lançamento.
+    """
+    rejects: List[Tuple[LaunchRecord, str]] = []
+    try:
+        if records is not None:
+            yield from _prepare_db_records(records, reference_report_path, ledger, rejects, reference_records,
+                                           doc_check)
+        else:
+            yield from _prepare_file_records(contagem_path, reference_report_path, ledger, rejects, reference_records,
+                                             doc_check)
+    finally:
+        write_rejects(rejects)
+        if doc_check and doc_check.counted:
+            log.info(f"Conteúdo dos DOCs: {doc_check.counted} linhas já contadas no SAP puladas.")
+
+def _prepare_db_records(
+    records: List[Dict[str, str]],
+    reference_report_path: Optional[str],
+    ledger: Optional[PostingLedger],
+    rejects: List[Tuple[LaunchRecord, str]],
+    reference_records: Optional[List[ReferenceRow]] = None,
+    doc_check: Optional[DocCheck] = None
+) -> Iterator[LaunchRecord]:
+    filtered = []
+    skipped = 0
+    for r in records:
+        doc = r.get("doc")
+        material = r.get("material")
+        plant = r.get("center")
+        deposit = r.get("deposit")
+        if any([
+            _is_invalid_field(doc),
+            _is_invalid_field(material),
+            _is_invalid_field(plant),
+            _is_invalid_field(deposit)
+        ]):
+            skipped += 1
+            continue
+        filtered.append(r)
+    log.info(f"Registros recebidos (DB): {len(records)} | Válidos p/ lançamento: {len(filtered)} | Pulados (campos vazios/nan): {skipped}")
+    if settings.PREFLIGHT_ENABLED:
+        if reference_records is None:
+            reference_records = load_reference_template(reference_report_path)
+        preflight = Preflight(reference_records)
     else:
-        if not contagem_path:
-            raise ValueError("Forneça 'records' ou 'contagem_path'.")
-        contagem_records = load_single_record_file(contagem_path)
-        log.info(f"Contagem (arquivo) carregada: {len(contagem_records)} registros.")
+        preflight = None
+    # Ordem original preservada: o consumidor detecta o último de cada DOC
+    unsaved_docs = set()
+    skipped_posted = 0
+    for r in filtered:
+        rec = _launch_record(
+            r.get("doc"), r.get("material"), r.get("bin"), r.get("center"),
+            r.get("deposit"), r.get("deposit_type"), r.get("quantity"),
+            doc_save=True,
+        )
+        if preflight:
+            reason = preflight.check(rec)
+            if reason:
+                rejects.append((rec, reason))
+                continue
+        if not _in_document(rec, doc_check, rejects):
+            continue
+        if ledger and ledger.is_posted(rec):
+            # Só pula se o DOC também foi salvo; senão relança o DOC inteiro (Save na última linha)
+            if ledger.is_doc_saved(rec.inventory_record):
+                skipped_posted += 1
+                continue
+            if rec.inventory_record not in unsaved_docs:
+                unsaved_docs.add(rec.inventory_record)
+                log.warning(f"DOC {rec.inventory_record} tem linhas lançadas sem Save registrado. Relançando DOC.")
+        yield rec
+    if skipped_posted:
+        log.info(f"Ledger: {skipped_posted} linhas já lançadas puladas.")
+
+def _in_document(rec: LaunchRecord, doc_check: Optional[DocCheck],
+                 rejects: List[Tuple[LaunchRecord, str]]) -> bool:
+    """Conteúdo do DOC no SAP: item já contado é pulado, fora do DOC vai para os rejeitados."""
+    reason = doc_check.check(rec) if doc_check else None
+    if reason is None:
+        return True
+    if reason != ALREADY_COUNTED:
+        rejects.append((rec, reason))
+    return False
 
-    if not contagem_records:
-        log.warning("Nenhum registro de contagem disponível.")
-        return
+def _accept(rec: LaunchRecord, preflight: Optional[Preflight], ledger: Optional[PostingLedger],
+            rejects: List[Tuple[LaunchRecord, str]], doc_check: Optional[DocCheck] = None) -> bool:
+    """Pré-validação + conteúdo do DOC + ledger para os fluxos sem Save por DOC."""
+    if preflight:
+        reason = preflight.check(rec)
+        if reason:
+            rejects.append((rec, reason))
+            return False
+    if not _in_document(rec, doc_check, rejects):
+        return False
+    if ledger and ledger.is_posted(rec):
+        log.info(f"Já lançado (ledger), pulado: DOC={rec.inventory_record} Material={rec.material_number} Bin={rec.storage_bin}")
+        return False
+    return True
 
-    # Carregar template referência
-    reference_records: List[Dict[str, str]] = []
-    if reference_report_path:
-        path = Path(reference_report_path)
-        if path.is_file():
-            try:
-                import pandas as pd
-                df_temp = pd.read_excel(reference_report_path, engine="openpyxl")
-                # Renomeia conforme mapa usado em Parte2
-                rename_map = {
-                    'Depósito': 'Deposito',
-                    'Posição no depósito': 'Posição no Deposito',
-                    'Tipo de depósito': 'TipoDeposito',
-                    'Estoque Total': 'EstoqueTotal'
-                }
-                df_temp = df_temp.rename(columns={c: rename_map[c] for c in df_temp.columns if c in rename_map})
-                for _, row in df_temp.iterrows():
-                    reference_records.append({
-                        "inventory_record": str(row.get("DOC") or "").strip(),
-                        "material_number": str(row.get("Material") or "").strip(),
-                        "plant": str(row.get("Centro") or "").strip(),
-                        "storage_location": str(row.get("Deposito") or "").strip(),
-                        "storage_bin": str(row.get("Posição no Deposito") or "").strip(),
-                        "storage_type": str(row.get("TipoDeposito") or "").strip(),
-                        "stock_total": str(row.get("EstoqueTotal") or "").strip(),
-                        "ud": str(row.get("UD") or "").strip()
-                    })
-                log.info(f"Template referência carregado: {len(reference_records)} linhas.")
-            except Exception as e:
-                log.warning(f"Falha ao ler template referência: {e}. Prosseguindo sem referência.")
-        else:
-            log.warning(f"Template referência não encontrado: {reference_report_path}")
-    else:
-        log.warning("Sem caminho de template referência.")
+def _index_reference(reference_records: List[ReferenceRow]) -> Dict[str, List[ReferenceRow]]:
+    """Referência agrupada por material (evita varrer a lista inteira por contagem)."""
+    idx: Dict[str, List[ReferenceRow]] = {}
+    for ref in reference_records:
+        idx.setdefault(ref.material_number, []).append(ref)
+    return idx
+
+def _prepare_file_records(
+    contagem_path: Optional[str],
+    reference_report_path: Optional[str],
+    ledger: Optional[PostingLedger],
+    rejects: List[Tuple[LaunchRecord, str]],
+    reference_records: Optional[List[ReferenceRow]] = None,
+    doc_check: Optional[DocCheck] = None
+) -> Iterator[LaunchRecord]:
+    if not contagem_path:
+        raise ValueError("Forneça 'records' ou 'contagem_path'.")
+    # Template referência (se não veio carregado) lido em paralelo com o arquivo de contagem
+    loader = None
+    if reference_records is None:
+        loader = InputLoader(max_workers=1)
+        loader.submit("template referência", load_reference_template, reference_report_path)
+    try:
+        contagem_records = [
+            _launch_record(
+                r.get("inventory_record"), r.get("material_number"), r.get("storage_bin"), r.get("plant"),
+                r.get("storage_location"), r.get("storage_type"),
+                r.get("counted_quantity") or r.get("quantity_alt"),
+                ud=r.get("ud", ""),
+                stock_total=_parse_number(r.get("stock_total")) if r.get("stock_total") else None,
+            )
+            for r in load_single_record_file(contagem_path)
+        ]
+        log.info(f"Contagem (arquivo) carregada: {len(contagem_records)} registros.")
+
+        if not contagem_records:
+            log.warning("Nenhum registro de contagem disponível.")
+            return
+        if loader:
+            reference_records = loader.result("template referência")
+    finally:
+        if loader:
+            loader.close()
+    preflight = Preflight(reference_records) if settings.PREFLIGHT_ENABLED else None
 
     if not reference_records:
         # Lançamento direto sem lógica UD
         log.warning("Sem linhas de referência. Lançando registros de contagem diretamente.")
-        for idx, rec in enumerate(contagem_records, start=1):
-            rec["quantity_alt"] = _format_quantity(_parse_number(rec.get("counted_quantity") or "0"))
-            _process_single_record(page, rec, idx, len(contagem_records))
-        log.info("Concluído lançamento sem referência.")
+        for rec in contagem_records:
+            if _accept(rec, preflight, ledger, rejects, doc_check):
+                yield rec
         return
 
     total_contagem = len(contagem_records)
-    launch_list: List[Dict[str, str]] = []
     log.info(f"Iniciando composição de lançamentos com referência. Registros contagem={total_contagem}")
+    ref_index = _index_reference(reference_records)
 
     for i, cont in enumerate(contagem_records, start=1):
-        material = cont.get("material_number", "").strip()
-        plant = cont.get("plant", "").strip()
-        storage_location = cont.get("storage_location", "").strip()
-        storage_bin = cont.get("storage_bin", "").strip()
-        storage_type = cont.get("storage_type", "").strip()
-        inv_doc = cont.get("inventory_record", "").strip()
-        counted_total = _parse_number(cont.get("counted_quantity") or cont.get("quantity_alt") or "0")
-
-        if not inv_doc:
-            log.warning(f"[{i}/{total_contagem}] Sem DOC para material {material}. Ignorado.")
-            continue
-
-        # Filtra referência correspondente
-        def _match(ref: Dict[str, str]) -> bool:
-            if ref.get("material_number", "").strip() != material:
-                return False
-            if plant and ref.get("plant", "").strip() != plant:
-                return False
-            if storage_location and ref.get("storage_location", "").strip() != storage_location:
-                return False
-            if storage_bin and ref.get("storage_bin", "").strip() != storage_bin:
-                return False
-            # TipoDeposito pode vir mas cont não necessariamente tem
-            return True
+        candidates = ref_index.get(cont.material_number, [])
+        for rec in _compose_launch_rows(cont, candidates, i, total_contagem):
+            if _accept(rec, preflight, ledger, rejects, doc_check):
+                yield rec
+
+def _compose_launch_rows(
+    cont: LaunchRecord,
+    reference_records: List[ReferenceRow],
+    i: int,
+    total_contagem: int
+) -> List[LaunchRecord]:
+    """Linhas de lançamento de um registro de contagem (distribuição por UD)."""
+    launch_list: List[LaunchRecord] = []
+    material = cont.material_number
+    plant = cont.plant
+    storage_location = cont.storage_location
+    storage_bin = cont.storage_bin
+    inv_doc = cont.inventory_record
+    counted_total = cont.quantity or 0.0
+
+    if not inv_doc:
+        log.warning(f"[{i}/{total_contagem}] Sem DOC para material {material}. Ignorado.")
+        return launch_list
+
+    # Filtra referência correspondente
+    def _match(ref: ReferenceRow) -> bool:
+        if ref.material_number != material:
+            return False
+        if plant and ref.plant != plant:
+            return False
+        if storage_location and ref.storage_location != storage_location:
+            return False
+        if storage_bin and ref.storage_bin != storage_bin:
+            return False
+        # TipoDeposito pode vir mas cont não necessariamente tem
+        return True
 
-        matching = [r for r in reference_records if _match(r)]
+    matching = [r for r in reference_records if _match(r)]
+
+    if not matching:
+        log.info(f"[{i}/{total_contagem}] Sem referência p/ Material={material} Bin={storage_bin}. Lançando total direto.")
+        launch_list.append(cont)
+        return launch_list
+
+    ud_rows = [r for r in matching if r.ud]
+    non_ud_rows = [r for r in matching if not r.ud]
+
+    log.info(f"[{i}/{total_contagem}] Material={material} Bin={storage_bin} UDs={len(ud_rows)} SemUD={len(non_ud_rows)} Contado={counted_total}")
+
+    def _derived(ref: ReferenceRow, qty: float, ud: str) -> LaunchRecord:
+        formatted = _format_quantity(qty)
+        return LaunchRecord(
+            inventory_record=inv_doc,
+            material_number=material,
+            storage_bin=ref.storage_bin or storage_bin,
+            plant=plant,
+            storage_location=storage_location,
+            storage_type=cont.storage_type,
+            quantity=qty,
+            quantity_text=formatted,
+            quantity_raw=formatted,
+            ud=ud,
+            stock_total=ref.stock_total,
+        )
+
+    # Distribuição para UDs
+    if ud_rows:
+        adjusted_values = _adjust_ud_quantities(counted_total, ud_rows)
+        ordered_ud = sorted(ud_rows, key=lambda r: r.ud_number)
+        for idx_ud, ud_ref in enumerate(ordered_ud):
+            launch_list.append(_derived(ud_ref, adjusted_values[idx_ud], ud_ref.ud))
+    else:
+        # Sem UDs: uma linha com total contado
+        launch_list.append(cont)
 
-        if not matching:
-            log.info(f"[{i}/{total_contagem}] Sem referência p/ Material={material} Bin={storage_bin}. Lançando total direto.")
-            cont["quantity_alt"] = _format_quantity(counted_total)
-            launch_list.append(cont)
-            continue
+    # Linhas sem UD com estoque total original (opcional)
+    for nu in non_ud_rows:
+        launch_list.append(_derived(nu, nu.stock_total, ""))
+    return launch_list
 
-        ud_rows = [r for r in matching if r.get("ud")]
-        non_ud_rows = [r for r in matching if not r.get("ud")]
-
-        log.info(f"[{i}/{total_contagem}] Material={material} Bin={storage_bin} UDs={len(ud_rows)} SemUD={len(non_ud_rows)} Contado={counted_total}")
-
-        # Distribuição para UDs
-        if ud_rows:
-            adjusted_values = _adjust_ud_quantities(counted_total, ud_rows)
-            ordered_ud = sorted(ud_rows, key=lambda r: _parse_ud_number(r.get("ud")))
-            for idx_ud, ud_ref in enumerate(ordered_ud):
-                q_final = adjusted_values[idx_ud]
-                formatted = _format_quantity(q_final)
-                launch_list.append({
-                    "inventory_record": inv_doc,
-                    "material_number": material,
-                    "storage_bin": ud_ref.get("storage_bin", storage_bin),
-                    "plant": plant,
-                    "storage_location": storage_location,
-                    "storage_type": storage_type,
-                    "ud": ud_ref.get("ud", ""),
-                    "counted_quantity": formatted,
-                    "quantity_alt": formatted,
-                    "stock_total": ud_ref.get("stock_total", "")
-                })
-        else:
-            # Sem UDs: uma linha com total contado
-            cont["quantity_alt"] = _format_quantity(counted_total)
-            launch_list.append(cont)
-
-        # Linhas sem UD com estoque total original (opcional)
-        for nu in non_ud_rows:
-            qty_orig = _parse_number(nu.get("stock_total", "0"))
-            formatted = _format_quantity(qty_orig)
-            launch_list.append({
-                "inventory_record": inv_doc,
-                "material_number": material,
-                "storage_bin": nu.get("storage_bin", storage_bin),
-                "plant": plant,
-                "storage_location": storage_location,
-                "storage_type": storage_type,
-                "ud": "",
-                "counted_quantity": formatted,
-                "quantity_alt": formatted,
-                "stock_total": nu.get("stock_total", "")
-            })
-
-    total_launch = len(launch_list)
-    log.info(f"Total linhas para lançar: {total_launch}")
-
-    for idx, rec in enumerate(launch_list, start=1):
-        _process_single_record(page, rec, idx, total_launch)
-
-    log.info("Lançamentos concluídos com referência.")
-
-def _process_single_record(page: Page, rec: Dict[str, str], idx: int, total: int, seq_info: Optional[str] = None, is_last_in_doc: bool = False):
+def _process_single_record(
+    page: Page,
+    rec: LaunchRecord,
+    idx: int,
+    total: Optional[int],
+    seq_info: Optional[str] = None,
+    is_last_in_doc: bool = False,
+    ledger: Optional[PostingLedger] = None,
+    doc_cache: Optional[DocContentsCache] = None
+) -> bool:
+    """
+    Retorna True se o registro foi lançado (e gravado no ledger).
+    total pode ser None enquanto a preparação ainda não terminou.
+    """
+    total = total or "?"
     if any([
-        _is_invalid_field(rec.get("inventory_record")),
-        _is_invalid_field(rec.get("material_number")),
-        _is_invalid_field(rec.get("plant")),
-        _is_invalid_field(rec.get("storage_location"))
+        _is_invalid_field(rec.inventory_record),
+        _is_invalid_field(rec.material_number),
+        _is_invalid_field(rec.plant),
+        _is_invalid_field(rec.storage_location)
     ]):
         log.warning(f"[Registro {idx}/{total}] Campos obrigatórios vazios/nan. Pulado.")
-        return
-    inv = rec.get("inventory_record", "").strip()
+        return False
+    inv = rec.inventory_record
     tag = f"[Registro {idx}/{total}]{'[' + seq_info + ']' if seq_info else ''}"
     try:
         _open_single_record_entry_after_inventory(page, inv)
         log.info(f"{tag} {rec}")
 
         time.sleep(0.6)
-        _fill_field(page, "Storage Bin", rec.get("storage_bin", ""))
-        _pause()
-        _fill_field(page, "Material Number", rec.get("material_number", ""))
-        _pause()
-        _fill_field(page, "Counted quantity in alternative unit of measure",
-                    _format_quantity(_parse_number(rec.get("quantity_alt") or rec.get("counted_quantity") or "0")))
-        _pause()
-        qty_zero = rec.get("quantity_alt", "").strip() in ["0", "0.0", "0,0"]
+        # Mesma ordem do preenchimento campo a campo: 'Zero stock' depois da quantidade
+        fast = _fill_form(page, [
+            ("Storage Bin", rec.storage_bin),
+            ("Material Number", rec.material_number),
+            (QTY_FIELD, rec.quantity_text),
+        ], tag)
+        qty_zero = rec.quantity_text == "0"
         if qty_zero:
             try:
                 page.get_by_text("Zero stock").click()
@@ -721,22 +1186,44 @@ def _process_single_record(page: Page, rec: Dict[str, str], idx: int, total: int
                 time.sleep(0.4)
             except Exception:
                 log.debug(f"{tag} 'Zero stock' não encontrada.")
-
-        _fill_field(page, "Storage Location", rec.get("storage_location", ""))
-        _pause()
-        _fill_field(page, "Plant", rec.get("plant", ""))
-        _pause()
+        fast += _fill_form(page, [
+            ("Storage Location", rec.storage_location),
+            ("Plant", rec.plant),
+        ], tag)
 
         # Confirma quantidade (Enter duas vezes)
+        stream = get_status_stream(page)
+        mark = stream.mark() if stream else 0
+        qty_field = page.get_by_role("textbox", name=QTY_FIELD)
         try:
-            qty_field = page.get_by_role("textbox", name="Counted quantity in alternative unit of measure")
-            if qty_field.count() > 0:
-                qty_field.first.press("Enter")
-                _pause()
-                qty_field.first.press("Enter")
-                _pause()
+            has_qty = qty_field.count() > 0
         except Exception:
-            log.debug(f"{tag} Não conseguiu pressionar Enter no campo quantidade.")
+            has_qty = False
+        settled = False  # round trip do último Enter confirmado pelo rastreador
+        if has_qty:
+            for n in (1, 2):
+                try:
+                    action = begin_action(page)
+                    qty_field.first.press("Enter")
+                    settled = end_action(page, action, f"{tag} Enter {n} quantidade")
+                    if not settled:
+                        _pause()
+                except Exception:
+                    log.debug(f"{tag} Não conseguiu pressionar Enter no campo quantidade.")
+                    break
+                if n == 1 and fast:
+                    if stream:
+                        # Recusa do SAP tem precedência sobre a conferência dos campos
+                        stream.raise_if_error(mark, context=f"DOC={inv} Material={rec.material_number} Bin={rec.storage_bin}")
+                    _confirm_fast_fill(page, fast, qty_field, tag)
+        else:
+            log.debug(f"{tag} Campo quantidade não encontrado para Enter.")
+        if stream:
+            # Erro do SAP (bin/material inválido) aborta o registro imediatamente.
+            # Preenchimento rápido já esperou STATUS_GRACE_MS depois do Enter 1; com o
+            # round trip do Enter 2 concluído, basta despachar o que chegou
+            stream.raise_if_error(mark, context=f"DOC={inv} Material={rec.material_number} Bin={rec.storage_bin}",
+                                  wait_ms=0 if fast and settled else None)
 
         # Cancelar sequência
         _click_cancel_once(page)
@@ -752,27 +1239,49 @@ def _process_single_record(page: Page, rec: Dict[str, str], idx: int, total: int
                 _confirm_exit_yes(page, timeout_s=4.0)
             else:
                 # Após Save já confirmou Yes; garantir retorno INVENTORY
+                if ledger:
+                    ledger.mark_doc_saved(inv)
+                if doc_cache:
+                    doc_cache.invalidate(inv)
                 try:
                     _wait_inventory_field(page, timeout_ms=settings.DEFAULT_TIMEOUT)
                     log.info("OK: Tela INVENTORY disponível (após Save)")
                 except Exception:
-                    log.warning("Não confirmou INVENTORY após Save; tentando Yes extra.")
-                    _confirm_exit_yes(page, timeout_s=2.0)
+                    # DOC já salvo: OK-code /nLI11N não perde nada
+                    if settings.NAV_OKCODE and goto_transaction(page, "LI11N"):
+                        log.info("OK: Tela INVENTORY disponível (OK-code após Save)")
+                    else:
+                        log.warning("Não confirmou INVENTORY após Save; tentando Yes extra.")
+                        _confirm_exit_yes(page, timeout_s=2.0)
         else:
             # Fluxo antigo
+            _cancel_to_inventory(page)
+        if ledger:
+            ledger.mark_posted(rec)
+        return True
+    except (SAPMessageError, FieldNotConfirmed) as e:
+        log.error(f"{tag} SAP recusou o registro: {e}")
+        if _state(page) != "INVENTORY":
             _click_cancel_once(page)
             _pause()
-            _confirm_exit_yes(page, timeout_s=4.0)
-            try:
-                _wait_inventory_field(page, timeout_ms=settings.DEFAULT_TIMEOUT)
-                log.info("OK: Tela INVENTORY disponível")
-            except Exception:
-                log.warning("Inventário não confirmado; tentando Yes extra.")
-                _confirm_exit_yes(page, timeout_s=2.0)
+            _cancel_to_inventory(page)
     except ElementNotFound as e:
         log.error(f"{tag} Falha elemento: {e}")
     except Exception as e:
         log.error(f"{tag} Erro inesperado: {e}")
+    return False
+
+def _cancel_to_inventory(page: Page):
+    """Cancel + confirmação Yes até voltar à tela INVENTORY (LI11N)."""
+    _click_cancel_once(page)
+    _pause()
+    _confirm_exit_yes(page, timeout_s=4.0)
+    try:
+        _wait_inventory_field(page, timeout_ms=settings.DEFAULT_TIMEOUT)
+        log.info("OK: Tela INVENTORY disponível")
+    except Exception:
+        log.warning("Inventário não confirmado; tentando Yes extra.")
+        _confirm_exit_yes(page, timeout_s=2.0)
 
 WAREHOUSE_VALUE = "BR2"
 
@@ -811,8 +1320,10 @@ def _go_to_inventory_screen(page: Page):
     return
 
 def _enter_inventory_number(page: Page, inv: str, max_attempts: int = 3):
+    stream = get_status_stream(page)
     for attempt in range(1, max_attempts + 1):
         try:
+            mark = stream.mark() if stream else 0
             fld = _inventory_field(page)
             fld.first.wait_for(state="visible", timeout=4000)
             fld.first.click()
@@ -822,10 +1333,18 @@ def _enter_inventory_number(page: Page, inv: str, max_attempts: int = 3):
                 pass
             fld.first.fill(inv)
             log.info(f"[STEP] Inventory record -> '{inv}' (tentativa {attempt})")
+            action = begin_action(page)
             fld.first.press("Enter")
-            time.sleep(0.9)
+            settled = end_action(page, action, f"Inventário {inv}")
+            if stream:
+                # DOC inexistente/bloqueado: não adianta repetir
+                stream.raise_if_error(mark, context=f"Inventário {inv}")
+            if not settled:
+                time.sleep(0.9)
             if _can_see_single_record_button(page):
                 return
+        except SAPMessageError:
+            raise
         except Exception:
             log.debug("Tentativa falhou ao digitar/entrar inventário.")
         time.sleep(0.5)
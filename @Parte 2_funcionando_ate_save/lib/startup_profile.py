@@ -0,0 +1,120 @@
+# startup_profile.py
+# lib/startup_profile.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\startup_profile.py
+"""
+Perfil de inicialização (--profile-startup).
+Mede tempo de import por módulo (total e próprio) e fases de inicialização
+(browser, login, carga de dados). Não importa nada de lib/ para não distorcer
+a medição: precisa ser instalado antes dos demais imports do Parte2.py.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+from importlib.abc import MetaPathFinder
+from typing import List, Optional, Tuple
+
+FLAG = "--profile-startup"
+
+_T0 = time.perf_counter()
+_enabled = False
+_imports: List[Tuple[str, float, float]] = []  # (módulo, total_s, próprio_s)
+_phases: List[Tuple[str, float]] = []
+_stack: List[List] = []
+
+
+class _TimingLoader:
+    """Envolve o loader original medindo exec_module."""
+
+    def __init__(self, loader):
+        self._loader = loader
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        frame = [module.__name__, 0.0]
+        _stack.append(frame)
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            total = time.perf_counter() - start
+            _stack.pop()
+            if _stack:
+                _stack[-1][1] += total
+            _imports.append((module.__name__, total, total - frame[1]))
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(MetaPathFinder):
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is None:
+                continue
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = _TimingLoader(spec.loader)
+            return spec
+        return None
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def install_from_argv(argv: List[str]) -> bool:
+    """
+    Ativa o perfil se '--profile-startup' estiver em argv (removendo a flag)
+    ou se PROFILE_STARTUP=1 no ambiente.
+    """
+    global _enabled
+    requested = FLAG in argv
+    while FLAG in argv:
+        argv.remove(FLAG)
+    if os.getenv("PROFILE_STARTUP", "").lower() in ("1", "true", "yes"):
+        requested = True
+    if requested and not _enabled:
+        sys.meta_path.insert(0, _TimingFinder())
+        _enabled = True
+    return _enabled
+
+
+@contextmanager
+def phase(name: str):
+    """Mede uma fase de inicialização (no-op se perfil desativado)."""
+    if not _enabled:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _phases.append((name, time.perf_counter() - start))
+
+
+def report(log, top: int = 25, stop: bool = True) -> Optional[str]:
+    """
+    Escreve no log o relatório de imports (top N por tempo próprio) e fases.
+    Se stop=True, remove o finder para não medir imports posteriores.
+    """
+    if not _enabled:
+        return None
+    if stop:
+        sys.meta_path[:] = [f for f in sys.meta_path if not isinstance(f, _TimingFinder)]
+    elapsed = time.perf_counter() - _T0
+    total_imports = sum(own for _, _, own in _imports)
+    lines = [f"[STARTUP] Tempo até relatório: {elapsed:.3f}s | imports: {total_imports:.3f}s ({len(_imports)} módulos)"]
+    lines.append(f"[STARTUP] {'módulo':<40} {'próprio(ms)':>12} {'total(ms)':>10}")
+    for name, total, own in sorted(_imports, key=lambda x: x[2], reverse=True)[:top]:
+        lines.append(f"[STARTUP] {name:<40} {own * 1000:>12.1f} {total * 1000:>10.1f}")
+    for name, secs in _phases:
+        lines.append(f"[STARTUP] fase {name:<35} {secs * 1000:>12.1f}ms")
+    text = "\n".join(lines)
+    for line in lines:
+        log.info(line)
+    return text
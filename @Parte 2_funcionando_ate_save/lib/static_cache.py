@@ -0,0 +1,21 @@
+# static_cache.py
+# lib/static_cache.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\static_cache.py
+"""
+Cache em disco dos recursos estáticos do WebGUI na Parte 2; implementação em
+comum/static_cache.py. Opt-in (STATIC_CACHE=1): pasta STATIC_CACHE_DIR, cota
+STATIC_CACHE_MAX_MB, validade padrão STATIC_CACHE_TTL_S, STATIC_CACHE_VERSION.
+"""
+from typing import Optional
+from comum import static_cache
+from comum.static_cache import StaticCache
+from .config import settings
+
+
+def install_static_cache(page) -> Optional[StaticCache]:
+    """Roteia os recursos estáticos da página pelo cache em disco (STATIC_CACHE=1)."""
+    if not settings.STATIC_CACHE:
+        return None
+    return static_cache.install_static_cache(page, settings.STATIC_CACHE_DIR, settings.STATIC_CACHE_MAX_MB,
+                                             settings.STATIC_CACHE_TTL_S, settings.STATIC_CACHE_VERSION,
+                                             settings.BASE_URL)
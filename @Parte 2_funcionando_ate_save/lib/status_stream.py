@@ -0,0 +1,222 @@
+# status_stream.py
+# lib/status_stream.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\status_stream.py
+"""
+Stream push das mensagens da barra de status do SAP WebGUI.
+Um MutationObserver na página envia cada mudança da barra de status para o
+Python via expose_binding; as mensagens são classificadas em
+success / warning / error / info (ou 'clear' quando a barra esvazia).
+"""
+import json
+import re
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+from playwright.sync_api import Page
+from .config import settings
+from .logger import get_logger
+from .exceptions import SAPMessageError
+from . import selectors
+
+log = get_logger("status")
+
+BINDING_NAME = "__sapStatusPush"
+
+# Texto (sem ícone/classe de tipo): palavras inteiras; 'no errors' / 'sem erro' não contam
+_ERROR_TEXT = re.compile(
+    r"\b(errors?|erros?|does not exist|not found|invalid|inválid[oa]s?|não existe|inexistente|"
+    r"not allowed|locked|bloquead[oa]s?)\b", re.I)
+_WARNING_TEXT = re.compile(r"\b(warning|aviso|atenção|verifique)\b", re.I)
+_SUCCESS_TEXT = re.compile(r"\b(saved|posted|created|changed|gravad[oa]s?|salv[oa]s?|criad[oa]s?|lançad[oa]s?)\b",
+                           re.I)
+_NEGATION = re.compile(r"\b(no|sem|nenhum|nenhuma|without|0)\s+$", re.I)
+
+# Tipo da mensagem pelo ícone / classe do próprio elemento (tokens de classe ou title/alt)
+_KIND_TOKENS = (
+    ("error", {"error", "erro", "err"}),
+    ("warning", {"warning", "warn", "aviso"}),
+    ("success", {"success", "sucesso", "ok"}),
+    ("info", {"info", "information", "informação"}),
+)
+
+_OBSERVER_JS = """
+(() => {
+  if (window.__sapStatusObserver) return;
+  const SELECTOR = %s;
+  let last = null;
+  let scheduled = false;
+  const push = () => {
+    scheduled = false;
+    const el = document.querySelector(SELECTOR);
+    const text = el ? (el.innerText || el.textContent || '').trim() : '';
+    if (text === last) return;
+    last = text;
+    // Classe do próprio elemento e do ícone de tipo da mensagem (não de todos os descendentes)
+    let cls = '', icon = '';
+    if (el) {
+      cls = String(el.className || '');
+      const img = el.querySelector('[class*="MsgBarImg"], [class*="MessageBar__image"], [class*="MsgIcon"], img, [role="img"]');
+      if (img) {
+        icon = [String(img.className || ''), img.getAttribute('title'), img.getAttribute('alt'),
+                img.getAttribute('aria-label')].filter(Boolean).join(' ');
+      }
+    }
+    if (typeof window[%s] === 'function') window[%s]({ text, cls, icon });
+  };
+  const start = () => {
+    window.__sapStatusObserver = new MutationObserver(() => {
+      if (!scheduled) { scheduled = true; requestAnimationFrame(push); }
+    });
+    window.__sapStatusObserver.observe(document.documentElement, {
+      subtree: true, childList: true, characterData: true, attributes: true, attributeFilter: ['class']
+    });
+    push();
+  };
+  if (document.documentElement) start();
+  else document.addEventListener('DOMContentLoaded', start);
+})();
+"""
+
+
+@dataclass
+class StatusMessage:
+    seq: int
+    kind: str
+    text: str
+    ts: float
+
+
+def _tokens(text: str) -> set:
+    """'urMsgBarImgError lsMessageBar--Warning' -> {'ur', 'msg', 'bar', 'img', 'error', ...}."""
+    words = re.findall(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+", text or "")
+    return {w.lower() for w in words}
+
+def _kind_from_markup(markup: str, with_info: bool = True) -> Optional[str]:
+    tokens = _tokens(markup)
+    for kind, names in _KIND_TOKENS:
+        if tokens & names and (with_info or kind != "info"):
+            return kind
+    return None
+
+def _mentions(pattern: re.Pattern, text: str) -> bool:
+    return any(not _NEGATION.search(text[:m.start()]) for m in pattern.finditer(text))
+
+def classify_status(text: str, css_class: str = "", icon: str = "") -> str:
+    """
+    Tipo da mensagem: ícone de tipo do SAP, depois a classe do próprio elemento
+    e, sem nenhum dos dois, palavras inteiras do texto.
+    """
+    if not text:
+        return "clear"
+    # 'info' só pelo ícone: classe genérica do contêiner não pode esconder um erro do texto
+    kind = _kind_from_markup(icon) or _kind_from_markup(css_class, with_info=False)
+    if kind:
+        return kind
+    if _mentions(_ERROR_TEXT, text):
+        return "error"
+    if _mentions(_WARNING_TEXT, text):
+        return "warning"
+    if _mentions(_SUCCESS_TEXT, text):
+        return "success"
+    return "info"
+
+
+class StatusBarStream:
+    def __init__(self, page: Page):
+        self.page = page
+        self.messages: List[StatusMessage] = []
+        self._seq = 0
+
+    def start(self):
+        script = _OBSERVER_JS % (json.dumps(selectors.STATUS_BAR_SELECTOR),
+                                 json.dumps(BINDING_NAME), json.dumps(BINDING_NAME))
+        self.page.expose_binding(BINDING_NAME, self._on_push)
+        self.page.add_init_script(script)
+        try:
+            self.page.evaluate(script)
+        except Exception as e:
+            log.debug(f"Observer da barra de status será ativado no próximo carregamento: {e}")
+        return self
+
+    def _on_push(self, source, payload):
+        text = str((payload or {}).get("text") or "").strip()
+        kind = classify_status(text, (payload or {}).get("cls") or "", (payload or {}).get("icon") or "")
+        self._seq += 1
+        self.messages.append(StatusMessage(self._seq, kind, text, time.time()))
+        if len(self.messages) > 200:
+            del self.messages[:100]
+        if text:
+            log.info(f"[SAP][{kind.upper()}] {text}")
+
+    # --- Consulta ---
+
+    def latest(self) -> Optional[StatusMessage]:
+        return self.messages[-1] if self.messages else None
+
+    def mark(self) -> int:
+        """Marcador para consultar apenas mensagens posteriores."""
+        return self._seq
+
+    def since(self, seq: int) -> List[StatusMessage]:
+        return [m for m in self.messages if m.seq > seq]
+
+    def pump(self, ms: Optional[int] = None):
+        """Dá tempo ao Playwright para despachar os pushes pendentes."""
+        self.page.wait_for_timeout(settings.STATUS_GRACE_MS if ms is None else ms)
+
+    def raise_if_error(self, since_seq: int, context: str = "", wait_ms: Optional[int] = None):
+        """Lança SAPMessageError com o texto do SAP se chegou erro após since_seq."""
+        self.pump(wait_ms)
+        for m in self.since(since_seq):
+            if m.kind == "error":
+                raise SAPMessageError(m.text, context=context or None)
+
+    def wait_until(self, predicate: Callable[[Optional[StatusMessage]], bool],
+                   timeout_ms: Optional[int] = None, action_desc: str = "") -> bool:
+        timeout_ms = timeout_ms or settings.DEFAULT_TIMEOUT
+        end = time.time() + timeout_ms / 1000.0
+        poll_ms = max(10, int(settings.WAIT_POLL_INTERVAL * 1000))
+        while True:
+            if predicate(self.latest()):
+                if action_desc:
+                    log.info(f"OK: {action_desc}")
+                return True
+            if time.time() >= end:
+                return False
+            self.page.wait_for_timeout(poll_ms)
+
+
+_STREAMS: "weakref.WeakKeyDictionary[Page, StatusBarStream]" = weakref.WeakKeyDictionary()
+
+
+def attach_status_stream(page: Page) -> Optional[StatusBarStream]:
+    if not settings.STATUS_STREAM:
+        return None
+    try:
+        stream = StatusBarStream(page).start()
+    except Exception as e:
+        log.warning(f"Stream da barra de status indisponível: {e}")
+        return None
+    _STREAMS[page] = stream
+    return stream
+
+
+def detach_status_stream(page: Page):
+    """Remove observer e binding da página (aba emprestada volta limpa para o pool)."""
+    _STREAMS.pop(page, None)
+    try:
+        page.evaluate(
+            "(name) => { if (window.__sapStatusObserver) { window.__sapStatusObserver.disconnect();"
+            " delete window.__sapStatusObserver; } try { delete window[name]; } catch (e) {} }",
+            BINDING_NAME,
+        )
+    except Exception as e:
+        log.debug(f"Observer da barra de status não removido: {e}")
+
+
+def get_status_stream(page: Page) -> Optional[StatusBarStream]:
+    try:
+        return _STREAMS.get(page)
+    except TypeError:
+        return None
@@ -7,6 +7,7 @@ from playwright.sync_api import Page, TimeoutError as PlaywrightTimeout
 from .config import settings
 from .logger import get_logger
 from .exceptions import ActionTimeout, PageNotIdle, ElementNotFound
+from .request_tracker import get_request_tracker
 
 log = get_logger("wait")
 
@@ -48,6 +49,12 @@ def wait_page_idle(page: Page, timeout_ms: Optional[int] = None):
     timeout_ms = timeout_ms or settings.PAGE_IDLE_TIMEOUT
     start = time.time()
     page.wait_for_load_state("load", timeout=timeout_ms)
+    tracker = get_request_tracker(page)
+    if tracker is not None:
+        if tracker.settle(timeout_ms=timeout_ms):
+            log.info("Página estável (sem round trip pendente).")
+            return
+        raise PageNotIdle(f"Round trip pendente após {timeout_ms}ms.", context="wait_page_idle")
     try:
         page.wait_for_load_state("networkidle", timeout=3000)
     except Exception:
@@ -0,0 +1,237 @@
+# work_queue.py
+# lib/work_queue.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\work_queue.py
+"""
+Fila de trabalho (SQLite) com o plano de lançamento: um item por DOC de
+inventário, com as linhas já preparadas (LaunchRecord em JSON).
+  compile  - Parte2.py --compile-queue grava/atualiza os DOCs (pendentes)
+  lease    - um runner (Parte2.py --runner) pega o próximo DOC por QUEUE_LEASE_S
+  heartbeat- renova o lease enquanto o DOC é lançado (thread própria)
+  done / failed - resultado do DOC; lease vencido (runner morto) volta a ser
+             pego por outro runner, até QUEUE_MAX_ATTEMPTS
+Vários processos (ou máquinas com a mesma pasta) compartilham o arquivo; cada
+lease é uma transação BEGIN IMMEDIATE (só um runner ganha o DOC). Em pasta de
+rede o SQLite usa o journal padrão (WAL não funciona em compartilhamento).
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+from .config import settings
+from .records import LaunchRecord
+from .logger import get_logger
+
+log = get_logger("queue")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    doc TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    storage_type TEXT,
+    n_lines INTEGER NOT NULL,
+    lines TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    owner TEXT,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    compiled_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_docs_status ON docs(status, position);
+"""
+
+PENDING, LEASED, DONE, FAILED = "pending", "leased", "done", "failed"
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def runner_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+@dataclass
+class QueueItem:
+    doc: str
+    lines: List[LaunchRecord]
+    attempts: int
+
+
+class WorkQueue:
+    def __init__(self, path: str, lease_s: Optional[float] = None, max_attempts: Optional[int] = None):
+        self.path = path
+        self.lease_s = lease_s or settings.QUEUE_LEASE_S
+        self.max_attempts = max_attempts or settings.QUEUE_MAX_ATTEMPTS
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        # isolation_level=None: transações explícitas (BEGIN IMMEDIATE no lease)
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+
+    def _write(self, sql: str, params: tuple) -> int:
+        with self._lock:
+            return self._conn.execute(sql, params).rowcount
+
+    # --- compilação ---
+
+    def compile(self, plan: Iterable[Tuple[str, List[LaunchRecord]]]) -> Dict[str, int]:
+        """
+        Grava o plano (DOC -> linhas, na ordem de lançamento). DOC já concluído ou
+        em lease fica como está; pendente/falho é substituído pelo plano novo.
+        """
+        counts = {"novos": 0, "atualizados": 0, "mantidos": 0}
+        now = _now()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                base = self._conn.execute("SELECT COALESCE(MAX(position), 0) FROM docs").fetchone()[0]
+                for i, (doc, lines) in enumerate(plan, start=1):
+                    payload = json.dumps([rec.as_dict() for rec in lines], ensure_ascii=False)
+                    storage_type = lines[0].storage_type if lines else ""
+                    row = self._conn.execute("SELECT status FROM docs WHERE doc = ?", (doc,)).fetchone()
+                    if row is None:
+                        self._conn.execute(
+                            "INSERT INTO docs (doc, position, storage_type, n_lines, lines, compiled_at, updated_at) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            (doc, base + i, storage_type, len(lines), payload, now, now),
+                        )
+                        counts["novos"] += 1
+                    elif row[0] in (PENDING, FAILED):
+                        self._conn.execute(
+                            "UPDATE docs SET storage_type = ?, n_lines = ?, lines = ?, status = ?, owner = NULL, "
+                            "lease_until = NULL, attempts = 0, error = NULL, compiled_at = ?, updated_at = ? "
+                            "WHERE doc = ?",
+                            (storage_type, len(lines), payload, PENDING, now, now, doc),
+                        )
+                        counts["atualizados"] += 1
+                    else:
+                        counts["mantidos"] += 1
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return counts
+
+    # --- runner ---
+
+    def lease(self, owner: str) -> Optional[QueueItem]:
+        """Próximo DOC pendente (ou com lease vencido) para owner; None se não houver."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Lease vencido além do limite de tentativas: o DOC derrubou runners demais
+                self._conn.execute(
+                    "UPDATE docs SET status = ?, error = 'lease vencido em todas as tentativas', updated_at = ? "
+                    "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+                    (FAILED, _now(), LEASED, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT doc, lines, attempts, status, owner FROM docs "
+                    "WHERE status = ? OR (status = ? AND lease_until < ?) "
+                    "ORDER BY position LIMIT 1",
+                    (PENDING, LEASED, now),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                doc, payload, attempts, status, previous = row
+                self._conn.execute(
+                    "UPDATE docs SET status = ?, owner = ?, lease_until = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE doc = ?",
+                    (LEASED, owner, now + self.lease_s, _now(), doc),
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if status == LEASED:
+            log.warning(f"DOC {doc}: lease de {previous} venceu; retomado por {owner}.")
+        return QueueItem(doc, [LaunchRecord(**d) for d in json.loads(payload)], attempts + 1)
+
+    def heartbeat(self, doc: str, owner: str) -> bool:
+        """Renova o lease; False = lease perdido (venceu e outro runner pegou o DOC)."""
+        return self._write(
+            "UPDATE docs SET lease_until = ?, updated_at = ? WHERE doc = ? AND owner = ? AND status = ?",
+            (time.time() + self.lease_s, _now(), doc, owner, LEASED),
+        ) == 1
+
+    def complete(self, doc: str, owner: str) -> bool:
+        return self._write(
+            "UPDATE docs SET status = ?, lease_until = NULL, error = NULL, updated_at = ? "
+            "WHERE doc = ? AND owner = ? AND status = ?",
+            (DONE, _now(), doc, owner, LEASED),
+        ) == 1
+
+    def fail(self, doc: str, owner: str, error: str) -> bool:
+        return self._write(
+            "UPDATE docs SET status = ?, lease_until = NULL, error = ?, updated_at = ? "
+            "WHERE doc = ? AND owner = ? AND status = ?",
+            (FAILED, error[:500], _now(), doc, owner, LEASED),
+        ) == 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM docs GROUP BY status").fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update({status: n for status, n in rows})
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class Heartbeat:
+    """Renova o lease em segundo plano enquanto o DOC é lançado (with Heartbeat(...) as hb)."""
+
+    def __init__(self, queue: WorkQueue, doc: str, owner: str, interval_s: Optional[float] = None):
+        self.queue = queue
+        self.doc = doc
+        self.owner = owner
+        self.interval_s = interval_s or settings.QUEUE_HEARTBEAT_S
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"heartbeat-{doc}", daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval_s):
+            try:
+                if not self.queue.heartbeat(self.doc, self.owner):
+                    self.lost = True
+                    log.error(f"DOC {self.doc}: lease perdido (outro runner pode ter retomado).")
+                    return
+            except sqlite3.Error as e:
+                log.warning(f"DOC {self.doc}: heartbeat falhou ({e}); nova tentativa no próximo ciclo.")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join(timeout=5)
+        return False
+
+
+def group_by_doc(records: Iterable[LaunchRecord]) -> List[Tuple[str, List[LaunchRecord]]]:
+    """Plano por DOC na ordem da primeira aparição (linhas do mesmo DOC juntas)."""
+    plan: Dict[str, List[LaunchRecord]] = {}
+    for rec in records:
+        plan.setdefault(rec.inventory_record, []).append(rec)
+    return list(plan.items())
+
+
+def open_queue() -> WorkQueue:
+    queue = WorkQueue(settings.QUEUE_PATH)
+    log.info(f"Fila de lançamento: {settings.QUEUE_PATH}")
+    return queue
@@ -0,0 +1,103 @@
+# work_slice.py
+# lib/work_slice.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\lib\work_slice.py
+"""
+Fatia de trabalho de uma execução da Parte 2 (linha de comando):
+filtros por DOC, centro e depósito, --shard i/N e --limit.
+O shard é crc32 do DOC (estável entre máquinas e execuções, ao contrário
+de hash()): cópias com 1/N ... N/N nunca lançam o mesmo DOC, e todas as
+linhas de um DOC ficam na mesma cópia (Save na última linha).
+--limit conta DOCs inteiros, na ordem em que aparecem.
+"""
+import zlib
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Tuple
+from .logger import get_logger
+
+log = get_logger("slice")
+
+
+def _codes(values) -> FrozenSet[str]:
+    """Valores repetidos e/ou separados por vírgula -> conjunto normalizado."""
+    out = set()
+    for value in values or ():
+        out.update(v.strip().upper() for v in str(value).split(",") if v.strip())
+    return frozenset(out)
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """'2/4' -> (2, 4); índice de 1 a N."""
+    try:
+        i, n = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"shard '{text}' inválido (use i/N, ex.: 1/3)")
+    if n < 1 or not 1 <= i <= n:
+        raise ValueError(f"shard '{text}' inválido (i de 1 a N)")
+    return i, n
+
+
+def shard_of(doc: str, n: int) -> int:
+    return zlib.crc32(str(doc).strip().upper().encode("utf-8")) % n + 1
+
+
+@dataclass(frozen=True)
+class WorkSlice:
+    docs: FrozenSet[str] = frozenset()
+    plants: FrozenSet[str] = frozenset()
+    storage_locations: FrozenSet[str] = frozenset()
+    shard: Optional[Tuple[int, int]] = None
+    limit: int = 0  # DOCs; 0 = sem limite
+
+    @classmethod
+    def from_args(cls, docs=None, plants=None, storage_locations=None,
+                  shard: Optional[str] = None, limit: int = 0) -> "WorkSlice":
+        return cls(_codes(docs), _codes(plants), _codes(storage_locations),
+                   parse_shard(shard) if shard else None, max(0, limit or 0))
+
+    @property
+    def active(self) -> bool:
+        return bool(self.docs or self.plants or self.storage_locations or self.shard or self.limit)
+
+    def describe(self) -> str:
+        parts = []
+        if self.docs:
+            parts.append(f"DOC={','.join(sorted(self.docs))}")
+        if self.plants:
+            parts.append(f"centro={','.join(sorted(self.plants))}")
+        if self.storage_locations:
+            parts.append(f"depósito={','.join(sorted(self.storage_locations))}")
+        if self.shard:
+            parts.append(f"shard={self.shard[0]}/{self.shard[1]}")
+        if self.limit:
+            parts.append(f"limite={self.limit} DOCs")
+        return " ".join(parts) or "tudo"
+
+    def matches(self, doc: str, plant: str, storage_location: str) -> bool:
+        doc = str(doc or "").strip().upper()
+        if self.docs and doc not in self.docs:
+            return False
+        if self.plants and str(plant or "").strip().upper() not in self.plants:
+            return False
+        if self.storage_locations and str(storage_location or "").strip().upper() not in self.storage_locations:
+            return False
+        if self.shard and shard_of(doc, self.shard[1]) != self.shard[0]:
+            return False
+        return True
+
+    def apply(self, records: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        """Registros do banco (chaves doc/center/deposit) dentro da fatia, ordem preservada."""
+        if not self.active:
+            return records
+        kept: List[Dict[str, str]] = []
+        docs_kept = set()
+        for r in records:
+            if not self.matches(r.get("doc"), r.get("center"), r.get("deposit")):
+                continue
+            doc = r.get("doc")
+            if doc not in docs_kept:
+                if self.limit and len(docs_kept) >= self.limit:
+                    continue  # linhas de DOCs já aceitos continuam entrando
+                docs_kept.add(doc)
+            kept.append(r)
+        log.info(f"Fatia ({self.describe()}): {len(kept)} de {len(records)} registros, {len(docs_kept)} DOCs.")
+        return kept
@@ -0,0 +1,96 @@
+# test_work_queue.py
+# tests/test_work_queue.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\tests\test_work_queue.py
+"""
+Semântica de lease da fila de trabalho (lib/work_queue.py) num SQLite temporário.
+
+Uso (na pasta da Parte 2):
+  python -m pytest tests
+"""
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from lib.records import LaunchRecord  # noqa: E402
+from lib.work_queue import DONE, FAILED, LEASED, PENDING, WorkQueue  # noqa: E402
+
+LEASE_S = 0.05
+
+
+def _rec(doc: str, material: str = "4711") -> LaunchRecord:
+    return LaunchRecord(doc, material, "01-A", "BR01", "0001", "H0A", 1.0, "1")
+
+
+def _status(queue: WorkQueue, doc: str) -> str:
+    return queue._conn.execute("SELECT status FROM docs WHERE doc = ?", (doc,)).fetchone()[0]
+
+
+def _expire():
+    time.sleep(LEASE_S * 2)
+
+
+@pytest.fixture
+def queue(tmp_path):
+    q = WorkQueue(str(tmp_path / "fila.db"), lease_s=LEASE_S, max_attempts=2)
+    yield q
+    q.close()
+
+
+def test_lease_vencido_e_retomado(queue):
+    queue.compile([("100", [_rec("100")])])
+    first = queue.lease("runner-a")
+    assert first.doc == "100" and first.attempts == 1
+    assert queue.lease("runner-b") is None  # lease ainda válido
+    _expire()
+    again = queue.lease("runner-b")
+    assert again.doc == "100" and again.attempts == 2
+    assert again.lines == [_rec("100")]
+
+
+def test_falha_depois_de_max_tentativas(queue):
+    queue.compile([("100", [_rec("100")])])
+    queue.lease("runner-a")
+    _expire()
+    queue.lease("runner-b")
+    _expire()
+    assert queue.lease("runner-c") is None
+    assert _status(queue, "100") == FAILED
+
+
+def test_lease_perdido_recusa_heartbeat_e_complete(queue):
+    queue.compile([("100", [_rec("100")])])
+    queue.lease("runner-a")
+    assert queue.heartbeat("100", "runner-a")
+    _expire()
+    queue.lease("runner-b")
+    assert not queue.heartbeat("100", "runner-a")
+    assert not queue.complete("100", "runner-a")
+    assert not queue.fail("100", "runner-a", "erro")
+    assert _status(queue, "100") == LEASED
+    assert queue.complete("100", "runner-b")
+    assert _status(queue, "100") == DONE
+
+
+def test_compile_mantem_concluido_e_em_lease(tmp_path):
+    queue = WorkQueue(str(tmp_path / "fila.db"), lease_s=60)
+    queue.compile([("100", [_rec("100")]), ("200", [_rec("200")]), ("300", [_rec("300")])])
+    done = queue.lease("runner-a")
+    assert done.doc == "100" and queue.complete("100", "runner-a")
+    leased = queue.lease("runner-a")
+    assert leased.doc == "200"
+
+    counts = queue.compile([("100", [_rec("100", "9")]), ("200", [_rec("200", "9")]),
+                            ("300", [_rec("300", "9")]), ("400", [_rec("400")])])
+    assert counts == {"novos": 1, "atualizados": 1, "mantidos": 2}
+    assert _status(queue, "100") == DONE
+    assert _status(queue, "200") == LEASED
+    assert _status(queue, "300") == PENDING
+    assert queue.heartbeat("200", "runner-a")
+    nxt = queue.lease("runner-b")
+    assert nxt.doc == "300" and nxt.lines[0].material_number == "9"
+    queue.close()
@@ -0,0 +1,625 @@
+# auto_tuner.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\auto_tuner.py
+"""
+Auto-tuner offline das esperas da Parte 1 e da Parte 2.
+
+Os fluxos são repetidos contra um WebGUI simulado (sem navegador, sem SAP):
+  parte1 - LX15 (variante, Storage Type, F8 + detecção rápida/retries, Activate) e SM35
+  parte2 - ciclo SRE por registro (inventário, Single Record Entry, Enter x2, Cancel/Yes,
+           Save no último registro do DOC)
+Cada ação sorteia a latência do servidor de uma distribuição gravada nos logs de
+execuções reais (linhas 'OK: ... (Nms)' do
+rastreador de round trips e intervalos entre linhas conhecidas do log da Parte 2);
+tipos de ação sem amostras suficientes usam uma distribuição lognormal padrão.
+As esperas do robô seguem o código: pausas fixas, polling com timeout e, com
+REQUEST_TRACKER, espera pelo round trip (que pode não ver uma requisição que sai
+depois de SETTLE_START_MS - aí vale a pausa fixa seguinte).
+Falha = ação disparada com a tela ainda ocupada ou espera que estourou o timeout.
+
+Busca por coordenadas sobre uma grade de candidatos: a configuração mais rápida
+com taxa de falha zero em --runs repetições, com as latências multiplicadas por
+--margin. Timeouts ficam em pelo menos --timeout-headroom x a maior latência vista.
+Só entram na busca os parâmetros cujas ações têm amostras gravadas (>= MIN_SAMPLES):
+os demais ficam no valor atual, não vão para o perfil e aparecem como não ajustados.
+Valores atuais = lib/config.py de cada parte (variáveis de ambiente > config.json > padrão).
+Perfis gravados em logs/auto_tuner/<data>/ (config.json de cada parte); --apply
+grava direto na pasta de cada parte (o config.json da Parte 2 é mesclado).
+
+  python auto_tuner.py
+  python auto_tuner.py --logs "@Parte 2_funcionando_ate_save/logs" --logs logs/orquestrador --runs 5000
+  python auto_tuner.py --only parte2 --margin 1.5 --apply
+"""
+import argparse
+import copy
+import glob
+import importlib.util
+import json
+import logging
+import math
+import os
+import random
+import re
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PARTE1_DIR = os.path.join(ROOT, "@Parte 1")
+PARTE2_DIR = os.path.join(ROOT, "@Parte 2_funcionando_ate_save")
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)-7s | auto_tuner | %(message)s")
+log = logging.getLogger("auto_tuner")
+
+MIN_SAMPLES = 20        # abaixo disso o tipo de ação usa a distribuição padrão
+TAIL_CAP = 1.5          # distribuição padrão truncada em TAIL_CAP x p95 (gravadas: maior amostra)
+POLL_COST_S = 0.02      # custo de uma consulta de locator (ida e volta ao navegador)
+FRAMES_S = 0.033        # 2 requestAnimationFrame após o round trip
+SETTLE_START_S = 0.3    # SETTLE_START_MS
+SETTLE_QUIET_S = 0.08   # SETTLE_QUIET_MS
+RECORDS_PER_RUN = 200   # Parte 2: registros por execução (abertura da transação amortizada)
+
+# Latência padrão por tipo de ação: (mediana_ms, p95_ms) de uma lognormal
+DEFAULT_LATENCY_MS: Dict[str, Tuple[float, float]] = {
+    "dispatch": (20, 60),       # JS do WebGUI até a requisição sair
+    "enter": (300, 900),
+    "click": (250, 700),
+    "cancel": (350, 1000),
+    "okcode": (900, 2500),
+    "sre_open": (600, 1800),
+    "save": (1200, 4000),
+    "f8": (4000, 15000),
+}
+
+# Descrição da ação (rastreador / log) -> tipo
+_KIND_RULES: List[Tuple[str, re.Pattern]] = [
+    ("okcode", re.compile(r"OK-code|Abrir |transa", re.I)),
+    ("f8", re.compile(r"\bF8\b")),
+    ("save", re.compile(r"\bSave\b|Salvar", re.I)),
+    ("sre_open", re.compile(r"Single Record|Storage Bin", re.I)),
+    ("cancel", re.compile(r"Cancel|\bYes\b", re.I)),
+    ("enter", re.compile(r"Enter|Invent|Storage Type|quantidade", re.I)),
+    ("click", re.compile(r".")),
+]
+_TIMED = re.compile(r"OK: (.+?) \((\d+)ms\)")
+_TS = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:,\d{3})?)")
+# Intervalos entre linhas do log da Parte 2, menos as pausas fixas conhecidas do código
+# (limite superior: ainda incluem _pause e o polling)
+_PAIRS: List[Tuple[str, re.Pattern, re.Pattern, float]] = [
+    ("sre_open", re.compile(r"Botão 'Single Record Entry' clicado"), re.compile(r"OK: Campo 'Storage Bin' visível"), 0.0),
+    ("okcode", re.compile(r"\[STEP\] Preencher 'Enter transaction code'"), re.compile(r"OK: Status livre"), 0.0),
+    ("cancel", re.compile(r"Click Cancel"), re.compile(r"Click Yes"), 0.3),
+]
+
+
+def _kind(desc: str) -> str:
+    for kind, rx in _KIND_RULES:
+        if rx.search(desc):
+            return kind
+    return "click"
+
+
+def _parse_ts(text: str) -> Optional[float]:
+    for fmt in ("%Y-%m-%d %H:%M:%S,%f", "%Y-%m-%d %H:%M:%S"):
+        try:
+            return datetime.strptime(text, fmt).timestamp()
+        except ValueError:
+            continue
+    return None
+
+
+def collect_latencies(paths: List[str]) -> Dict[str, List[float]]:
+    """Amostras (segundos) por tipo de ação a partir dos logs (arquivos ou pastas, recursivo)."""
+    files: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += glob.glob(os.path.join(p, "**", "*.log"), recursive=True)
+        elif os.path.isfile(p):
+            files.append(p)
+    samples: Dict[str, List[float]] = {}
+    for path in sorted(set(files)):
+        open_pairs: Dict[str, float] = {}
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    m = _TIMED.search(line)
+                    if m:
+                        samples.setdefault(_kind(m.group(1)), []).append(int(m.group(2)) / 1000.0)
+                        continue
+                    ts_m = _TS.match(line)
+                    ts = _parse_ts(ts_m.group(1)) if ts_m else None
+                    if ts is None:
+                        continue
+                    for kind, start_rx, end_rx, overhead_s in _PAIRS:
+                        if start_rx.search(line):
+                            open_pairs[kind] = ts
+                        elif end_rx.search(line) and kind in open_pairs:
+                            delta = ts - open_pairs.pop(kind) - overhead_s
+                            if 0 < delta < 120:
+                                samples.setdefault(kind, []).append(delta)
+        except OSError as e:
+            log.warning(f"Log ignorado ({path}): {e}")
+    return samples
+
+
+class LatencyModel:
+    """Latência do servidor por tipo de ação: amostras gravadas (bootstrap) ou lognormal padrão."""
+
+    def __init__(self, samples: Dict[str, List[float]], margin: float = 1.0):
+        self.margin = margin
+        self.samples = {k: v for k, v in samples.items() if len(v) >= MIN_SAMPLES}
+        self._lognormal: Dict[str, Tuple[float, float, float]] = {}
+        for kind, (median_ms, p95_ms) in DEFAULT_LATENCY_MS.items():
+            mu = math.log(median_ms / 1000.0)
+            sigma = math.log(p95_ms / median_ms) / 1.645
+            self._lognormal[kind] = (mu, sigma, TAIL_CAP * p95_ms / 1000.0)
+
+    def source(self, kind: str) -> str:
+        return f"{len(self.samples[kind])} amostras" if kind in self.samples else "padrão"
+
+    def draw(self, rng: random.Random, kind: str) -> float:
+        recorded = self.samples.get(kind)
+        if recorded:
+            value = rng.choice(recorded) * rng.uniform(0.9, 1.1)
+        else:
+            mu, sigma, cap = self._lognormal.get(kind, self._lognormal["click"])
+            value = min(rng.lognormvariate(mu, sigma), cap)
+        return value * self.margin
+
+
+class _Failure(Exception):
+    def __init__(self, kind: str, fixed: bool = False):
+        super().__init__(kind)
+        self.kind = kind
+        self.fixed = fixed  # estourou uma espera constante do código (nenhum parâmetro resolve)
+
+
+@dataclass
+class Sim:
+    """Um ciclo do fluxo: acumula o tempo gasto e levanta _Failure quando a automação erraria."""
+    rng: random.Random
+    model: LatencyModel
+    tracker: bool = True
+    elapsed: float = 0.0
+    max_latency: Dict[str, float] = field(default_factory=dict)
+
+    def _latency(self, kind: str) -> float:
+        value = self.model.draw(self.rng, kind)
+        self.max_latency[kind] = max(self.max_latency.get(kind, 0.0), value)
+        return value
+
+    def fixed(self, seconds: float):
+        self.elapsed += seconds
+
+    def blind(self, kind: str, sleep_s: float):
+        """Ação seguida só de pausa fixa: a próxima ação precisa da tela pronta."""
+        latency = self._latency(kind)
+        self.elapsed += sleep_s
+        if latency > sleep_s:
+            raise _Failure(kind)
+
+    def poll(self, kind: str, poll_s: float, timeout_s: float, pre_s: float = 0.0,
+             latency: Optional[float] = None, fixed: bool = False):
+        """Pausa pre_s e depois consulta a cada poll_s até a tela responder ou timeout_s."""
+        latency = self._latency(kind) if latency is None else latency
+        remaining = max(0.0, latency - pre_s)
+        if remaining > timeout_s:
+            self.elapsed += pre_s + timeout_s
+            raise _Failure(kind, fixed)
+        polls = math.ceil(remaining / poll_s) if remaining > 0 else 0
+        self.elapsed += pre_s + polls * poll_s + (polls + 1) * POLL_COST_S
+
+    def settle(self, kind: str, fallback_s: float = 0.0, after_s: float = 0.0, detect: bool = False) -> float:
+        """
+        Ação com rastreador: espera o round trip (+ after_s fixo). Requisição que sai depois
+        de SETTLE_START_S passa despercebida; sem rastreador vale a pausa fallback_s.
+        Devolve quanto falta para a tela ficar pronta; detect=True = quem chama detecta
+        o resultado depois (não é falha).
+        """
+        latency = self._latency(kind)
+        if not self.tracker:
+            waited = fallback_s + after_s
+        else:
+            dispatch = self.model.draw(self.rng, "dispatch")
+            if dispatch <= SETTLE_START_S:
+                self.elapsed += dispatch + latency + SETTLE_QUIET_S + FRAMES_S + after_s
+                return 0.0
+            latency += dispatch
+            waited = SETTLE_START_S + FRAMES_S + after_s
+        self.elapsed += waited
+        remaining = max(0.0, latency - waited)
+        if remaining and not detect:
+            raise _Failure(kind)
+        return remaining
+
+
+# --- parâmetros ---
+
+@dataclass
+class Param:
+    name: str                   # nome no perfil (Config da Parte 1 / Settings da Parte 2)
+    json_path: str              # chave no config.json ('a.b' = aninhado)
+    candidates: List[float]
+    timeout_kinds: Tuple[str, ...] = ()   # timeout: ações que ele cobre (folga --timeout-headroom)
+    scale: float = 1.0          # valor no simulador (s) = valor no perfil * scale
+    kinds: Tuple[str, ...] = ()           # ações cuja latência decide o valor (precisam de amostras)
+
+    def measured(self, model: "LatencyModel") -> bool:
+        return all(kind in model.samples for kind in self.kinds)
+
+
+PARTE1_PARAMS = [
+    Param("action_delay", "action_delay", [0.0, 0.1, 0.2, 0.3, 0.5, 0.8, 1.0, 1.5, 2.0],
+          kinds=("click", "enter")),
+    Param("wait_post_f8_small", "wait_post_f8_small", [0.0, 0.2, 0.4, 0.6, 0.8, 1.2], kinds=("f8",)),
+    Param("quick_detection_timeout", "quick_detection_timeout", [1.0, 2.0, 3.0, 5.0, 8.0, 12.0],
+          kinds=("f8",)),
+    Param("quick_detection_poll", "quick_detection_poll", [0.1, 0.2, 0.3, 0.5], kinds=("f8",)),
+    Param("f8_retry_interval", "f8_retry_interval", [0.5, 1.0, 2.0, 3.0, 4.0, 6.0], kinds=("f8",)),
+]
+
+PARTE2_PARAMS = [
+    Param("SINGLE_RECORD_INTERVAL_S", "playback.single_record_interval_s",
+          [0.05, 0.1, 0.15, 0.2, 0.25, 0.3, 0.4, 0.6, 0.8, 1.0, 1.25, 1.5],
+          kinds=("enter", "sre_open", "click", "cancel")),
+    Param("ACTION_DELAY_MS", "playback.action_delay_ms", [0, 50, 100, 200, 400, 800], scale=0.001,
+          kinds=("okcode",)),
+    Param("WAIT_POLL_INTERVAL", "timeouts.poll_interval_s", [0.03, 0.05, 0.1, 0.15, 0.25, 0.5],
+          kinds=("sre_open", "okcode")),
+    Param("DEFAULT_TIMEOUT", "timeouts.appear_ms", [2000, 3000, 5000, 8000, 10000, 15000, 20000],
+          timeout_kinds=("sre_open", "click", "okcode"), scale=0.001, kinds=("sre_open", "click", "okcode")),
+]
+# 'dispatch' (JS do WebGUI até a requisição sair) não aparece nos logs: fica sempre na
+# distribuição padrão e não conta como ação que um parâmetro precise ter medida.
+
+
+def _jget(data: dict, path: str, default):
+    cur = data
+    for part in path.split("."):
+        if not isinstance(cur, dict) or part not in cur:
+            return default
+        cur = cur[part]
+    return cur
+
+
+def _jset(data: dict, path: str, value):
+    parts = path.split(".")
+    cur = data
+    for part in parts[:-1]:
+        cur = cur.setdefault(part, {})
+    cur[parts[-1]] = value
+
+
+def _load_json(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+# --- fluxos (espelham o código das partes; manter em sincronia) ---
+
+def flow_parte1(sim: Sim, p: Dict[str, float]):
+    """Um storage: SapSession.process_storage com OK-code e rastreador."""
+    d = p["action_delay"]
+
+    def click():
+        # safe_click: round trip + atraso global; depois self.delay
+        sim.settle("click", fallback_s=d, after_s=d)
+        sim.fixed(d)
+
+    arrival = sim.settle("okcode", detect=True)   # /nLX15
+    sim.poll("okcode", 0.1, 20.0, latency=arrival, fixed=True)  # conferência de chegada
+    sim.fixed(2.0)
+    for _ in range(3):                            # Get Variant / linha / Choose
+        click()
+    sim.fixed(1.0)
+    sim.fixed(2 * d)                              # safe_fill + delay antes do Enter
+    sim.settle("enter", fallback_s=d + 1.5)       # Storage Type
+    sim.fixed(1.0)
+
+    # F8 + _retry_f8_until_results
+    latency = sim.settle("f8", fallback_s=d + 0.4, detect=True)
+    window = p["wait_post_f8_small"] + 2.0 + p["quick_detection_timeout"]
+    waited = 0.0
+    for attempt in range(1, 6):                   # f8_retry_attempts
+        sim.fixed(p["wait_post_f8_small"] + 2.0)
+        remaining = latency - waited - p["wait_post_f8_small"] - 2.0
+        if remaining <= p["quick_detection_timeout"]:
+            sim.poll("f8", p["quick_detection_poll"], p["quick_detection_timeout"], latency=max(0.0, remaining))
+            break
+        sim.fixed(p["quick_detection_timeout"])
+        waited += window
+        if attempt < 5:
+            sim.fixed(0.5 + d + 0.4 + p["f8_retry_interval"])   # revalida, F8 de novo, intervalo
+            waited += 0.5 + d + 0.4 + p["f8_retry_interval"]
+    else:
+        sim.poll("f8", 0.5, 60.0, latency=max(0.0, latency - waited))  # detecção FULL
+
+    sim.fixed(2.0)                                # Activate
+    click()
+    sim.fixed(1.0)
+    sim.poll("okcode", 0.1, 20.0, latency=sim.settle("okcode", detect=True), fixed=True)   # /n
+    # SM35
+    sim.poll("okcode", 0.1, 20.0, latency=sim.settle("okcode", detect=True), fixed=True)
+    sim.fixed(4.0)
+    click()                                       # primeiro batch
+    for _ in range(3):                            # Process / Background / Process interno
+        sim.fixed(2.0)
+        click()
+    sim.fixed(2.0)
+    click()                                       # Exit final
+
+
+def flow_parte2(sim: Sim, p: Dict[str, float], last_in_doc: bool):
+    """Um registro: _process_single_record (preenchimento rápido, OK-code, rastreador)."""
+    pause = p["SINGLE_RECORD_INTERVAL_S"]
+    poll = p["WAIT_POLL_INTERVAL"]
+    timeout = p["DEFAULT_TIMEOUT"]
+
+    sim.settle("enter", fallback_s=0.9)                   # número do inventário
+    sim.poll("sre_open", poll, timeout, pre_s=pause)      # SRE + _pause + Storage Bin
+    sim.fixed(0.6 + 0.05)                                 # sleep(0.6) + evaluate do preenchimento
+    for _ in range(2):                                    # Enter x2 na quantidade
+        sim.settle("enter", fallback_s=pause)
+    sim.blind("click", 0.3 + pause)                       # Cancel + sleep(0.3) + _pause
+    if last_in_doc:
+        sim.fixed(0.5)                                    # Save + sleep(0.5)
+        sim.poll("save", 0.2, 4.0, fixed=True)            # popup Yes
+        sim.fixed(0.4)
+        sim.poll("click", 0.25, timeout)                  # campo do inventário de volta
+    else:
+        sim.poll("cancel", 0.2, 4.0, pre_s=0.3 + pause)   # segundo Cancel + popup Yes
+        sim.fixed(0.4)
+        sim.poll("click", 0.25, timeout)
+
+
+def startup_parte2(sim: Sim, p: Dict[str, float]):
+    """open_transaction por OK-code + ensure_post_action_stable."""
+    arrival = sim.settle("okcode", detect=True)
+    sim.poll("okcode", p["WAIT_POLL_INTERVAL"], p["DEFAULT_TIMEOUT"], latency=arrival)
+    sim.fixed(p["ACTION_DELAY_MS"])
+
+
+def run_parte2(sim: Sim, p: Dict[str, float], i: int, per_doc: int):
+    """Registro i de uma execução: abertura da LI11N a cada RECORDS_PER_RUN registros."""
+    if i % RECORDS_PER_RUN == 0:
+        startup_parte2(sim, p)
+    flow_parte2(sim, p, last_in_doc=(i % per_doc == per_doc - 1))
+
+
+@dataclass
+class Result:
+    mean_s: float
+    failures: int               # por esperas ajustáveis: precisa ser zero
+    max_latency: Dict[str, float]
+    runs: int
+    fixed_failures: Dict[str, int] = field(default_factory=dict)  # esperas constantes do código
+
+
+@dataclass
+class Part:
+    name: str
+    params: List[Param]
+    run_once: Callable[[Sim, Dict[str, float], int], None]
+    unit: str
+    current: Dict[str, float] = field(default_factory=dict)
+
+
+def _sim_values(part: Part, values: Dict[str, float]) -> Dict[str, float]:
+    return {prm.name: values[prm.name] * prm.scale for prm in part.params}
+
+
+def evaluate(part: Part, values: Dict[str, float], model: LatencyModel, runs: int,
+             seed: int, tracker: bool) -> Result:
+    """Mesma semente para todos os candidatos: comparações sem ruído de sorteio."""
+    rng = random.Random(seed)
+    p = _sim_values(part, values)
+    total = 0.0
+    failures = 0
+    fixed_failures: Dict[str, int] = {}
+    max_latency: Dict[str, float] = {}
+    for i in range(runs):
+        sim = Sim(rng, model, tracker)
+        try:
+            part.run_once(sim, p, i)
+        except _Failure as e:
+            if e.fixed:
+                fixed_failures[e.kind] = fixed_failures.get(e.kind, 0) + 1
+            else:
+                failures += 1
+        total += sim.elapsed
+        for kind, value in sim.max_latency.items():
+            max_latency[kind] = max(max_latency.get(kind, 0.0), value)
+    return Result(total / runs, failures, max_latency, runs, fixed_failures)
+
+
+def tune(part: Part, model: LatencyModel, args) -> Tuple[Optional[Dict[str, float]], Result, Result]:
+    """(melhor configuração, atual, confirmação); None = nenhuma configuração sem falhas."""
+    base = evaluate(part, part.current, model, args.runs, args.seed, not args.no_tracker)
+    log.info(f"[{part.name}] atual: {base.mean_s:.2f}s/{part.unit} | falhas {base.failures}/{base.runs}")
+    if base.fixed_failures:
+        log.warning(f"[{part.name}] esperas fixas do código estouradas (não ajustáveis aqui): {base.fixed_failures}")
+    best = dict(part.current)
+    best_res = base if base.failures == 0 else None
+    for sweep in range(args.sweeps):
+        changed = False
+        for prm in part.params:
+            if not prm.measured(model):
+                continue
+            for cand in prm.candidates:
+                trial = {**best, prm.name: cand}
+                res = evaluate(part, trial, model, args.runs, args.seed, not args.no_tracker)
+                if res.failures:
+                    continue
+                covered = max((res.max_latency.get(k, 0.0) for k in prm.timeout_kinds), default=0.0)
+                if cand * prm.scale < args.timeout_headroom * covered:
+                    continue
+                if best_res is None or res.mean_s < best_res.mean_s - 1e-9 or \
+                        (prm.timeout_kinds and res.mean_s <= best_res.mean_s + 1e-9 and cand < best[prm.name]):
+                    best, best_res, changed = trial, res, True
+        log.info(f"[{part.name}] varredura {sweep + 1}: "
+                 + (f"{best_res.mean_s:.2f}s/{part.unit}" if best_res else "nenhuma configuração sem falhas"))
+        if not changed:
+            break
+    if best_res is None:
+        return None, base, base
+    # Confirmação com outra semente e o dobro de repetições
+    check = evaluate(part, best, model, args.runs * 2, args.seed + 1, not args.no_tracker)
+    return best, base, check
+
+
+# --- perfis ---
+
+@contextmanager
+def _in_dir(path: str):
+    previous = os.getcwd()
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(previous)
+
+
+def _load_part_config(part_dir: str, module_name: str):
+    """
+    lib/config.py da parte, carregado sozinho (o pacote lib importa playwright) e com a
+    pasta da parte como diretório atual: o config.json lido é o mesmo da execução real.
+    """
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(part_dir, "lib", "config.py"))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _parte1_current() -> Dict[str, float]:
+    with _in_dir(PARTE1_DIR):
+        cfg = _load_part_config(PARTE1_DIR, "_parte1_config").Config()
+    return {prm.name: float(getattr(cfg, prm.name)) for prm in PARTE1_PARAMS}
+
+
+def _parte2_current() -> Dict[str, float]:
+    with _in_dir(PARTE2_DIR):
+        settings = _load_part_config(PARTE2_DIR, "_parte2_config").settings
+    return {prm.name: float(getattr(settings, prm.name)) for prm in PARTE2_PARAMS}
+
+
+def _as_json_value(prm: Param, value: float):
+    return int(value) if prm.name in ("ACTION_DELAY_MS", "DEFAULT_TIMEOUT") else round(value, 3)
+
+
+def write_profiles(tuned: Dict[str, Dict[str, float]], out_dir: str, apply: bool, report: dict):
+    """tuned: só os parâmetros ajustados de cada parte; os demais ficam como estão no config.json."""
+    os.makedirs(out_dir, exist_ok=True)
+    if tuned.get("parte1"):
+        path = os.path.join(PARTE1_DIR, "config.json")
+        data = _load_json(path)
+        for prm in PARTE1_PARAMS:
+            if prm.name in tuned["parte1"]:
+                data[prm.json_path] = _as_json_value(prm, tuned["parte1"][prm.name])
+        _write_json(os.path.join(out_dir, "parte1_config.json"), data)
+        if apply:
+            _write_json(path, data)
+            log.info(f"Perfil aplicado: {path}")
+    if tuned.get("parte2"):
+        path = os.path.join(PARTE2_DIR, "config.json")
+        data = copy.deepcopy(_load_json(path))
+        for prm in PARTE2_PARAMS:
+            if prm.name in tuned["parte2"]:
+                _jset(data, prm.json_path, _as_json_value(prm, tuned["parte2"][prm.name]))
+        _write_json(os.path.join(out_dir, "parte2_config.json"), data)
+        if apply:
+            _write_json(path, data)
+            log.info(f"Perfil aplicado: {path}")
+    _write_json(os.path.join(out_dir, "auto_tuner.json"), report)
+
+
+def _write_json(path: str, data: dict):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Ajuste offline das esperas (WebGUI simulado).")
+    parser.add_argument("--logs", action="append", default=[],
+                        help="Arquivo ou pasta de logs com latências gravadas (repetível); "
+                             "padrão: logs da Parte 2 e logs/orquestrador.")
+    parser.add_argument("--only", choices=("parte1", "parte2"), help="Ajusta só uma das partes.")
+    parser.add_argument("--runs", type=int, default=2000, help="Repetições do fluxo por candidato.")
+    parser.add_argument("--margin", type=float, default=1.25, help="Multiplicador das latências (folga).")
+    parser.add_argument("--timeout-headroom", type=float, default=2.0,
+                        help="Timeout mínimo = esse fator x a maior latência simulada.")
+    parser.add_argument("--records-per-doc", type=int, default=10, help="Parte 2: registros por DOC (Save no último).")
+    parser.add_argument("--sweeps", type=int, default=3, help="Varreduras da busca por coordenadas.")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--no-tracker", action="store_true", help="Simula REQUEST_TRACKER=0 (só pausas fixas).")
+    parser.add_argument("--apply", action="store_true", help="Grava o perfil no config.json de cada parte.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    sources = args.logs or [os.path.join(PARTE2_DIR, "logs"), os.path.join(ROOT, "logs", "orquestrador")]
+    samples = collect_latencies(sources)
+    model = LatencyModel(samples, margin=args.margin)
+    for kind in DEFAULT_LATENCY_MS:
+        log.info(f"Latência '{kind}': {model.source(kind)}")
+
+    per_doc = max(1, args.records_per_doc)
+    parts = [
+        Part("parte1", PARTE1_PARAMS, lambda sim, p, i: flow_parte1(sim, p), "storage", _parte1_current()),
+        Part("parte2", PARTE2_PARAMS, lambda sim, p, i: run_parte2(sim, p, i, per_doc),
+             "registro", _parte2_current()),
+    ]
+    tuned: Dict[str, Dict[str, float]] = {}
+    report = {"started_at": datetime.now().isoformat(timespec="seconds"), "args": vars(args),
+              "latency_sources": {k: model.source(k) for k in DEFAULT_LATENCY_MS}, "parts": {}}
+    for part in parts:
+        if args.only and part.name != args.only:
+            continue
+        untuned = [prm.name for prm in part.params if not prm.measured(model)]
+        if untuned:
+            log.warning(f"[{part.name}] sem amostras gravadas (não ajustados, ficam como estão): "
+                        + ", ".join(f"{prm.name} ({'/'.join(prm.kinds)})"
+                                    for prm in part.params if prm.name in untuned))
+        if len(untuned) == len(part.params):
+            report["parts"][part.name] = {"current": part.current, "tuned": {}, "untuned": untuned}
+            continue
+        best, base, check = tune(part, model, args)
+        if best is None or check.failures:
+            # Nada a gravar: o perfil manteria os valores atuais (inclusive os vindos do ambiente)
+            why = ("nenhuma configuração sem falhas" if best is None
+                   else f"confirmação com {check.failures}/{check.runs} falhas")
+            log.warning(f"[{part.name}] não ajustado ({why}); config.json fica como está.")
+            report["parts"][part.name] = {
+                "current": part.current, "tuned": {}, "untuned": [prm.name for prm in part.params],
+                "not_tuned_reason": why, "current_mean_s": round(base.mean_s, 3),
+                "current_failures": base.failures, "runs": base.runs,
+                "fixed_wait_failures": base.fixed_failures,
+            }
+            continue
+        if base.failures:
+            versus = f"atual tem {base.failures}/{base.runs} falhas"
+        else:
+            versus = f"{(1 - check.mean_s / base.mean_s) * 100 if base.mean_s else 0.0:+.0f}% vs atual"
+        best = {k: v for k, v in best.items() if k not in untuned}
+        log.info(f"[{part.name}] ajustado: {check.mean_s:.2f}s/{part.unit} ({versus}) | {best}")
+        tuned[part.name] = best
+        report["parts"][part.name] = {
+            "current": part.current, "tuned": best, "untuned": untuned,
+            "current_mean_s": round(base.mean_s, 3), "current_failures": base.failures,
+            "tuned_mean_s": round(check.mean_s, 3), "tuned_failures": check.failures, "runs": check.runs,
+            "fixed_wait_failures": check.fixed_failures,
+        }
+    out_dir = os.path.join(ROOT, "logs", "auto_tuner", datetime.now().strftime("%Y%m%d_%H%M%S"))
+    write_profiles(tuned, out_dir, args.apply, report)
+    log.info(f"Perfis em {out_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
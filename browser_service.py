@@ -0,0 +1,198 @@
+# browser_service.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\browser_service.py
+"""
+Serviço local de navegador compartilhado pela Parte 1 e pela Parte 2.
+Mantém um Chromium (perfil persistente) aberto com N abas já autenticadas
+na tela inicial do SAP WebGUI e expõe a porta CDP para as duas partes
+conectarem (comum/browser_client.py) e pegarem uma aba emprestada.
+Execuções seguidas deixam de abrir navegador e de esperar o login.
+
+  python browser_service.py                   # 2 abas, porta 9222
+  python browser_service.py --slots 3 --keepalive-min 5
+
+Nas partes: SAP_BROWSER_CDP=auto (lê o endpoint de <dir>/service.json)
+ou SAP_BROWSER_CDP=http://127.0.0.1:9222.
+Cada aba do pool é marcada com sessionStorage 'sapPoolSlot'; o empréstimo é
+exclusivo por arquivo de lease em <dir>/leases (pid do dono).
+Abas livres recebem /n a cada --keepalive-min minutos para a sessão SAP não expirar.
+"""
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+
+from playwright.sync_api import sync_playwright
+
+from comum.browser_client import DEFAULT_DIR, SLOT_KEY, STATE_FILE, TX_INPUT_ROLE, lease_path
+
+DEFAULT_URL = "http://rb3qraa0.server.bosch.com:8001/sap/bc/gui/sap/its/webgui/#"
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)-7s | browser_service | %(message)s")
+log = logging.getLogger("browser_service")
+
+
+def _tx(page):
+    return page.get_by_role(TX_INPUT_ROLE[0], name=TX_INPUT_ROLE[1])
+
+
+class BrowserService:
+    def __init__(self, args):
+        self.url = args.url
+        self.slots = max(1, args.slots)
+        self.port = args.port
+        self.headless = args.headless
+        self.dir = args.dir
+        self.profile_dir = args.profile_dir or os.path.join(self.dir, "profile")
+        self.login_timeout_ms = int(args.login_timeout_s * 1000)
+        self.keepalive_s = max(30.0, args.keepalive_min * 60)
+        self.context = None
+        self.pool = {}  # slot -> Page
+
+    # --- pool ---
+
+    def _mark(self, page, slot: int):
+        page.evaluate(f"(s) => sessionStorage.setItem({json.dumps(SLOT_KEY)}, String(s))", slot)
+
+    def _login(self, page, slot: int):
+        """Abre a URL base e espera o campo de transação (login/SSO pode ser manual na primeira vez)."""
+        log.info(f"Aba {slot}: acessando {self.url}")
+        page.goto(self.url, wait_until="domcontentloaded")
+        _tx(page).wait_for(state="visible", timeout=self.login_timeout_ms)
+        self._mark(page, slot)
+        log.info(f"Aba {slot}: pronta na tela inicial.")
+
+    def _open_slot(self, slot: int):
+        existing = [p for p in self.context.pages if p not in self.pool.values()]
+        page = existing[0] if existing and slot == 0 else self.context.new_page()
+        self._login(page, slot)
+        self.pool[slot] = page
+
+    def _keepalive(self, slot: int):
+        """/n na aba livre (ida e volta ao servidor); refaz o acesso se a sessão caiu."""
+        page = self.pool.get(slot)
+        if page is None or page.is_closed():
+            log.warning(f"Aba {slot} fechada; abrindo de novo.")
+            self._open_slot(slot)
+            return
+        try:
+            tx = _tx(page)
+            tx.fill("/n")
+            tx.press("Enter")
+            tx.wait_for(state="visible", timeout=15000)
+        except Exception as e:
+            log.warning(f"Aba {slot}: sessão não respondeu ({e}); acessando de novo.")
+            self._login(page, slot)
+
+    # --- leases ---
+
+    def _try_lease(self, slot: int) -> bool:
+        path = lease_path(slot, self.dir)
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return False  # em uso por uma das partes (ou órfão: o cliente reaproveita)
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+
+    def _release(self, slot: int):
+        try:
+            os.remove(lease_path(slot, self.dir))
+        except OSError:
+            pass
+
+    # --- ciclo de vida ---
+
+    def _write_state(self):
+        state = {
+            "endpoint": f"http://127.0.0.1:{self.port}",
+            "pid": os.getpid(),
+            "slots": self.slots,
+            "url": self.url,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        tmp = os.path.join(self.dir, STATE_FILE + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp, os.path.join(self.dir, STATE_FILE))
+
+    def _clear_state(self):
+        try:
+            os.remove(os.path.join(self.dir, STATE_FILE))
+        except OSError:
+            pass
+
+    def _idle(self, seconds: float) -> bool:
+        """Espera despachando eventos do navegador; False se o navegador foi fechado."""
+        end = time.time() + seconds
+        while time.time() < end:
+            pages = [p for p in self.pool.values() if not p.is_closed()]
+            if not pages:
+                return False
+            try:
+                pages[0].wait_for_timeout(min(5000, max(0.0, end - time.time()) * 1000))
+            except Exception:
+                return bool(self.context.pages)
+        return True
+
+    def serve(self) -> int:
+        os.makedirs(self.dir, exist_ok=True)
+        # Navegador novo: leases antigos não valem mais
+        shutil.rmtree(os.path.join(self.dir, "leases"), ignore_errors=True)
+        os.makedirs(os.path.join(self.dir, "leases"), exist_ok=True)
+
+        with sync_playwright() as pw:
+            log.info(f"Iniciando Chromium (perfil {self.profile_dir}, porta CDP {self.port}).")
+            self.context = pw.chromium.launch_persistent_context(
+                self.profile_dir,
+                headless=self.headless,
+                args=[f"--remote-debugging-port={self.port}"],
+            )
+            try:
+                for slot in range(self.slots):
+                    self._open_slot(slot)
+                self._write_state()
+                log.info(f"Serviço pronto: {self.slots} abas em http://127.0.0.1:{self.port} "
+                         f"(estado em {os.path.join(self.dir, STATE_FILE)}). Ctrl+C encerra.")
+                while self._idle(self.keepalive_s):
+                    for slot in range(self.slots):
+                        if not self._try_lease(slot):
+                            continue
+                        try:
+                            self._keepalive(slot)
+                        except Exception as e:
+                            log.error(f"Aba {slot}: falha no keepalive: {e}")
+                        finally:
+                            self._release(slot)
+                log.warning("Navegador fechado; encerrando serviço.")
+            except KeyboardInterrupt:
+                log.info("Encerrando serviço (Ctrl+C).")
+            finally:
+                self._clear_state()
+                try:
+                    self.context.close()
+                except Exception:
+                    pass
+        return 0
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Navegador SAP compartilhado (CDP) para Parte 1 e Parte 2.")
+    parser.add_argument("--url", default=os.getenv("SAP_BASE_URL", DEFAULT_URL), help="URL do SAP WebGUI.")
+    parser.add_argument("--slots", type=int, default=2, help="Abas autenticadas no pool (padrão 2: uma por parte).")
+    parser.add_argument("--port", type=int, default=9222, help="Porta CDP (remote debugging).")
+    parser.add_argument("--dir", default=os.getenv("SAP_BROWSER_DIR", DEFAULT_DIR),
+                        help="Pasta de estado (service.json, leases, perfil).")
+    parser.add_argument("--profile-dir", default="", help="Perfil do Chromium (padrão: <dir>/profile).")
+    parser.add_argument("--headless", action="store_true", help="Sem janela (login precisa ser automático/SSO).")
+    parser.add_argument("--login-timeout-s", type=float, default=300, help="Espera pelo campo de transação no login.")
+    parser.add_argument("--keepalive-min", type=float, default=10, help="Intervalo do /n nas abas livres.")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(BrowserService(_parse_args(sys.argv[1:])).serve())
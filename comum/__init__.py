@@ -0,0 +1,11 @@
+# __init__.py
+# comum/__init__.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\__init__.py
+"""
+Código compartilhado pela Parte 1 e pela Parte 2 (profiler, navegador, rede...).
+Os módulos daqui não leem configuração: recebem valores por parâmetro e o
+lib/ de cada parte faz a ponte com o seu Config/settings.
+Log em logging.getLogger("comum.<módulo>"); cada parte liga esse logger ao
+seu próprio log (lib/logger.py).
+O lib/__init__.py de cada parte coloca a raiz do repositório no sys.path.
+"""
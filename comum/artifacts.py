@@ -0,0 +1,171 @@
+# artifacts.py
+# comum/artifacts.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\artifacts.py
+"""
+Captura de evidências (screenshot, DOM, últimas linhas de log) só em caminhos de erro.
+Na thread principal fica apenas a captura em memória (page.screenshot() sem path,
+page.content()); gravação em disco, deduplicação e limpeza rodam numa thread própria.
+  - JPEG (padrão) ou PNG; recorte opcional (clip ou seletor)
+  - imagens/DOM idênticos a uma captura anterior não são gravados de novo
+  - cota em disco (max_mb): remove os arquivos mais antigos primeiro
+O serviço configurado de cada parte fica em lib/artifacts.py (get_artifacts).
+"""
+import hashlib
+import itertools
+import logging
+import os
+import queue
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger("comum.artifacts")
+
+_STOP = object()
+
+
+class ArtifactService:
+    def __init__(self, out_dir: str, max_mb: float, image_format: str = "jpeg", jpeg_quality: int = 70,
+                 full_page: bool = False, dom_snapshot: bool = True, log_lines: int = 200,
+                 recent_lines: Optional[Callable[[int], list]] = None):
+        self.out_dir = out_dir
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.image_format = "png" if image_format.lower() == "png" else "jpeg"
+        self.jpeg_quality = jpeg_quality
+        self.full_page = full_page
+        self.dom_snapshot = dom_snapshot
+        self.log_lines = log_lines
+        self.recent_lines = recent_lines  # últimas linhas do log da parte
+        self._queue: "queue.Queue" = queue.Queue()
+        self._seen: Dict[str, str] = {}  # hash -> arquivo já gravado
+        self._files: List[Tuple[float, str, int]] = []  # (mtime, caminho, bytes)
+        self._total = 0
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._seq = itertools.count(1)
+
+    # --- thread principal ---
+
+    def capture(self, page, prefix: str, clip: Optional[dict] = None, selector: Optional[str] = None) -> str:
+        """
+        Captura em memória e enfileira a gravação. Retorna o nome base dos arquivos.
+        clip: {"x", "y", "width", "height"}; selector: recorta no elemento.
+        """
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        base = f"{prefix}_{ts}_{next(self._seq):03d}"
+        items: List[Tuple[str, bytes]] = []
+        if page is not None:
+            image = self._screenshot(page, clip, selector)
+            if image is not None:
+                items.append((f"{base}.{'jpg' if self.image_format == 'jpeg' else 'png'}", image))
+            if self.dom_snapshot:
+                try:
+                    items.append((f"{base}.html", page.content().encode("utf-8")))
+                except Exception as e:
+                    log.debug(f"DOM não capturado: {e}")
+        if self.log_lines > 0 and self.recent_lines:
+            lines = self.recent_lines(self.log_lines)
+            if lines:
+                items.append((f"{base}.log", ("\n".join(lines) + "\n").encode("utf-8")))
+        if items:
+            self._ensure_worker()
+            self._queue.put(items)
+        return base
+
+    def _screenshot(self, page, clip: Optional[dict], selector: Optional[str]) -> Optional[bytes]:
+        opts = {"type": self.image_format}
+        if self.image_format == "jpeg":
+            opts["quality"] = self.jpeg_quality
+        try:
+            if selector:
+                return page.locator(selector).first.screenshot(**opts)
+            if clip:
+                opts["clip"] = clip
+            else:
+                opts["full_page"] = self.full_page
+            return page.screenshot(**opts)
+        except Exception as e:
+            log.error(f"Falha ao capturar screenshot: {e}")
+            return None
+
+    def flush(self, timeout_s: float = 10.0):
+        """Aguarda a gravação do que já foi enfileirado."""
+        if self._thread is None:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        if not done.wait(timeout_s):
+            log.warning("Gravação de evidências não terminou no tempo limite.")
+
+    def close(self):
+        if self._thread is None:
+            return
+        self.flush()
+        self._queue.put(_STOP)
+        self._thread.join(timeout=5)
+        self._thread = None
+
+    # --- thread de gravação ---
+
+    def _ensure_worker(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            os.makedirs(self.out_dir, exist_ok=True)
+            self._scan()
+            self._thread = threading.Thread(target=self._run, name="artifact-writer", daemon=True)
+            self._thread.start()
+
+    def _scan(self):
+        """Arquivos já existentes entram na conta da cota (execuções anteriores)."""
+        self._files = []
+        for name in os.listdir(self.out_dir):
+            path = os.path.join(self.out_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if os.path.isfile(path):
+                self._files.append((st.st_mtime, path, st.st_size))
+        self._files.sort()
+        self._total = sum(f[2] for f in self._files)
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is _STOP:
+                return
+            if isinstance(item, threading.Event):
+                item.set()
+                continue
+            for name, data in item:
+                try:
+                    self._write(name, data)
+                except Exception as e:
+                    log.error(f"Falha ao gravar evidência {name}: {e}")
+            self._evict()
+
+    def _write(self, name: str, data: bytes):
+        digest = hashlib.sha1(data).hexdigest()
+        kind = os.path.splitext(name)[1]
+        previous = self._seen.get(kind + digest)
+        if previous and os.path.isfile(previous):
+            log.info(f"Evidência {name} idêntica a {os.path.basename(previous)} (não gravada).")
+            return
+        path = os.path.join(self.out_dir, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        self._seen[kind + digest] = path
+        self._files.append((os.path.getmtime(path), path, len(data)))
+        self._total += len(data)
+        log.info(f"Evidência salva: {path}")
+
+    def _evict(self):
+        while self._total > self.max_bytes and len(self._files) > 1:
+            _, path, size = self._files.pop(0)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._total -= size
+            log.info(f"Cota de evidências: removido {os.path.basename(path)}")
@@ -0,0 +1,204 @@
+# browser_client.py
+# comum/browser_client.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\browser_client.py
+"""
+Cliente do serviço de navegador compartilhado (browser_service.py na raiz do projeto).
+Conecta via CDP ao Chromium já aberto e autenticado e pega emprestada uma aba
+do pool (marcada com sessionStorage 'sapPoolSlot'). O empréstimo é exclusivo
+por arquivo de lease (criação O_EXCL, conteúdo = pid); lease de processo morto
+é reaproveitado. Sem aba livre, abre uma aba nova no mesmo contexto (já logado).
+Na devolução a aba volta para a tela inicial (/n) e só a conexão CDP é
+encerrada - o navegador continua aberto para a próxima execução.
+SLOT_KEY, STATE_FILE, DEFAULT_DIR e lease_path valem também para o próprio
+browser_service.py (mesmo formato de estado dos dois lados).
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Optional
+
+log = logging.getLogger("comum.browser")
+
+SLOT_KEY = "sapPoolSlot"
+STATE_FILE = "service.json"
+DEFAULT_DIR = os.path.join(tempfile.gettempdir(), "sap_browser_service")
+TX_INPUT_ROLE = ("textbox", "Enter transaction code")
+_FRESH_LEASE_S = 5.0  # lease recém-criado ainda sem pid não é considerado órfão
+
+
+def service_dir() -> str:
+    return os.getenv("SAP_BROWSER_DIR", DEFAULT_DIR)
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid <= 0:
+        return False
+    if os.name == "nt":
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(0x1000, False, pid)  # PROCESS_QUERY_LIMITED_INFORMATION
+        if not handle:
+            return False
+        code = ctypes.c_ulong()
+        try:
+            kernel32.GetExitCodeProcess(handle, ctypes.byref(code))
+        finally:
+            kernel32.CloseHandle(handle)
+        return code.value == 259  # STILL_ACTIVE
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+def resolve_endpoint(value: str) -> Optional[str]:
+    """'' -> desligado; 'auto' -> endpoint do service.json (se o serviço está vivo); senão a própria URL."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    if value.lower() != "auto":
+        return value
+    path = os.path.join(service_dir(), STATE_FILE)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not _pid_alive(int(state.get("pid") or 0)):
+        return None
+    return state.get("endpoint")
+
+
+def lease_path(slot: int, base_dir: Optional[str] = None) -> str:
+    return os.path.join(base_dir or service_dir(), "leases", f"slot_{slot}.lock")
+
+
+def _lease_owner(path: str) -> Optional[int]:
+    """pid dono do lease; None se o arquivo sumiu."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            text = f.read().strip()
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return None
+    if not text:
+        return -1 if age < _FRESH_LEASE_S else 0
+    try:
+        return int(text)
+    except ValueError:
+        return 0
+
+
+def try_lease(slot: int) -> bool:
+    path = lease_path(slot)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            owner = _lease_owner(path)
+            if owner is None:
+                continue
+            if owner == -1 or _pid_alive(owner):
+                return False
+            log.info(f"Lease órfão da aba {slot} (pid {owner}); reaproveitando.")
+            try:
+                os.remove(path)
+            except OSError:
+                return False
+            continue
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def release_lease(slot: int):
+    try:
+        os.remove(lease_path(slot))
+    except OSError:
+        pass
+
+
+def is_ready(page) -> bool:
+    """Sessão autenticada: campo de transação visível."""
+    try:
+        role, name = TX_INPUT_ROLE
+        return page.get_by_role(role, name=name).first.is_visible()
+    except Exception:
+        return False
+
+
+def return_home(page, home_url: str, timeout_ms: int = 15000):
+    """Volta para a tela inicial (/n); se falhar, reabre a URL base."""
+    role, name = TX_INPUT_ROLE
+    tx = page.get_by_role(role, name=name).first
+    try:
+        tx.fill("/n")
+        tx.press("Enter")
+        tx.wait_for(state="visible", timeout=timeout_ms)
+    except Exception as e:
+        log.warning(f"/n não voltou à tela inicial ({e}); reabrindo {home_url}.")
+        page.goto(home_url, wait_until="domcontentloaded")
+        tx.wait_for(state="visible", timeout=timeout_ms)
+
+
+class BorrowedSession:
+    """Aba emprestada do serviço de navegador. close() devolve a aba (não fecha o navegador)."""
+
+    def __init__(self, playwright, endpoint: str, home_url: str, slow_mo: int = 0):
+        self.playwright = playwright
+        self.endpoint = endpoint
+        self.home_url = home_url
+        self.slow_mo = slow_mo
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.slot: Optional[int] = None
+
+    def acquire(self):
+        log.info(f"Conectando ao navegador compartilhado: {self.endpoint}")
+        self.browser = self.playwright.chromium.connect_over_cdp(self.endpoint, slow_mo=self.slow_mo)
+        contexts = self.browser.contexts
+        self.context = contexts[0] if contexts else self.browser.new_context()
+        for page in self.context.pages:
+            try:
+                slot = page.evaluate(f"() => sessionStorage.getItem({json.dumps(SLOT_KEY)})")
+            except Exception:
+                continue
+            if slot is None or not str(slot).isdigit():
+                continue
+            if try_lease(int(slot)):
+                self.slot = int(slot)
+                self.page = page
+                log.info(f"Aba {self.slot} do pool emprestada.")
+                return self.page
+        log.warning("Nenhuma aba livre no pool; abrindo aba nova no navegador compartilhado.")
+        self.page = self.context.new_page()
+        return self.page
+
+    def close(self):
+        try:
+            if self.page is not None and not self.page.is_closed():
+                if self.slot is not None:
+                    return_home(self.page, self.home_url)
+                    log.info(f"Aba {self.slot} devolvida na tela inicial.")
+                else:
+                    self.page.close()
+        except Exception as e:
+            log.warning(f"Falha ao devolver a aba: {e}")
+        finally:
+            if self.slot is not None:
+                release_lease(self.slot)
+            try:
+                if self.browser is not None:
+                    self.browser.close()  # conexão CDP: só desconecta
+            except Exception:
+                pass
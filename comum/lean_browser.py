@@ -0,0 +1,149 @@
+# lean_browser.py
+# comum/lean_browser.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\lean_browser.py
+"""
+Perfil enxuto do navegador para as execuções automáticas:
+  - animações/transições CSS zeradas (script de inicialização em todo frame)
+    e prefers-reduced-motion no contexto
+  - tipos de recurso não essenciais (imagem, fonte, mídia) abortados no
+    roteamento; URLs que casam com os padrões liberados passam
+  - a rota só casa URLs com extensão de arquivo dos tipos bloqueados: os round
+    trips do SAP nem passam pelo handler (no Playwright síncrono o handler só
+    roda quando a thread principal despacha eventos, o que atrasaria cada um)
+  - viewport pequeno; telas com tabela renderizam menos linhas visíveis
+  - flags do Chromium que cortam serviços de fundo (menos CPU/memória por sessão)
+Aba emprestada (SAP_BROWSER_CDP): só CSS e bloqueio, o navegador já foi aberto.
+O bloqueio é registrado depois do cache estático, então roda antes dele;
+o que não é bloqueado segue adiante (route.fallback()).
+Opt-in (LEAN_BROWSER=1, no lib/lean_browser.py de cada parte).
+Medição antes/depois: bench/browser_bench.py da Parte 2.
+"""
+import logging
+import re
+from typing import Dict, Iterable, List, Optional, Pattern
+
+log = logging.getLogger("comum.lean_browser")
+
+CHROMIUM_ARGS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-breakpad",
+    "--no-first-run",
+    "--mute-audio",
+    "--disable-smooth-scrolling",
+    "--force-device-scale-factor=1",
+    "--disable-features=Translate,MediaRouter,OptimizationHints,AutofillServerCommunication,CalculateNativeWinOcclusion",
+)
+
+# Extensões de arquivo por tipo de recurso (o que a rota casa)
+TYPE_EXTENSIONS: Dict[str, str] = {
+    "image": r"png|gif|jpe?g|svg|ico|bmp|webp|avif",
+    "font": r"woff2?|ttf|otf|eot",
+    "media": r"mp4|webm|ogg|ogv|mp3|wav|m4a|aac|mov",
+    "stylesheet": r"css",
+    "script": r"js",
+}
+
+# Duração mínima (não zero): animationend/transitionend continuam disparando
+_NO_MOTION_CSS = (
+    "*,*::before,*::after{"
+    "animation-duration:0.01ms!important;animation-delay:0s!important;animation-iteration-count:1!important;"
+    "transition-duration:0.01ms!important;transition-delay:0s!important;"
+    "scroll-behavior:auto!important;caret-color:transparent!important}"
+)
+
+_INIT_SCRIPT = """
+(() => {
+  const add = () => {
+    if (document.getElementById('__lean_no_motion')) return;
+    const style = document.createElement('style');
+    style.id = '__lean_no_motion';
+    style.textContent = %r;
+    (document.head || document.documentElement).appendChild(style);
+  };
+  if (document.documentElement) add();
+  document.addEventListener('DOMContentLoaded', add);
+})();
+""" % _NO_MOTION_CSS
+
+
+def split_list(text: str) -> List[str]:
+    """'image, font' -> ['image', 'font'] (vazios descartados)."""
+    return [part.strip() for part in (text or "").split(",") if part.strip()]
+
+
+def parse_viewport(text: str) -> Optional[Dict[str, int]]:
+    """'1024x640' -> {'width': 1024, 'height': 640}; vazio/inválido = None."""
+    m = re.fullmatch(r"\s*(\d+)\s*[xX]\s*(\d+)\s*", text or "")
+    if not m:
+        return None
+    return {"width": int(m.group(1)), "height": int(m.group(2))}
+
+
+def chromium_args(extra: str = "") -> List[str]:
+    return list(CHROMIUM_ARGS) + split_list(extra)
+
+
+def launch_options(extra_args: str = "") -> dict:
+    """Argumentos extras do chromium.launch."""
+    return {"args": chromium_args(extra_args)}
+
+
+def context_options(viewport: str = "") -> dict:
+    """Argumentos extras do browser.new_context ('' = viewport padrão do Playwright)."""
+    options = {"reduced_motion": "reduce", "device_scale_factor": 1}
+    size = parse_viewport(viewport)
+    if size:
+        options["viewport"] = size
+    return options
+
+
+def route_pattern(block_types: Iterable[str]) -> Optional[Pattern]:
+    """Regex das URLs com extensão dos tipos bloqueados; None se nenhum tipo for conhecido."""
+    extensions = [TYPE_EXTENSIONS[t] for t in block_types if t in TYPE_EXTENSIONS]
+    if not extensions:
+        return None
+    return re.compile(r"\.(%s)(\?[^#]*)?(#.*)?$" % "|".join(extensions), re.I)
+
+
+class ResourceBlocker:
+    def __init__(self, block_types: Iterable[str], allow: Iterable[str] = ()):
+        self.block_types = frozenset(t.lower() for t in block_types)
+        self._allow = [re.compile(p, re.I) for p in allow]
+        self.blocked = 0
+
+    def handle(self, route):
+        request = route.request
+        if request.resource_type in self.block_types and not any(p.search(request.url) for p in self._allow):
+            self.blocked += 1
+            route.abort("blockedbyclient")
+            return
+        route.fallback()
+
+    def close(self):
+        if self.blocked:
+            log.info(f"Navegador enxuto: {self.blocked} recursos bloqueados ({', '.join(sorted(self.block_types))}).")
+
+
+def install_lean_page(page, block_types: Iterable[str], allow: Iterable[str] = ()) -> Optional[ResourceBlocker]:
+    """CSS sem animação + bloqueio dos tipos de recurso na página; None se falhar."""
+    block_types = [t.lower() for t in block_types]
+    allow = list(allow)
+    unknown = [t for t in block_types if t not in TYPE_EXTENSIONS]
+    if unknown:
+        log.warning(f"Navegador enxuto: tipos sem extensão conhecida não são bloqueados: {', '.join(unknown)}.")
+    try:
+        page.add_init_script(_INIT_SCRIPT)
+        blocker = ResourceBlocker([t for t in block_types if t in TYPE_EXTENSIONS], allow)
+        pattern = route_pattern(blocker.block_types)
+        if pattern:
+            page.route(pattern, blocker.handle)
+    except Exception as e:
+        log.warning(f"Navegador enxuto indisponível: {e}")
+        return None
+    log.info(f"Navegador enxuto ativo (bloqueia: {', '.join(sorted(blocker.block_types)) or 'nada'}; "
+             f"liberados: {', '.join(allow) or 'nenhum'}).")
+    return blocker
@@ -0,0 +1,191 @@
+# memory_monitor.py
+# comum/memory_monitor.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\memory_monitor.py
+"""
+Memória em execuções longas (centenas de storages / milhares de registros na
+mesma página/Chromium). Amostra a cada every_n itens, entre um item e outro
+(na Parte 2, numa fronteira de DOC):
+  - Python: RSS do processo (psutil, opcional) e heap do tracemalloc
+    (use_tracemalloc; tem custo, fica desligado por padrão)
+  - navegador: RSS somado dos processos do Chromium filhos deste processo
+    (psutil) e heap JS da página (CDP Performance.getMetrics)
+Cada amostra vira uma linha em <out_dir>/memory_<label>_<data_hora>.jsonl.
+Reciclagem (MemoryGuard): depois de every_n itens, ou com o navegador acima
+de browser_rss_mb / heap JS acima de js_heap_mb, o chamador troca
+página/contexto/navegador (nova sessão pronta antes de fechar a antiga) e
+segue no próximo item. Falha ao reciclar não derruba a execução: continua
+na sessão antiga.
+Opt-in (MEMORY_MONITOR=1, no lib/memory_monitor.py de cada parte).
+"""
+import gc
+import json
+import logging
+import os
+import re
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, Optional
+from playwright.sync_api import Page
+
+log = logging.getLogger("comum.memory_monitor")
+
+_MB = 1024 * 1024
+_BROWSER_PROCESS = re.compile(r"chrom|headless_shell|msedge", re.I)
+
+
+def _psutil():
+    try:
+        import psutil
+        return psutil
+    except ImportError:
+        return None
+
+
+def process_rss_mb() -> Optional[float]:
+    psutil = _psutil()
+    if psutil is None:
+        return None
+    return round(psutil.Process().memory_info().rss / _MB, 1)
+
+
+def browser_rss_mb() -> Optional[float]:
+    """RSS somado do Chromium aberto por este processo (aba emprestada não entra)."""
+    psutil = _psutil()
+    if psutil is None:
+        return None
+    total = 0
+    for proc in psutil.Process().children(recursive=True):
+        try:
+            if _BROWSER_PROCESS.search(proc.name()):
+                total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return round(total / _MB, 1)
+
+
+def js_heap_mb(page: Page) -> Dict[str, Optional[float]]:
+    try:
+        cdp = page.context.new_cdp_session(page)
+        try:
+            cdp.send("Performance.enable")
+            metrics = {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
+        finally:
+            cdp.detach()
+    except Exception:
+        return {"js_heap_mb": None, "js_heap_total_mb": None}
+    return {"js_heap_mb": round(metrics.get("JSHeapUsedSize", 0) / _MB, 1),
+            "js_heap_total_mb": round(metrics.get("JSHeapTotalSize", 0) / _MB, 1)}
+
+
+class MemoryMonitor:
+    def __init__(self, label: str, every_n: int, out_dir: str, use_tracemalloc: bool = False):
+        self.label = label
+        self.every_n = max(1, every_n)
+        self.path = os.path.join(out_dir, f"memory_{label}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.jsonl")
+        self.use_tracemalloc = use_tracemalloc
+        self.last: Dict[str, object] = {}
+        self._t0 = time.perf_counter()
+        self._last_idx = 0
+        os.makedirs(out_dir, exist_ok=True)
+        if use_tracemalloc and not tracemalloc.is_tracing():
+            tracemalloc.start(1)  # 1 frame: custo mínimo, só o total interessa aqui
+        if _psutil() is None:
+            log.info("psutil não instalado: RSS não amostrado (só heap JS/tracemalloc).")
+
+    def due(self, idx: int) -> bool:
+        return idx - self._last_idx >= self.every_n
+
+    def sample(self, idx: int, page: Optional[Page], event: str = "amostra") -> Dict[str, object]:
+        self._last_idx = idx
+        row: Dict[str, object] = {
+            "ts": datetime.now().isoformat(timespec="seconds"),
+            "elapsed_s": round(time.perf_counter() - self._t0, 1),
+            "idx": idx,
+            "event": event,
+            "py_rss_mb": process_rss_mb(),
+            "browser_rss_mb": browser_rss_mb(),
+        }
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            row["py_heap_mb"] = round(current / _MB, 1)
+            row["py_heap_peak_mb"] = round(peak / _MB, 1)
+        if page is not None:
+            row.update(js_heap_mb(page))
+        self.last = row
+        try:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        except OSError as e:
+            log.debug(f"Amostra de memória não gravada: {e}")
+        return row
+
+    def close(self):
+        if self.last:
+            log.info(f"Memória ({self.last['idx']} itens): Python RSS {self.last.get('py_rss_mb')} MB, "
+                     f"navegador {self.last.get('browser_rss_mb')} MB, heap JS {self.last.get('js_heap_mb')} MB "
+                     f"-> {self.path}")
+        if self.use_tracemalloc and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class MemoryGuard:
+    """
+    checkpoint(page, idx) entre um item e outro: amostra quando devido e, se a
+    política pedir, chama restart() (nova página pronta) e devolve a página a usar.
+    """
+
+    def __init__(self, monitor: MemoryMonitor, restart: Optional[Callable[[], Page]],
+                 every_n: int = 0, browser_rss_mb: float = 0, js_heap_mb: float = 0):
+        self.monitor = monitor
+        self.restart = restart
+        self.every_n = every_n
+        self.browser_rss_mb = browser_rss_mb
+        self.js_heap_mb = js_heap_mb
+        self.recycles = 0
+        self._since = 0  # idx da última reciclagem
+
+    def _reason(self, idx: int, row: Optional[Dict[str, object]]) -> Optional[str]:
+        if self.every_n and idx - self._since >= self.every_n:
+            return f"{idx - self._since} itens desde a última sessão"
+        if row is None:
+            return None
+        rss, heap = row.get("browser_rss_mb"), row.get("js_heap_mb")
+        if self.browser_rss_mb and rss and rss > self.browser_rss_mb:
+            return f"navegador com {rss} MB (limite {self.browser_rss_mb:g})"
+        if self.js_heap_mb and heap and heap > self.js_heap_mb:
+            return f"heap JS com {heap} MB (limite {self.js_heap_mb:g})"
+        return None
+
+    def checkpoint(self, page: Page, idx: int) -> Page:
+        row = self.monitor.sample(idx, page) if self.monitor.due(idx) else None
+        reason = self._reason(idx, row) if self.restart else None
+        if not reason:
+            return page
+        log.info(f"Reciclando navegador após item {idx}: {reason}.")
+        start = time.perf_counter()
+        try:
+            new_page = self.restart()
+        except Exception as e:
+            # Sessão antiga continua válida; nova tentativa só após outro ciclo completo
+            log.error(f"Reciclagem falhou ({e}); seguindo na sessão atual.")
+            self._since = idx
+            return page
+        self._since = idx
+        self.recycles += 1
+        gc.collect()
+        log.info(f"Navegador reciclado em {time.perf_counter() - start:.1f}s (reciclagem {self.recycles}).")
+        self.monitor.sample(idx, new_page, event="reciclado")
+        return new_page
+
+    def close(self):
+        self.monitor.close()
+
+
+
+def open_memory_guard(restart: Optional[Callable[[], Page]], label: str, sample_every_n: int, out_dir: str,
+                      use_tracemalloc: bool = False, recycle_every_n: int = 0,
+                      recycle_browser_rss_mb: float = 0, recycle_js_heap_mb: float = 0) -> MemoryGuard:
+    """Amostragem em out_dir + reciclagem (restart=None: só amostra, ex.: aba emprestada)."""
+    monitor = MemoryMonitor(label, sample_every_n, out_dir, use_tracemalloc)
+    return MemoryGuard(monitor, restart, recycle_every_n, recycle_browser_rss_mb, recycle_js_heap_mb)
@@ -0,0 +1,132 @@
+# navigation.py
+# comum/navigation.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\navigation.py
+"""
+Navegação por OK-code: '/n<tcode>' no campo de transação troca de transação a
+partir de qualquer tela num único round trip (sem Cancel/Exit/Yes), e '/n'
+volta para a tela inicial. Cada salto confere a chegada (campo típico da
+tela de destino) e devolve False para o chamador usar o caminho antigo.
+Deep link: a sessão pode abrir direto numa transação pela URL do WebGUI
+(?~transaction=<tcode>); o primeiro goto_transaction para ela não repete o salto.
+Cada parte monta um Navigator com as suas telas de destino, tempos e, se
+quiser, a checagem da barra de status (lib/navigation.py).
+"""
+import logging
+import re
+import time
+import weakref
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import quote
+from playwright.sync_api import Page
+from .browser_client import TX_INPUT_ROLE
+from .request_tracker import begin_action, end_action
+
+log = logging.getLogger("comum.nav")
+
+# Antes do OK-code: devolve a checagem chamada depois dele (levanta se o SAP recusou)
+StatusGuard = Callable[[Page], Optional[Callable[[str], None]]]
+
+
+def visible(locator) -> bool:
+    try:
+        return locator.count() > 0 and locator.first.is_visible()
+    except Exception:
+        return False
+
+
+def tx_field(page: Page):
+    role, name = TX_INPUT_ROLE
+    return page.get_by_role(role, name=name)
+
+
+def title_matches(page: Page, pattern: str) -> bool:
+    try:
+        return re.search(pattern, page.title() or "", re.I) is not None
+    except Exception:
+        return False
+
+
+def _at_home(page: Page) -> bool:
+    return visible(tx_field(page)) and title_matches(page, r"Easy Access")
+
+
+_LANDED: "weakref.WeakKeyDictionary[Page, str]" = weakref.WeakKeyDictionary()
+
+
+def deep_link_url(base_url: str, tcode: str) -> str:
+    """URL do WebGUI que abre direto na transação (?~transaction=)."""
+    base = base_url.split("#", 1)[0].rstrip("/")
+    sep = "&" if "?" in base else "?"
+    return f"{base}{sep}~transaction={quote(tcode.upper())}"
+
+
+def mark_landed(page: Page, tcode: str):
+    """A página foi aberta pelo deep link direto nessa transação."""
+    _LANDED[page] = tcode.upper()
+
+
+class Navigator:
+    def __init__(self, arrivals: Dict[str, Callable[[Page], bool]], timeout_ms: int = 20000,
+                 poll_ms: int = 100, status_guard: Optional[StatusGuard] = None,
+                 fatal: Tuple[type, ...] = ()):
+        # Tela de destino de cada transação (conferência de chegada); '' = tela inicial
+        self.arrivals = {"": _at_home, **{k.upper(): v for k, v in arrivals.items()}}
+        self.timeout_ms = timeout_ms
+        self.poll_ms = max(10, poll_ms)
+        self.status_guard = status_guard
+        self.fatal = fatal  # exceções que goto_transaction repassa (recusa do SAP)
+
+    def _arrival(self, tcode: str) -> Callable[[Page], bool]:
+        # Transação sem conferência específica: basta o campo de transação responder
+        return self.arrivals.get(tcode.upper(), lambda page: visible(tx_field(page)))
+
+    def wait_arrival(self, page: Page, tcode: str, timeout_ms: Optional[int] = None) -> bool:
+        arrived = self._arrival(tcode)
+        end = time.time() + (timeout_ms or self.timeout_ms) / 1000.0
+        while True:
+            if arrived(page):
+                return True
+            if time.time() >= end:
+                return False
+            page.wait_for_timeout(self.poll_ms)
+
+    def ok_code(self, page: Page, code: str, tcode: str, timeout_ms: Optional[int] = None) -> bool:
+        """Envia o OK-code e confere a chegada em tcode ('' = tela inicial)."""
+        tx = tx_field(page)
+        if not visible(tx):
+            log.debug(f"Campo de transação indisponível para '{code}'.")
+            return False
+        check = self.status_guard(page) if self.status_guard else None
+        action = begin_action(page)
+        tx.first.fill(code)
+        tx.first.press("Enter")
+        end_action(page, action, f"OK-code {code}")
+        if check:
+            check(f"OK-code {code}")
+        if self.wait_arrival(page, tcode, timeout_ms):
+            log.info(f"OK-code {code}: {'tela inicial' if not tcode else tcode} confirmada.")
+            return True
+        log.warning(f"OK-code {code}: chegada em {'tela inicial' if not tcode else tcode} não confirmada.")
+        return False
+
+    def goto_transaction(self, page: Page, tcode: str, timeout_ms: Optional[int] = None) -> bool:
+        """'/n<tcode>' de qualquer tela. True se a tela de destino foi confirmada."""
+        tcode = tcode.upper()
+        if _LANDED.pop(page, None) == tcode and self._arrival(tcode)(page):
+            log.info(f"Sessão aberta direto em {tcode} (deep link); salto dispensado.")
+            return True
+        try:
+            return self.ok_code(page, f"/n{tcode}", tcode, timeout_ms)
+        except self.fatal:
+            raise
+        except Exception as e:
+            log.warning(f"OK-code /n{tcode} falhou: {e}")
+            return False
+
+    def go_home(self, page: Page, timeout_ms: Optional[int] = None) -> bool:
+        _LANDED.pop(page, None)
+        try:
+            return self.ok_code(page, "/n", "", timeout_ms)
+        except Exception as e:
+            log.warning(f"OK-code /n falhou: {e}")
+            return False
@@ -0,0 +1,171 @@
+# profiling.py
+# comum/profiling.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\profiling.py
+"""
+Profiler opcional (cProfile) para execuções lentas, usado pelas duas partes.
+Modos:
+  off    - desligado (padrão)
+  run    - perfila a execução inteira (RunProfiler.run)
+  record - perfila só 1 a cada N chamadas de RunProfiler.sample
+Gera .prof (abrir com snakeviz / pstats) e um resumo top-N no log e em
+<arquivo>_top.txt, ambos em out_dir.
+O resumo separa CPU do Python (process_time) do tempo bloqueado (parede - CPU)
+e agrupa o tempo próprio por origem: navegador (Playwright/greenlet/event loop),
+pausas fixas (time.sleep), pandas/numpy, regex, logging, código do projeto.
+Só a thread que chamou run()/sample() é perfilada.
+A configuração (PROFILE_*) fica no lib/profiling.py de cada parte.
+"""
+import cProfile
+import io
+import logging
+import os
+import pstats
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+log = logging.getLogger("comum.profiling")
+
+MODES = ("off", "run", "record")
+
+# (bucket, trechos do arquivo/nome da função) - primeira regra que casar vence
+_BUCKETS: List[Tuple[str, Tuple[str, ...]]] = [
+    ("navegador", ("playwright", "greenlet", "asyncio", "selectors", "select.", "_overlapped",
+                   "getqueuedcompletionstatus", "_winapi", "pyee")),
+    ("sleep", ("time.sleep",)),
+    ("pandas/numpy", ("pandas", "numpy", "openpyxl")),
+    ("regex", ("re.py", "re/__init__", "'re.", "_sre", "sre_", "re/_")),
+    ("logging", ("logging",)),
+]
+# raiz do repositório: as duas partes e comum/
+_PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__))).lower().replace("\\", "/")
+
+
+def _bucket(func: Tuple[str, int, str]) -> str:
+    filename, _, name = func
+    text = f"{filename} {name}".lower().replace("\\", "/")
+    for bucket, needles in _BUCKETS:
+        if any(n in text for n in needles):
+            return bucket
+    if text.startswith(_PROJECT_DIR):
+        return "projeto"
+    return "outros"
+
+
+def summarize(stats: pstats.Stats, wall_s: float, cpu_s: float, top: int) -> str:
+    """Texto do resumo: CPU x bloqueado, tempo próprio por origem e top-N funções."""
+    per_bucket: Dict[str, float] = {}
+    for func, (_, _, tottime, _, _) in stats.stats.items():
+        b = _bucket(func)
+        per_bucket[b] = per_bucket.get(b, 0.0) + tottime
+    lines = [
+        f"Parede={wall_s:.2f}s | CPU do processo={cpu_s:.2f}s | Bloqueado (navegador/sleep/IO)={max(0.0, wall_s - cpu_s):.2f}s",
+        "Tempo próprio por origem:",
+    ]
+    for b, t in sorted(per_bucket.items(), key=lambda kv: kv[1], reverse=True):
+        pct = (t / wall_s * 100) if wall_s else 0.0
+        lines.append(f"  {b:<14}{t:>9.2f}s {pct:>5.1f}%")
+    buf = io.StringIO()
+    stats.stream = buf
+    stats.sort_stats("tottime").print_stats(top)
+    lines.append(f"Top {top} funções (tempo próprio):")
+    lines.extend(l for l in buf.getvalue().splitlines() if l.strip())
+    return "\n".join(lines)
+
+
+class _Window:
+    """Janela perfilada: cProfile + relógio de parede + CPU do processo."""
+
+    def __init__(self):
+        self.prof = cProfile.Profile()
+        self.wall = self.cpu = 0.0
+        self._wall0, self._cpu0 = time.perf_counter(), time.process_time()
+        self.prof.enable()
+
+    def stop(self):
+        self.prof.disable()
+        self.wall = time.perf_counter() - self._wall0
+        self.cpu = time.process_time() - self._cpu0
+
+
+class RunProfiler:
+    def __init__(self, mode: str, every_n: int, top: int, out_dir: str):
+        self.mode = mode if mode in MODES else "off"
+        self.every_n = max(1, every_n)
+        self.top = top
+        self.out_dir = out_dir
+        self._samples: Optional[pstats.Stats] = None
+        self._sample_wall = 0.0
+        self._sample_cpu = 0.0
+        self._sample_count = 0
+        if mode not in MODES:
+            log.warning(f"PROFILE_MODE inválido '{mode}' (use {', '.join(MODES)}). Profiler desligado.")
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def _path(self, label: str) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return os.path.join(self.out_dir, f"profile_{label}_{ts}")
+
+    def _write(self, label: str, stats: pstats.Stats, wall_s: float, cpu_s: float):
+        base = self._path(label)
+        stats.dump_stats(base + ".prof")
+        text = summarize(stats, wall_s, cpu_s, self.top)
+        with open(base + "_top.txt", "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        log.info(f"[PROFILE] {label}: {base}.prof")
+        for line in text.splitlines():
+            log.info(f"[PROFILE] {line}")
+
+    @contextmanager
+    def run(self, label: str):
+        """Execução inteira (modo run); no modo record grava o agregado das amostras ao final."""
+        if self.mode != "run":
+            try:
+                yield
+            finally:
+                if self.mode == "record":
+                    self.flush(label)
+            return
+        log.info(f"[PROFILE] Perfilando execução inteira ({label}).")
+        window = _Window()
+        try:
+            yield
+        finally:
+            # Grava mesmo se a execução falhar (execuções lentas que caem são o caso típico)
+            window.stop()
+            self._write(label, pstats.Stats(window.prof), window.wall, window.cpu)
+
+    @contextmanager
+    def sample(self, idx: int, label: str = "registro"):
+        """Perfila a chamada idx se for múltiplo de PROFILE_EVERY_N (modo record)."""
+        if self.mode != "record" or (idx - 1) % self.every_n != 0:
+            yield
+            return
+        window = _Window()
+        try:
+            yield
+        finally:
+            window.stop()
+            stats = pstats.Stats(window.prof)
+            if self._samples is None:
+                self._samples = stats
+            else:
+                self._samples.add(stats)
+            self._sample_wall += window.wall
+            self._sample_cpu += window.cpu
+            self._sample_count += 1
+            window.prof.dump_stats(self._path(f"{label}_{idx}") + ".prof")
+
+    def flush(self, label: str):
+        if self._samples is None:
+            return
+        log.info(f"[PROFILE] {self._sample_count} amostras (1 a cada {self.every_n}).")
+        self._write(f"{label}_amostras", self._samples, self._sample_wall, self._sample_cpu)
+        self._samples = None
+        self._sample_wall = self._sample_cpu = 0.0
+        self._sample_count = 0
@@ -0,0 +1,148 @@
+# request_tracker.py
+# comum/request_tracker.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\request_tracker.py
+"""
+Rastreador de round trips do WebGUI (ITS) em andamento.
+Escuta request / requestfinished / requestfailed da página e conta só as
+requisições do WebGUI (document/xhr/fetch cuja URL contém o caminho do ITS).
+"Ação concluída" = a ação disparou um round trip, nenhum está pendente há
+quiet_ms e o navegador já pintou o DOM atualizado (2 requestAnimationFrame).
+Ação sem round trip dentro de start_ms é tratada como local (nada a esperar).
+Requisição pendente há mais de _STALE_MS (long polling) sai da contagem e do registro.
+Cada parte liga o rastreador com a sua configuração (lib/request_tracker.py,
+REQUEST_TRACKER=1); sem rastreador, os chamadores mantêm o comportamento antigo.
+"""
+import logging
+import time
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from playwright.sync_api import Page
+
+log = logging.getLogger("comum.requests")
+
+_TRACKED_TYPES = ("document", "xhr", "fetch")
+_STALE_MS = 30000  # requisição pendente há mais tempo (long polling) não segura a espera
+
+_FRAMES_JS = """
+() => new Promise(resolve => {
+  const t = setTimeout(resolve, 100);  // aba em segundo plano: rAF pode não disparar
+  requestAnimationFrame(() => requestAnimationFrame(() => { clearTimeout(t); resolve(); }));
+})
+"""
+
+
+class RequestTracker:
+    def __init__(self, page: Page, url_marker: str, start_ms: int = 300, quiet_ms: int = 80,
+                 timeout_ms: int = 90000, log_done: bool = True):
+        self.page = page
+        self.url_marker = url_marker
+        self.start_ms = start_ms
+        self.quiet_ms = quiet_ms
+        self.timeout_ms = timeout_ms
+        self.log_done = log_done  # loga cada ação concluída (com action_desc)
+        self._inflight: Dict[object, float] = {}
+        self._started = 0
+        self._last_change = time.monotonic()
+
+    def start(self):
+        self.page.on("request", self._on_request)
+        self.page.on("requestfinished", self._on_done)
+        self.page.on("requestfailed", self._on_done)
+        return self
+
+    def _on_request(self, request):
+        try:
+            if request.resource_type not in _TRACKED_TYPES or self.url_marker not in request.url:
+                return
+        except Exception:
+            return
+        now = time.monotonic()
+        self._inflight[request] = now
+        self._started += 1
+        self._last_change = now
+
+    def _on_done(self, request):
+        if self._inflight.pop(request, None) is not None:
+            self._last_change = time.monotonic()
+
+    # --- consulta ---
+
+    def mark(self) -> int:
+        """Marcador de antes da ação (requisições iniciadas até agora)."""
+        return self._started
+
+    def pending(self) -> int:
+        """Round trips pendentes; os antigos demais (sem requestfinished) são descartados aqui."""
+        limit = time.monotonic() - _STALE_MS / 1000.0
+        for request in [r for r, t in self._inflight.items() if t < limit]:
+            del self._inflight[request]
+        return len(self._inflight)
+
+    def settle(self, since: Optional[int] = None, timeout_ms: Optional[int] = None, action_desc: str = "") -> bool:
+        """
+        Espera o round trip da ação (since = mark() de antes dela) terminar e o DOM ser aplicado.
+        since=None: só espera não haver round trip pendente.
+        Retorna False no timeout (requisição ainda pendente).
+        """
+        timeout_ms = timeout_ms or self.timeout_ms
+        t0 = time.monotonic()
+        end = t0 + timeout_ms / 1000.0
+        start_deadline = t0 + self.start_ms / 1000.0
+        quiet_s = self.quiet_ms / 1000.0
+        poll_ms = max(10, min(50, self.quiet_ms // 2))
+        while True:
+            now = time.monotonic()
+            if since is not None and self._started == since:
+                if now >= start_deadline:
+                    break  # ação local, sem round trip
+            elif self.pending() == 0 and now - self._last_change >= quiet_s:
+                break
+            if now >= end:
+                log.warning(f"Round trip não concluído em {timeout_ms}ms "
+                            f"({self.pending()} pendente(s)){': ' + action_desc if action_desc else ''}")
+                return False
+            self.page.wait_for_timeout(poll_ms)  # despacha os eventos de rede
+        try:
+            self.page.evaluate(_FRAMES_JS)
+        except Exception:
+            pass  # navegação em andamento: contexto de execução trocado
+        if self.log_done and action_desc:
+            log.info(f"OK: {action_desc} ({(time.monotonic() - t0) * 1000:.0f}ms)")
+        return True
+
+
+_TRACKERS: "weakref.WeakKeyDictionary[Page, RequestTracker]" = weakref.WeakKeyDictionary()
+
+
+def attach_tracker(page: Page, base_url: str, start_ms: int = 300, quiet_ms: int = 80,
+                   timeout_ms: int = 90000, log_done: bool = True) -> Optional[RequestTracker]:
+    """Liga o rastreador à página (URL do ITS tirada de base_url). None se não for possível."""
+    marker = urlparse(base_url).path.rstrip("/") or "/sap/bc/gui/sap/its"
+    try:
+        tracker = RequestTracker(page, marker, start_ms, quiet_ms, timeout_ms, log_done).start()
+    except Exception as e:
+        log.warning(f"Rastreador de requisições indisponível: {e}")
+        return None
+    _TRACKERS[page] = tracker
+    return tracker
+
+
+def get_request_tracker(page: Page) -> Optional[RequestTracker]:
+    try:
+        return _TRACKERS.get(page)
+    except TypeError:
+        return None
+
+
+def begin_action(page: Page) -> Optional[int]:
+    tracker = get_request_tracker(page)
+    return tracker.mark() if tracker else None
+
+
+def end_action(page: Page, mark: Optional[int], action_desc: str = "", timeout_ms: Optional[int] = None) -> bool:
+    """True se o rastreador confirmou o fim da ação; False sem rastreador ou no timeout."""
+    tracker = get_request_tracker(page)
+    if tracker is None or mark is None:
+        return False
+    return tracker.settle(mark, timeout_ms=timeout_ms, action_desc=action_desc)
@@ -0,0 +1,275 @@
+# static_cache.py
+# comum/static_cache.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\comum\static_cache.py
+"""
+Cache em disco dos recursos estáticos do WebGUI (JS, CSS, temas, imagens, fontes),
+servido por roteamento (page.route) - cada contexto novo deixa de baixar tudo de novo.
+  - a rota só casa URLs de arquivo estático (.js/.css/imagens/fontes): os round
+    trips do SAP nem passam pelo handler (no Playwright síncrono o handler só
+    roda quando a thread principal despacha eventos, o que atrasaria cada um)
+  - só GET de script/stylesheet/image/font com resposta 200 sem no-store
+  - fresco (max-age/Expires, ou default_ttl_s sem cabeçalho): servido do disco
+  - vencido com ETag/Last-Modified: revalida (If-None-Match / If-Modified-Since);
+    304 renova e serve do disco, 200 substitui
+  - cota max_mb: remove os menos usados primeiro
+  - versão: version + cabeçalho 'server' do documento do WebGUI;
+    se mudar, o cache inteiro é descartado
+  - várias execuções na mesma pasta (linhas de lançamento em paralelo): arquivos
+    e índice gravados em temporário + os.replace; ao gravar, o índice junta as
+    entradas que outra execução gravou no disco
+Opt-in (STATIC_CACHE=1, no lib/static_cache.py de cada parte).
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+log = logging.getLogger("comum.static_cache")
+
+# URLs roteadas: só arquivos estáticos (o resto nem chega ao handler)
+STATIC_URL = re.compile(r"\.(js|css|png|gif|jpe?g|svg|ico|bmp|woff2?|ttf|otf|eot)(\?[^#]*)?(#.*)?$", re.I)
+_STATIC_TYPES = ("script", "stylesheet", "image", "font")
+_DROP_HEADERS = ("content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie")
+_INDEX_FILE = "index.json"
+_SAVE_EVERY = 25  # grava o índice a cada N alterações (e no close)
+
+
+def _freshness_s(headers: Dict[str, str], default_ttl: float) -> Optional[float]:
+    """Segundos de validade pela resposta; None = não armazenar (no-store)."""
+    cc = headers.get("cache-control", "").lower()
+    if "no-store" in cc:
+        return None
+    if "no-cache" in cc:
+        return 0.0
+    m = re.search(r"max-age=(\d+)", cc)
+    if m:
+        return float(m.group(1))
+    if headers.get("expires"):
+        try:
+            return max(0.0, parsedate_to_datetime(headers["expires"]).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+    return default_ttl
+
+
+class StaticCache:
+    def __init__(self, cache_dir: str, max_mb: float, default_ttl_s: float, version: str = "", host: str = ""):
+        self.dir = cache_dir
+        self.host = host
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.default_ttl_s = default_ttl_s
+        self.version = version
+        self.hits = self.revalidated = self.misses = 0
+        self._dirty = 0
+        self._server_checked = False
+        os.makedirs(self.dir, exist_ok=True)
+        self._index = self._load_index()
+
+    # --- índice ---
+
+    def _read_index(self) -> dict:
+        try:
+            with open(os.path.join(self.dir, _INDEX_FILE), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _load_index(self) -> dict:
+        index = self._read_index()
+        if index.get("version") != self.version:
+            if index:
+                log.info("Versão configurada do cache mudou; descartando recursos estáticos.")
+            self._wipe(index)
+            index = {"version": self.version, "server": "", "entries": {}}
+        return index
+
+    def _wipe(self, index: dict):
+        for entry in (index.get("entries") or {}).values():
+            try:
+                os.remove(os.path.join(self.dir, entry["file"]))
+            except (OSError, KeyError):
+                pass
+
+    def _tmp_path(self, name: str) -> str:
+        return os.path.join(self.dir, f"{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+    def _write_atomic(self, name: str, data: bytes):
+        """Outra execução nunca lê arquivo pela metade: grava no temporário e troca."""
+        tmp = self._tmp_path(name)
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, os.path.join(self.dir, name))
+
+    def _merge_disk_index(self):
+        """Entradas gravadas por outra execução desde a leitura (mesma versão/servidor)."""
+        disk = self._read_index()
+        if disk.get("version") != self._index.get("version"):
+            return
+        if disk.get("server") and self._index.get("server") and disk["server"] != self._index["server"]:
+            return
+        entries = self._index["entries"]
+        for url, entry in (disk.get("entries") or {}).items():
+            mine = entries.get(url)
+            if mine is not None and mine.get("used", 0) >= entry.get("used", 0):
+                continue
+            if os.path.isfile(os.path.join(self.dir, entry.get("file", ""))):
+                entries[url] = entry
+
+    def save(self):
+        if not self._dirty:
+            return
+        self._merge_disk_index()
+        self._evict()
+        self._write_atomic(_INDEX_FILE, json.dumps(self._index).encode("utf-8"))
+        self._dirty = 0
+
+    def _touch(self):
+        self._dirty += 1
+        if self._dirty >= _SAVE_EVERY:
+            self.save()
+
+    # --- versão do servidor ---
+
+    def on_response(self, response):
+        """Primeiro documento do WebGUI: compara o cabeçalho 'server' com o do cache."""
+        if self._server_checked:
+            return
+        try:
+            if response.request.resource_type != "document" or self.host not in response.url:
+                return
+            server = response.headers.get("server", "")
+        except Exception:
+            return
+        self._server_checked = True
+        if self._index.get("server") and server and self._index["server"] != server:
+            log.info(f"Servidor mudou ({self._index['server']} -> {server}); descartando cache estático.")
+            self._wipe(self._index)
+            self._index["entries"] = {}
+        if server:
+            self._index["server"] = server
+            self._touch()
+
+    # --- roteamento ---
+
+    def handle(self, route):
+        request = route.request
+        if request.method != "GET" or request.resource_type not in _STATIC_TYPES:
+            route.fallback()
+            return
+        try:
+            self._serve(route, request.url)
+        except Exception as e:
+            log.debug(f"Cache estático ignorado para {request.url}: {e}")
+            try:
+                route.fallback()
+            except Exception:
+                pass  # rota já atendida
+
+    def _serve(self, route, url: str):
+        entries = self._index["entries"]
+        entry = entries.get(url)
+        body = self._read(entry) if entry else None
+        if entry and body is None:
+            entries.pop(url, None)
+            entry = None
+        now = time.time()
+        if entry and now < entry["fresh_until"]:
+            self.hits += 1
+            entry["used"] = now
+            self._touch()
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+            return
+
+        headers = dict(route.request.headers)
+        if entry:
+            if entry.get("etag"):
+                headers["if-none-match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["if-modified-since"] = entry["last_modified"]
+        response = route.fetch(headers=headers)
+        if entry and response.status == 304:
+            self.revalidated += 1
+            ttl = _freshness_s({k.lower(): v for k, v in response.headers.items()}, self.default_ttl_s)
+            entry["fresh_until"] = now + (ttl or 0.0)
+            entry["used"] = now
+            self._touch()
+            route.fulfill(status=entry["status"], headers=entry["headers"], body=body)
+            return
+
+        self.misses += 1
+        resp_headers = {k.lower(): v for k, v in response.headers.items()}
+        ttl = _freshness_s(resp_headers, self.default_ttl_s) if response.status == 200 else None
+        if ttl is None:
+            route.fulfill(response=response)
+            return
+        data = response.body()
+        kept = {k: v for k, v in resp_headers.items() if k not in _DROP_HEADERS}
+        self._store(url, data, kept, ttl, now)
+        route.fulfill(status=response.status, headers=kept, body=data)
+
+    def _read(self, entry: dict) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.dir, entry["file"]), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _store(self, url: str, data: bytes, headers: Dict[str, str], ttl: float, now: float):
+        if len(data) > self.max_bytes // 4:
+            return  # recurso grande demais para a cota
+        name = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        self._write_atomic(name, data)
+        self._index["entries"][url] = {
+            "file": name,
+            "status": 200,
+            "headers": headers,
+            "etag": headers.get("etag", ""),
+            "last_modified": headers.get("last-modified", ""),
+            "fresh_until": now + ttl,
+            "used": now,
+            "size": len(data),
+        }
+        self._evict()
+        self._touch()
+
+    def _evict(self):
+        entries = self._index["entries"]
+        total = sum(e["size"] for e in entries.values())
+        if total <= self.max_bytes:
+            return
+        for url, entry in sorted(entries.items(), key=lambda kv: kv[1]["used"]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(os.path.join(self.dir, entry["file"]))
+            except OSError:
+                pass
+            total -= entry["size"]
+            del entries[url]
+
+    def close(self):
+        self.save()
+        total = self.hits + self.revalidated + self.misses
+        if total:
+            log.info(f"Cache estático: {self.hits} do disco, {self.revalidated} revalidados (304), "
+                     f"{self.misses} baixados de {total} recursos.")
+
+
+def install_static_cache(page, cache_dir: str, max_mb: float, default_ttl_s: float, version: str,
+                         base_url: str) -> Optional[StaticCache]:
+    """Roteia os recursos estáticos da página pelo cache em disco."""
+    try:
+        cache = StaticCache(cache_dir, max_mb, default_ttl_s, version, host=urlparse(base_url).netloc)
+        page.on("response", cache.on_response)
+        page.route(STATIC_URL, cache.handle)
+    except Exception as e:
+        log.warning(f"Cache estático indisponível: {e}")
+        return None
+    log.info(f"Cache estático ativo: {cache_dir} ({len(cache._index['entries'])} recursos).")
+    return cache
@@ -0,0 +1,263 @@
+# orquestrador.py
+# filepath: c:\Users\WRL1PO\Documents\Projeto_Inventario\orquestrador.py
+"""
+Orquestrador do dia de inventário: Parte 1 e Parte 2 como etapas de um pipeline
+por storage type, com sobreposição entre storages.
+
+  ativacao   - Parte 1 (LX15 + SM35) de um storage: python parte1.py --storage ST
+  background - espera o job do SM35 gerar os documentos (--bg-wait-s)
+  lancamento - Parte 2 (LI11N) do mesmo storage: python Parte2.py --storage-type ST
+
+A ativação roda em série (uma aba SAP); o lançamento de A começa assim que A
+termina a ativação + background, enquanto B ainda está sendo ativado.
+Antes do lançamento, Parte2.py --check consulta só banco + template (sem
+navegador nem login); enquanto sair com código 3 (documentos ainda não
+existem), a verificação se repete a cada --retry-s até --docs-timeout-min.
+A Parte 2 completa só roda quando já há registros. O caminho crítico fica
+próximo da cadeia mais lenta.
+
+  python orquestrador.py                      # storages de @Parte 1/storages.csv
+  python orquestrador.py --storage A0A --storage J0A --post-lanes 2
+
+Com o browser_service.py rodando (SAP_BROWSER_CDP=auto), as duas partes
+pegam abas emprestadas e nenhuma etapa abre navegador ou faz login.
+Saída de cada etapa em logs/orquestrador/<data>/<storage>_<etapa>.log e
+resumo (tempos por etapa, caminho crítico) em orquestrador_<data>.json na mesma pasta.
+"""
+import argparse
+import heapq
+import json
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+PARTE1_DIR = os.path.join(ROOT, "@Parte 1")
+PARTE2_DIR = os.path.join(ROOT, "@Parte 2_funcionando_ate_save")
+EXIT_NO_RECORDS = 3  # Parte2.EXIT_NO_RECORDS
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)-7s | orquestrador | %(message)s")
+log = logging.getLogger("orquestrador")
+
+
+@dataclass
+class StageRun:
+    stage: str
+    start: float = 0.0
+    end: float = 0.0
+    exit_code: Optional[int] = None
+    attempts: int = 0
+
+    @property
+    def seconds(self) -> float:
+        return max(0.0, self.end - self.start) if self.end else 0.0
+
+
+@dataclass
+class StorageChain:
+    storage: str
+    status: str = "pendente"  # pendente / ativando / background / verificando / lancando / ok / erro / sem_documentos
+    stages: Dict[str, StageRun] = field(default_factory=dict)
+
+    def stage(self, name: str) -> StageRun:
+        return self.stages.setdefault(name, StageRun(name))
+
+
+def _load_storages(path: str) -> List[str]:
+    """Mesmo formato da Parte 1 (separado por ; ou linha)."""
+    if not os.path.isfile(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        raw = f.read().replace("\r", "").replace("\n", ";")
+    seen: List[str] = []
+    for t in raw.split(";"):
+        code = t.strip().upper()
+        if code and code not in seen:
+            seen.append(code)
+    return seen
+
+
+class Orchestrator:
+    def __init__(self, storages: List[str], args):
+        self.chains = {s: StorageChain(s) for s in storages}
+        self.order = storages
+        self.args = args
+        self.log_dir = os.path.join(ROOT, "logs", "orquestrador", datetime.now().strftime("%Y%m%d_%H%M%S"))
+        self._ready: List[tuple] = []  # heap (pronto_em, ordem, storage)
+        self._cond = threading.Condition()
+        self._activation_done = False
+        self._t0 = 0.0
+
+    # --- execução de uma etapa ---
+
+    def _exec(self, chain: StorageChain, stage: str, cwd: str, cmd: List[str]) -> int:
+        run = chain.stage(stage)
+        run.attempts += 1
+        if not run.start:
+            run.start = time.time()
+        path = os.path.join(self.log_dir, f"{chain.storage}_{stage}.log")
+        log.info(f"[{chain.storage}] {stage}: {' '.join(cmd[1:])} (tentativa {run.attempts})")
+        with open(path, "a", encoding="utf-8") as out:
+            out.write(f"\n===== {datetime.now().isoformat(timespec='seconds')} tentativa {run.attempts} =====\n")
+            out.flush()
+            code = subprocess.run(cmd, cwd=cwd, stdout=out, stderr=subprocess.STDOUT).returncode
+        run.end = time.time()
+        run.exit_code = code
+        log.info(f"[{chain.storage}] {stage}: código {code} ({run.end - run.start:.0f}s desde o início da etapa)")
+        return code
+
+    # --- linha de ativação (série) ---
+
+    def _activation_lane(self):
+        try:
+            for i, st in enumerate(self.order):
+                chain = self.chains[st]
+                chain.status = "ativando"
+                code = self._exec(chain, "ativacao", PARTE1_DIR,
+                                  [sys.executable, "parte1.py", "--storage", st])
+                if code != 0:
+                    chain.status = "erro"
+                    log.error(f"[{st}] Ativação falhou; lançamento deste storage não será feito.")
+                    continue
+                chain.status = "background"
+                bg = chain.stage("background")
+                bg.start = time.time()
+                bg.end = bg.start + self.args.bg_wait_s
+                self._push(bg.end, i, st)
+        finally:
+            with self._cond:
+                self._activation_done = True
+                self._cond.notify_all()
+
+    # --- linhas de lançamento (paralelas entre storages) ---
+
+    def _push(self, ready_at: float, order: int, storage: str):
+        with self._cond:
+            heapq.heappush(self._ready, (ready_at, order, storage))
+            self._cond.notify_all()
+
+    def _next_ready(self) -> Optional[tuple]:
+        with self._cond:
+            while True:
+                if self._ready:
+                    ready_at, order, st = self._ready[0]
+                    wait = ready_at - time.time()
+                    if wait <= 0:
+                        return heapq.heappop(self._ready)
+                    self._cond.wait(timeout=min(wait, 5.0))
+                    continue
+                if self._activation_done and not self._busy_posting():
+                    return None
+                self._cond.wait(timeout=5.0)
+
+    def _busy_posting(self) -> bool:
+        return any(c.status in ("lancando", "background", "verificando") for c in self.chains.values())
+
+    def _posting_lane(self):
+        while True:
+            item = self._next_ready()
+            if item is None:
+                return
+            _, order, st = item
+            chain = self.chains[st]
+            chain.status = "verificando"
+            # Só o que muda entre tentativas (banco/template); navegador e login só com registros
+            code = self._exec(chain, "verificacao", PARTE2_DIR,
+                              [sys.executable, "Parte2.py", "--check", "--storage-type", st])
+            first = chain.stage("verificacao").start
+            if code == EXIT_NO_RECORDS and time.time() - first < self.args.docs_timeout_min * 60:
+                chain.status = "background"
+                log.info(f"[{st}] Documentos ainda sem registros; nova verificação em {self.args.retry_s:.0f}s.")
+                self._push(time.time() + self.args.retry_s, order, st)
+            elif code != 0:
+                chain.status = "sem_documentos" if code == EXIT_NO_RECORDS else "erro"
+            else:
+                chain.status = "lancando"
+                code = self._exec(chain, "lancamento", PARTE2_DIR,
+                                  [sys.executable, "Parte2.py", "--storage-type", st])
+                if code == 0:
+                    chain.status = "ok"
+                else:
+                    chain.status = "sem_documentos" if code == EXIT_NO_RECORDS else "erro"
+            with self._cond:
+                self._cond.notify_all()
+
+    # --- resumo ---
+
+    def _summary(self) -> dict:
+        total = time.time() - self._t0
+        chains = []
+        serial = 0.0
+        for st in self.order:
+            c = self.chains[st]
+            stages = {k: {**asdict(v), "seconds": round(v.seconds, 1)} for k, v in c.stages.items()}
+            work = sum(v.seconds for k, v in c.stages.items() if k != "background")
+            serial += sum(v.seconds for v in c.stages.values())
+            chains.append({"storage": st, "status": c.status, "work_s": round(work, 1), "stages": stages})
+        return {
+            "started_at": datetime.fromtimestamp(self._t0).isoformat(timespec="seconds"),
+            "total_s": round(total, 1),
+            "serial_s": round(serial, 1),  # o que levaria rodando as cadeias uma após a outra
+            "slowest_chain_s": round(max((sum(v.seconds for v in self.chains[s].stages.values())
+                                          for s in self.order), default=0.0), 1),
+            "chains": chains,
+        }
+
+    def run(self) -> int:
+        os.makedirs(self.log_dir, exist_ok=True)
+        self._t0 = time.time()
+        log.info(f"Pipeline: {self.order} | linhas de lançamento={self.args.post_lanes} | logs em {self.log_dir}")
+        threads = [threading.Thread(target=self._activation_lane, name="ativacao")]
+        threads += [threading.Thread(target=self._posting_lane, name=f"lancamento-{i + 1}")
+                    for i in range(max(1, self.args.post_lanes))]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        summary = self._summary()
+        path = os.path.join(self.log_dir, f"orquestrador_{datetime.now().strftime('%Y%m%d')}.json")
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f, indent=2, ensure_ascii=False)
+        log.info(f"Total {summary['total_s']:.0f}s | em série seria {summary['serial_s']:.0f}s | "
+                 f"cadeia mais lenta {summary['slowest_chain_s']:.0f}s")
+        for c in summary["chains"]:
+            tempos = " ".join(f"{k}={v['seconds']:.0f}s" for k, v in c["stages"].items())
+            log.info(f"  {c['storage']}: {c['status']} | {tempos}")
+        log.info(f"Resumo: {path}")
+        return 0 if all(c.status == "ok" for c in self.chains.values()) else 1
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(description="Pipeline do inventário: ativação (Parte 1) -> lançamento (Parte 2).")
+    parser.add_argument("--storage", action="append", default=[],
+                        help="Storage type (repetível); padrão: @Parte 1/storages.csv.")
+    parser.add_argument("--post-lanes", type=int, default=1,
+                        help="Lançamentos da Parte 2 em paralelo (cada um usa uma aba SAP).")
+    parser.add_argument("--bg-wait-s", type=float, default=120,
+                        help="Espera após o SM35 antes do primeiro lançamento do storage.")
+    parser.add_argument("--retry-s", type=float, default=300,
+                        help="Intervalo entre verificações quando a Parte 2 não encontra registros.")
+    parser.add_argument("--docs-timeout-min", type=float, default=60,
+                        help="Desiste do lançamento do storage após esse tempo sem documentos.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv)
+    storages = [s.strip().upper() for s in args.storage if s.strip()] or \
+        _load_storages(os.path.join(PARTE1_DIR, "storages.csv"))
+    if not storages:
+        log.error("Nenhum storage informado (--storage) nem em @Parte 1/storages.csv.")
+        return 1
+    return Orchestrator(storages, args).run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())